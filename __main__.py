@@ -1,11 +1,35 @@
 import flet as ft
 from ui import MachineApp
+from helper.logic import UPLOAD_DIRECTORY_NAME
+from helper.diagnostics import DEFAULT_EVENT_LOG_PATH
+from helper.parseCache import ArchiveParseCache
+from helper.parseStore import PersistentParseStore, PARSE_STORE_DIRECTORY_NAME
+from helper.archiveIndexer import ArchiveIndexer, DEFAULT_POLL_SECONDS
+from helper.resourceLimits import ResourceLimits
+from helper.zipService import ZipService
+from helper.validation import TestDescriptionValidator, load_test_description
+import argparse
+import functools
+import logging
+import multiprocessing
+import os
 import traceback
 
+DEFAULT_WEB_HOST = "0.0.0.0"
+DEFAULT_WEB_PORT = 8550
+# Flet resolves a relative assets_dir against this script, so the app writes downloads to the same absolute path
+ASSETS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
 
-def main(page: ft.Page):
+
+def main(page: ft.Page, is_web_mode: bool = False, event_log_path: str = DEFAULT_EVENT_LOG_PATH, parse_cache=None):
     try:
-        MachineApp(page)
+        MachineApp(
+            page,
+            is_web_mode=is_web_mode,
+            event_log_path=event_log_path,
+            parse_cache=parse_cache,
+            assets_directory=ASSETS_DIRECTORY
+        )
     except Exception as e:
         # Dies zeigt den kompletten Fehler-Stacktrace direkt in der App an
         error_stack = traceback.format_exc()
@@ -13,5 +37,75 @@ def main(page: ft.Page):
         page.update()
 
 
+def parse_arguments():
+    """Reads the command line options for desktop or server mode."""
+    parser = argparse.ArgumentParser(description="Test Configuration Wizard")
+    parser.add_argument("--web", action="store_true", help="Run as web server with one isolated workspace per session")
+    parser.add_argument("--host", default=DEFAULT_WEB_HOST, help="Host interface for web mode")
+    parser.add_argument("--port", type=int, default=DEFAULT_WEB_PORT, help="Port for web mode")
+    parser.add_argument("--event-log", default=DEFAULT_EVENT_LOG_PATH, help="JSON-lines log of archive entry events (empty to disable)")
+    parser.add_argument("--parse-cache", default=PARSE_STORE_DIRECTORY_NAME, help="Directory of the persistent parse cache shared with the indexer (empty to disable)")
+    parser.add_argument("--index", metavar="DIRECTORY", help="Run the background indexer for this archive directory instead of the UI")
+    parser.add_argument("--poll-seconds", type=float, default=DEFAULT_POLL_SECONDS, help="Scan interval of the indexer")
+    parser.add_argument(
+        "--validate", nargs=2, metavar=("DESCRIPTION", "ARCHIVE"),
+        help="Check a TestDescription.json against an archive and exit with 1 if it has issues"
+    )
+    arguments, _ = parser.parse_known_args()
+    return arguments
+
+
+def run_indexer(watch_directory: str, parse_cache, poll_seconds: float) -> None:
+    """Indexes the directory until interrupted; the wizard started with the same --parse-cache reads the results."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # Governed like the UI, so pathological archives on the share are parsed in killable worker processes
+    indexer = ArchiveIndexer(watch_directory, parse_cache, poll_seconds=poll_seconds, resource_limits=ResourceLimits())
+    try:
+        indexer.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_validation(description_path: str, archive_path: str) -> int:
+    """Prints the issues of every target of a test description and returns the process exit code."""
+    try:
+        test_description = load_test_description(description_path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {description_path}: {e}")
+        return 2
+    if not isinstance(test_description, dict):
+        print(f"Cannot read {description_path}: not a JSON object")
+        return 2
+
+    report = TestDescriptionValidator(ZipService(resourceLimits=ResourceLimits())).validate(archive_path, test_description)
+    for target_report in report["targets"]:
+        print(f"{'OK  ' if target_report['is_valid'] else 'FAIL'} {target_report['target_name']} ({target_report['machine_model']})")
+        for issue in target_report["issues"]:
+            print(f"     {issue['kind']}: {issue['path']}: {issue['message']}")
+    print(f"{report['target_count']} targets, {report['issue_count']} issues in {report['seconds']:.2f} s")
+    return 0 if report["is_valid"] else 1
+
+
 if __name__ == "__main__":
-    ft.app(target=main, assets_dir="assets")
+    # XML parse workers are spawned processes; a frozen (PyInstaller) build must dispatch them here
+    multiprocessing.freeze_support()
+    arguments = parse_arguments()
+    if arguments.validate:
+        raise SystemExit(run_validation(*arguments.validate))
+    parse_cache = ArchiveParseCache(store=PersistentParseStore(arguments.parse_cache)) if arguments.parse_cache else None
+
+    if arguments.index:
+        if parse_cache is None:
+            raise SystemExit("--index needs a --parse-cache directory")
+        run_indexer(arguments.index, parse_cache, arguments.poll_seconds)
+    elif arguments.web:
+        ft.app(
+            target=functools.partial(main, is_web_mode=True, event_log_path=arguments.event_log, parse_cache=parse_cache),
+            view=None,
+            host=arguments.host,
+            port=arguments.port,
+            assets_dir=ASSETS_DIRECTORY,
+            upload_dir=UPLOAD_DIRECTORY_NAME
+        )
+    else:
+        ft.app(target=functools.partial(main, event_log_path=arguments.event_log, parse_cache=parse_cache), assets_dir=ASSETS_DIRECTORY)
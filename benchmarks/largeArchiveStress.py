@@ -0,0 +1,151 @@
+"""
+Stress test of the resource-governed ZIP read mode.
+
+Generates a synthetic archive with one small XML file per entry (plus one
+oversized member) in a child process, then streams it through
+ZipService.iterXmlDataFromFolders and samples the resident set size.
+Fails when the RSS grows by more than the budget after the warm-up phase,
+i.e. when memory is not flat in the number of entries.
+
+Usage (from the repository root):
+    python -m benchmarks.largeArchiveStress [--entries 1000000] [--max-growth-mb 64] [--archive path]
+
+RSS is read from /proc/self/status, so the test only runs on Linux.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from helper import ZipService, ResourceLimits, DiagnosticsBus, EntrySummarySink
+from helper.diagnostics import OUTCOME_OVERSIZED
+from helper.logic import FOLDER_BARS, XML_TAG_IST, XML_TAG_SOLL
+
+DEFAULT_ENTRY_COUNT = 1_000_000
+DEFAULT_MAX_GROWTH_MB = 64
+OVERSIZED_MEMBER_NAME = f"{FOLDER_BARS}oversized.xml"
+STRESS_LIMITS = ResourceLimits(
+    max_entry_bytes=1024 * 1024,
+    max_entries=None,
+    max_in_flight_bytes=8 * 1024 * 1024,
+    max_in_flight_entries=256
+)
+
+# The first entries fill interpreter caches and pools; growth is measured after them
+WARM_UP_FRACTION = 0.05
+SAMPLE_INTERVAL = 10_000
+PROC_STATUS_PATH = "/proc/self/status"
+RSS_FIELD = "VmRSS:"
+KILOBYTES_PER_MEGABYTE = 1024
+
+
+def read_rss_mb() -> float:
+    """Returns the resident set size of this process in MB."""
+    with open(PROC_STATUS_PATH, "r", encoding="ascii") as status_file:
+        for line in status_file:
+            if line.startswith(RSS_FIELD):
+                return int(line.split()[1]) / KILOBYTES_PER_MEGABYTE
+    raise RuntimeError(f"{RSS_FIELD} missing in {PROC_STATUS_PATH}")
+
+
+def write_stress_archive(archive_path: str, entry_count: int) -> None:
+    """Writes entry_count small Bars XML files and one member above the entry size cap."""
+    with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for index in range(entry_count):
+            archive.writestr(
+                f"{FOLDER_BARS}BGE{index:07d}.01.xml",
+                f"<Root><{XML_TAG_IST}>{index % 97}</{XML_TAG_IST}><{XML_TAG_SOLL}>50</{XML_TAG_SOLL}></Root>"
+            )
+        archive.writestr(OVERSIZED_MEMBER_NAME, b"<Root>" + b" " * (2 * STRESS_LIMITS.max_entry_bytes) + b"</Root>")
+
+
+def generate_archive(archive_path: str, entry_count: int) -> None:
+    """Runs write_stress_archive in a child process, so the writer's listing never counts against our RSS."""
+    writer_process = multiprocessing.Process(target=write_stress_archive, args=(archive_path, entry_count))
+    writer_process.start()
+    writer_process.join()
+    if writer_process.exitcode != 0:
+        raise RuntimeError(f"Archive generation failed with exit code {writer_process.exitcode}")
+
+
+def run_stress(archive_path: str, entry_count: int) -> dict:
+    """Streams all XML entries and samples the RSS every SAMPLE_INTERVAL results."""
+    summary_sink = EntrySummarySink()
+    zip_service = ZipService(DiagnosticsBus([summary_sink]), STRESS_LIMITS)
+    warm_up_count = max(1, int(entry_count * WARM_UP_FRACTION))
+
+    start_rss_mb = read_rss_mb()
+    warm_rss_mb = start_rss_mb
+    peak_rss_mb = start_rss_mb
+    result_count = 0
+    start_time = time.perf_counter()
+
+    for _file_name, _values in zip_service.iterXmlDataFromFolders(archive_path, [FOLDER_BARS], [XML_TAG_IST, XML_TAG_SOLL]):
+        result_count += 1
+        if result_count == warm_up_count:
+            warm_rss_mb = read_rss_mb()
+        if result_count % SAMPLE_INTERVAL == 0:
+            peak_rss_mb = max(peak_rss_mb, read_rss_mb())
+
+    peak_rss_mb = max(peak_rss_mb, read_rss_mb())
+    summary = summary_sink.summary()
+    oversized_names = [event["entry"] for event in summary["failures"] if event["outcome"] == OUTCOME_OVERSIZED]
+
+    return {
+        "results": result_count,
+        "seconds": time.perf_counter() - start_time,
+        "start_rss_mb": start_rss_mb,
+        "warm_rss_mb": warm_rss_mb,
+        "peak_rss_mb": peak_rss_mb,
+        "failure_count": summary["failure_count"],
+        "oversized": oversized_names
+    }
+
+
+def check_result(result: dict, entry_count: int, max_growth_mb: float) -> list[str]:
+    """Returns one message per violated expectation."""
+    violations = []
+    if result["results"] != entry_count:
+        violations.append(f"{result['results']} results, expected {entry_count}")
+    if result["oversized"] != [OVERSIZED_MEMBER_NAME]:
+        violations.append(f"oversized members reported: {result['oversized']}, expected [{OVERSIZED_MEMBER_NAME}]")
+
+    growth_mb = result["peak_rss_mb"] - result["warm_rss_mb"]
+    if growth_mb > max_growth_mb:
+        violations.append(f"RSS grew by {growth_mb:.1f} MB after warm-up > {max_growth_mb} MB")
+    return violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resource-governed ZIP read stress test")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRY_COUNT, help="Number of XML entries to generate")
+    parser.add_argument("--max-growth-mb", type=float, default=DEFAULT_MAX_GROWTH_MB, help="Allowed RSS growth after warm-up")
+    parser.add_argument("--archive", help="Reuse or keep the generated archive at this path")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_directory:
+        archive_path = arguments.archive or os.path.join(work_directory, "stress.zip")
+        if not os.path.exists(archive_path):
+            generation_start = time.perf_counter()
+            generate_archive(archive_path, arguments.entries)
+            print(f"generated {arguments.entries} entries in {time.perf_counter() - generation_start:.1f} s")
+
+        result = run_stress(archive_path, arguments.entries)
+
+    print(
+        f"{result['results']} results in {result['seconds']:.1f} s, RSS start {result['start_rss_mb']:.1f} MB, "
+        f"after warm-up {result['warm_rss_mb']:.1f} MB, peak {result['peak_rss_mb']:.1f} MB, "
+        f"{result['failure_count']} reported"
+    )
+
+    violations = check_result(result, arguments.entries, arguments.max_growth_mb)
+    for violation in violations:
+        print(f"BUDGET EXCEEDED: {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
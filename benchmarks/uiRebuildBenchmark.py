@@ -0,0 +1,239 @@
+"""
+Headless benchmark of the editor's UI rebuild cost.
+
+Instantiates EditorView on a real Flet Page whose connection serializes every
+outgoing message like the socket server does, but sends nothing. For each
+synthetic archive size it measures control count, handler time and update
+bytes per operation. The gate fails when the control count or the update bytes
+exceed a budget from ui_budget.json; both only depend on the code, not on the
+machine. Handler times are reported but not gated.
+
+Usage (from the repository root):
+    python -m benchmarks.uiRebuildBenchmark [--sizes 100 1000 50000] [--budget path]
+
+The default sizes keep the gate short; pass --sizes 50000 for the large-archive run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import flet as ft
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import (
+    ClientActions,
+    ClientMessage,
+    CommandEncoder,
+    PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+from helper import AsyncMachineBusinessLogic, ExportArtifactCache
+from helper.logic import FOLDER_BARS, FEATURE_SHELF_SMALL, XML_TAG_IST, XML_TAG_SOLL
+from ui.views import EditorView
+
+DEFAULT_BUDGET_PATH = os.path.join(os.path.dirname(__file__), "ui_budget.json")
+BENCHMARK_SESSION_ID = "benchmark"
+BENCHMARK_MACHINE_MODEL = "AF500"
+SYNTHETIC_SOLL_VALUE = "50"
+SYNTHETIC_IST_MODULO = 97
+# Outside every mount range, so the edit turns the range hint red and has to send an update
+MOUNT_EDIT_VALUE = "999"
+
+# Byte budgets are scaled with the file count, but never below this size,
+# so fixed per-operation overhead does not fail small archives.
+MIN_FILES_FOR_BYTE_BUDGET = 100
+MILLISECONDS_PER_SECOND = 1000
+
+OPERATION_INITIAL = "initial"
+OPERATION_TOGGLE = "toggle"
+OPERATION_DRAG = "drag"
+OPERATION_MOUNT_EDIT = "mount_edit"
+
+
+class RecordingConnection(LocalConnection):
+    """Connection that serializes outgoing messages like the socket server and counts their bytes."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent_bytes = 0
+        self.sent_messages = 0
+
+
+    def _record(self, message) -> None:
+        """Adds the serialized size of one outgoing message."""
+        self.sent_bytes += len(json.dumps(message, cls=CommandEncoder, separators=(",", ":")))
+        self.sent_messages += 1
+
+
+    def send_command(self, session_id: str, command):
+        result, message = self._process_command(command)
+        if message:
+            self._record(message)
+        return PageCommandResponsePayload(result=result, error="")
+
+
+    def send_commands(self, session_id: str, commands):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ["add", "get"]:
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            self._record(ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+def create_synthetic_service(file_count: int, work_directory: str) -> AsyncMachineBusinessLogic:
+    """Builds a service with file_count Bars files and IST/SOLL values, without any ZIP."""
+    service = AsyncMachineBusinessLogic(
+        upload_directory=os.path.join(work_directory, "uploads"),
+        export_cache=ExportArtifactCache(os.path.join(work_directory, "export_cache"))
+    )
+    service.machine_model_name = BENCHMARK_MACHINE_MODEL
+    service.machine_display_string = BENCHMARK_MACHINE_MODEL
+    service.mount_count = 1
+
+    file_names = [f"BGE{index:06d}.01.xml" for index in range(file_count)]
+    service.folder_file_orders = {FOLDER_BARS: file_names}
+    service.current_file_order = file_names
+    service.extracted_xml_data = {
+        f"{FOLDER_BARS}{name}": {XML_TAG_IST: str(index % SYNTHETIC_IST_MODULO), XML_TAG_SOLL: SYNTHETIC_SOLL_VALUE}
+        for index, name in enumerate(file_names)
+    }
+    service.xml_data_version += 1
+    service.is_xml_data_loaded = True
+    return service
+
+
+def count_controls(control) -> int:
+    """Counts a control and all of its descendants."""
+    return 1 + sum(count_controls(child) for child in control._get_children())
+
+
+def measure_operation(connection: RecordingConnection, view: EditorView, operation) -> dict:
+    """
+    Runs one UI operation and returns its duration and the bytes it sent to the client.
+    Pending debounced input and batched updates are flushed right away, so the
+    measurement covers everything the operation would send within its frame.
+    """
+    bytes_before = connection.sent_bytes
+    messages_before = connection.sent_messages
+    start_time = time.perf_counter()
+    operation()
+    view.update_scheduler.flush_debounced()
+    view.update_scheduler.flush()
+    return {
+        "ms": (time.perf_counter() - start_time) * MILLISECONDS_PER_SECOND,
+        "update_bytes": connection.sent_bytes - bytes_before,
+        "messages": connection.sent_messages - messages_before
+    }
+
+
+def run_benchmark(file_count: int) -> dict:
+    """Measures initial build, feature toggle, drag and mount edit for one archive size."""
+    loop = asyncio.new_event_loop()
+    connection = RecordingConnection()
+    page = ft.Page(connection, BENCHMARK_SESSION_ID, loop)
+
+    with tempfile.TemporaryDirectory() as work_directory:
+        service = create_synthetic_service(file_count, work_directory)
+        view = EditorView(service, lambda _route: None)
+        page.views.clear()
+        page.views.append(view)
+        page.update()
+
+        operations = {}
+        operations[OPERATION_INITIAL] = measure_operation(connection, view, view.refresh_ui)
+        control_count = count_controls(view)
+
+        toggle_event = SimpleNamespace(control=SimpleNamespace(data=FEATURE_SHELF_SMALL))
+        operations[OPERATION_TOGGLE] = measure_operation(
+            connection, view, lambda: loop.run_until_complete(view.on_feature_click(toggle_event))
+        )
+
+        drag_event = SimpleNamespace(
+            src_id=view.files_list.controls[0].uid,
+            control=view.files_list.controls[-1].content
+        )
+        operations[OPERATION_DRAG] = measure_operation(connection, view, lambda: view.on_file_dropped(drag_event))
+
+        mount_event = SimpleNamespace(control=SimpleNamespace(value=MOUNT_EDIT_VALUE))
+        operations[OPERATION_MOUNT_EDIT] = measure_operation(connection, view, lambda: view.on_mount_count_change(mount_event))
+
+        service.logic_cleanup_session()
+
+    # Frame and debounce timers of the scheduler are already flushed; start and cancel them before closing
+    loop.run_until_complete(asyncio.sleep(0))
+    pending_tasks = asyncio.all_tasks(loop)
+    for task in pending_tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending_tasks, return_exceptions=True))
+    loop.close()
+    return {"files": file_count, "controls": control_count, "operations": operations}
+
+
+def check_budget(result: dict, budget: dict) -> list[str]:
+    """
+    Returns one message per exceeded budget of a benchmark result.
+    Only deterministic metrics are gated; timings depend on the machine and are report-only.
+    """
+    violations = []
+    file_count = result["files"]
+
+    max_controls = budget["max_fixed_controls"] + budget["max_controls_per_file"] * file_count
+    if result["controls"] > max_controls:
+        violations.append(f"{file_count} files: {result['controls']} controls > {max_controls}")
+
+    for operation_name, measurement in result["operations"].items():
+        # Every operation changes the view; one that sends nothing did not measure anything
+        if measurement["messages"] < 1:
+            violations.append(f"{file_count} files, {operation_name}: no update sent")
+
+        operation_budget = budget["operations"].get(operation_name)
+        if not operation_budget:
+            continue
+
+        max_bytes = operation_budget["max_update_bytes_per_file"] * max(file_count, MIN_FILES_FOR_BYTE_BUDGET)
+        if measurement["update_bytes"] > max_bytes:
+            violations.append(f"{file_count} files, {operation_name}: {measurement['update_bytes']} bytes > {max_bytes}")
+
+    return violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless EditorView rebuild benchmark")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET_PATH, help="Path to the budget JSON file")
+    parser.add_argument("--sizes", type=int, nargs="*", help="File counts to benchmark (default: from budget)")
+    arguments = parser.parse_args()
+
+    with open(arguments.budget, "r", encoding="utf-8") as budget_file:
+        budget = json.load(budget_file)
+
+    all_violations = []
+    print(f"{'files':>8} {'controls':>9} {'operation':>11} {'ms':>10} {'bytes':>12} {'messages':>9}")
+
+    for file_count in arguments.sizes or budget["sizes"]:
+        result = run_benchmark(file_count)
+        for operation_name, measurement in result["operations"].items():
+            print(
+                f"{file_count:>8} {result['controls']:>9} {operation_name:>11} "
+                f"{measurement['ms']:>10.1f} {measurement['update_bytes']:>12} {measurement['messages']:>9}"
+            )
+        all_violations.extend(check_budget(result, budget))
+
+    for violation in all_violations:
+        print(f"BUDGET EXCEEDED: {violation}")
+
+    return 1 if all_violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,14 @@
 from .zipService import ZipService
 from .logic import MachineBusinessLogic
-from .interfaces import IMachineService
\ No newline at end of file
+from .parseCache import ArchiveParseCache, SHARED_PARSE_CACHE
+from .parseStore import PersistentParseStore
+from .exportCache import ExportArtifactCache, SHARED_EXPORT_CACHE
+from .integrityCheck import ArchiveIntegrityChecker, SHARED_INTEGRITY_CHECKER
+from .diagnostics import DiagnosticsBus, JsonLinesLogSink, EntrySummarySink
+from .resourceLimits import ResourceLimits
+from .parseSupervisor import XmlParseSupervisor, SHARED_PARSE_SUPERVISORS
+from .featureRules import FeatureRuleTable, compile_rule_table, validate_configurations
+from .validation import TestDescriptionValidator, load_test_description
+from .archiveIndexer import ArchiveIndexer
+from .asyncLogic import AsyncMachineBusinessLogic
+from .interfaces import IMachineService, IAsyncMachineService
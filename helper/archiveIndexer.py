@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+import time
+from .logic import MachineBusinessLogic
+
+# Indexer Configuration
+DEFAULT_POLL_SECONDS = 5.0
+INDEXER_WORK_DIRECTORY_NAME = "indexer_work"
+INDEXED_ARCHIVE_EXTENSION = ".zip"
+INDEXER_THREAD_NAME = "archive-indexer"
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveIndexer:
+    """
+    Background indexer of a directory of machine archives (e.g. a network share).
+    Polls the directory and pre-parses every new or changed ZIP through the same
+    MachineBusinessLogic calls as the wizard, so configuration, file lists, XML values
+    and the integrity report land in the persistent parse cache under the keys the
+    wizard reads. Opening an indexed archive then needs no ZIP parsing at all.
+    An archive is indexed once its size and mtime were unchanged for one poll interval,
+    so files that are still being copied are not parsed half-written.
+    """
+
+    def __init__(
+        self,
+        watch_directory: str,
+        parse_cache,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        work_directory: str = INDEXER_WORK_DIRECTORY_NAME,
+        integrity_checker=None,
+        event_bus=None,
+        resource_limits=None
+    ):
+        if parse_cache is None or parse_cache.store is None:
+            raise ValueError("The archive indexer needs a parse cache with a persistent store")
+        self.watch_directory = watch_directory
+        self.parse_cache = parse_cache
+        self.poll_seconds = poll_seconds
+        self.work_directory = work_directory
+        self.integrity_checker = integrity_checker
+        self.event_bus = event_bus
+        self.resource_limits = resource_limits
+        # path -> (size, mtime) seen by the previous scan / when the archive was indexed
+        self._seen_states = {}
+        self._indexed_states = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+
+    def scan(self) -> list[str]:
+        """Returns the archives that are new or changed and were stable since the previous scan."""
+        current_states = {}
+        for directory_path, directory_names, file_names in os.walk(self.watch_directory):
+            directory_names.sort()
+            for file_name in sorted(file_names):
+                if not file_name.lower().endswith(INDEXED_ARCHIVE_EXTENSION):
+                    continue
+                archive_path = os.path.join(directory_path, file_name)
+                try:
+                    file_stat = os.stat(archive_path)
+                except OSError:
+                    continue
+                current_states[archive_path] = (file_stat.st_size, file_stat.st_mtime_ns)
+
+        ready_paths = [
+            archive_path for archive_path, file_state in current_states.items()
+            if self._seen_states.get(archive_path) == file_state and self._indexed_states.get(archive_path) != file_state
+        ]
+        self._seen_states = current_states
+        self._indexed_states = {path: state for path, state in self._indexed_states.items() if path in current_states}
+        return ready_paths
+
+
+    def index_archive(self, archive_path: str) -> dict:
+        """
+        Pre-parses one archive into the parse cache.
+        Returns: {archive, fingerprint, machine_model, file_count, is_valid, seconds, error}
+        """
+        start_time = time.perf_counter()
+        report = {"archive": archive_path, "fingerprint": "", "machine_model": "", "file_count": 0, "is_valid": False, "error": ""}
+
+        service = MachineBusinessLogic(
+            upload_directory=self.work_directory,
+            parse_cache=self.parse_cache,
+            integrity_checker=self.integrity_checker,
+            event_bus=self.event_bus,
+            resource_limits=self.resource_limits
+        )
+        try:
+            service.logic_open_source(archive_path)
+            service.logic_preload_archive()
+            integrity_report = service.logic_check_integrity()
+
+            report["fingerprint"] = service.archive_fingerprint
+            report["machine_model"] = service.machine_model_name
+            report["file_count"] = sum(len(file_order) for file_order in service.folder_file_orders.values())
+            report["is_valid"] = integrity_report.get("is_valid", False)
+        except Exception as e:
+            logger.exception("Indexing %s failed", archive_path)
+            report["error"] = str(e)
+        finally:
+            # Parse workers are shared per process and started only when something had to be parsed
+            service.zip_service.close()
+
+        report["seconds"] = time.perf_counter() - start_time
+        return report
+
+
+    def run_once(self) -> list[dict]:
+        """Scans once and indexes every ready archive. Returns one report per indexed archive."""
+        reports = []
+        for archive_path in self.scan():
+            if self._stop_event.is_set():
+                break
+            report = self.index_archive(archive_path)
+            # Failed archives are retried only after they change again
+            self._indexed_states[archive_path] = self._seen_states.get(archive_path)
+            logger.info(
+                "Indexed %s: %s, %d files in %.2f s%s", archive_path, report["machine_model"],
+                report["file_count"], report["seconds"], f" ({report['error']})" if report["error"] else ""
+            )
+            reports.append(report)
+        return reports
+
+
+    def run(self) -> None:
+        """Polls until stop() is called."""
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.poll_seconds)
+
+
+    def start(self) -> threading.Thread:
+        """Runs the indexer on a daemon thread next to the UI."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name=INDEXER_THREAD_NAME, daemon=True)
+        self._thread.start()
+        return self._thread
+
+
+    def stop(self) -> None:
+        """Stops polling after the archive currently being indexed."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
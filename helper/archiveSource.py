@@ -0,0 +1,393 @@
+import abc
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from .zipStreamReader import iter_central_directory, open_member_stream
+
+# Source Location Syntax
+#   "data/archive.zip"                      ordinary ZIP file
+#   "data/testdata"                         directory tree, read like an archive
+#   "data/outer.zip!/inner/archive.zip"     ZIP member of a ZIP (any depth), never extracted to disk
+NESTED_ARCHIVE_SEPARATOR = "!/"
+ARCHIVE_PATH_SEPARATOR = "/"
+
+# Nested archives up to this size are decompressed into memory; larger ones are
+# copied into a temporary file, so seeking never decompresses the member again.
+MAX_IN_MEMORY_NESTED_BYTES = 64 * 1024 * 1024
+NESTED_COPY_CHUNK_SIZE = 1024 * 1024
+DEFAULT_READ_WORKERS = 4
+FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
+
+def fingerprint_file(file_path: str) -> str:
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_handle:
+        for chunk in iter(lambda: file_handle.read(FINGERPRINT_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArchiveSource(abc.ABC):
+    """
+    Read interface shared by all sources, modelled on the reading part of zipfile.ZipFile.
+    Entries are described by zipfile.ZipInfo objects and addressed by their
+    "/"-separated name, so code written against ZipFile works unchanged.
+    Sources implement infolist and open; the other methods are derived from them.
+    """
+
+    location = ""
+
+    @abc.abstractmethod
+    def infolist(self) -> list:
+        """Returns the ZipInfo of every entry in archive order."""
+
+
+    @abc.abstractmethod
+    def open(self, name_or_info, mode: str = "r"):
+        """Opens an entry for streaming binary reads."""
+
+
+    def close(self) -> None:
+        """Releases all file handles of the source."""
+
+
+    def iter_entries(self):
+        """
+        Yields the ZipInfo of every entry without keeping the whole listing in memory,
+        where the source allows it. Use open_streamed to read the yielded entries.
+        """
+        yield from self.infolist()
+
+
+    def open_streamed(self, entry_info: zipfile.ZipInfo):
+        """Opens an entry yielded by iter_entries. Only one streamed entry may be open at a time."""
+        return self.open(entry_info)
+
+
+    def namelist(self) -> list:
+        """Returns the names of all entries in archive order."""
+        return [entry_info.filename for entry_info in self.infolist()]
+
+
+    def getinfo(self, name: str) -> zipfile.ZipInfo:
+        """Returns the ZipInfo of an entry. Raises KeyError for unknown names."""
+        return self._name_index()[name]
+
+
+    def read(self, name_or_info) -> bytes:
+        """Reads an entry completely."""
+        with self.open(name_or_info) as entry_handle:
+            return entry_handle.read()
+
+
+    def _name_index(self) -> dict:
+        """Lazily built lookup of entry name to ZipInfo."""
+        name_index = getattr(self, "_cached_name_index", None)
+        if name_index is None:
+            name_index = {entry_info.filename: entry_info for entry_info in self.infolist()}
+            self._cached_name_index = name_index
+        return name_index
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.close()
+
+
+class _SharedFileView(io.RawIOBase):
+    """
+    Independent read handle on a shared seekable file: every view keeps its own position,
+    and reads of all views are serialized by the lock of the file.
+    """
+
+    def __init__(self, shared_file, shared_lock: threading.Lock):
+        super().__init__()
+        self._shared_file = shared_file
+        self._shared_lock = shared_lock
+        self._position = 0
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def seekable(self) -> bool:
+        return True
+
+
+    def tell(self) -> int:
+        return self._position
+
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            with self._shared_lock:
+                offset += self._shared_file.seek(0, os.SEEK_END)
+        self._position = offset
+        return self._position
+
+
+    def readinto(self, buffer) -> int:
+        with self._shared_lock:
+            self._shared_file.seek(self._position)
+            byte_count = self._shared_file.readinto(buffer)
+        self._position += byte_count
+        return byte_count
+
+
+class ZipArchiveSource(ArchiveSource):
+    """
+    A ZIP archive, read from a path or from any seekable binary file object.
+    The full listing is only loaded by the ZipFile-style methods; iter_entries streams
+    the central directory through separate handles from reopen_function instead.
+    owned_file (e.g. the temporary copy of a nested archive) is closed together with the source.
+    """
+
+    def __init__(self, file_or_path, location: str, parent_source: ArchiveSource = None, reopen_function=None, owned_file=None):
+        self.location = location
+        self._file_or_path = file_or_path
+        self._parent_source = parent_source
+        self._reopen_function = reopen_function
+        self._owned_file = owned_file
+        self._zip_file = None
+        self._member_handle = None
+
+        if reopen_function is None:
+            # Without a way to reopen, the archive is validated right away like zipfile does
+            self._get_zip_file()
+
+
+    def _get_zip_file(self) -> zipfile.ZipFile:
+        """Opens the archive with zipfile on first use of the listing methods."""
+        if self._zip_file is None:
+            self._zip_file = zipfile.ZipFile(self._file_or_path, "r")
+        return self._zip_file
+
+
+    def infolist(self) -> list:
+        return self._get_zip_file().infolist()
+
+
+    def namelist(self) -> list:
+        return self._get_zip_file().namelist()
+
+
+    def getinfo(self, name: str) -> zipfile.ZipInfo:
+        return self._get_zip_file().getinfo(name)
+
+
+    def open(self, name_or_info, mode: str = "r"):
+        return self._get_zip_file().open(name_or_info, mode)
+
+
+    def read(self, name_or_info) -> bytes:
+        return self._get_zip_file().read(name_or_info)
+
+
+    def iter_entries(self):
+        if self._reopen_function is None:
+            yield from self.infolist()
+            return
+
+        with self._reopen_function() as directory_handle:
+            yield from iter_central_directory(directory_handle)
+
+
+    def open_streamed(self, entry_info: zipfile.ZipInfo):
+        if self._reopen_function is None:
+            return self.open(entry_info)
+
+        if self._member_handle is None:
+            self._member_handle = self._reopen_function()
+        return open_member_stream(self._member_handle, entry_info)
+
+
+    def reopen(self) -> "ZipArchiveSource":
+        """
+        Opens an independent source on the same archive, e.g. for a worker thread,
+        without decompressing or copying a nested archive again.
+        The returned source must be closed before this one.
+        """
+        if self._reopen_function is None:
+            raise ValueError(f"Archive source cannot be reopened: {self.location}")
+        return ZipArchiveSource(self._reopen_function(), self.location, reopen_function=self._reopen_function)
+
+
+    def close(self) -> None:
+        if self._zip_file is not None:
+            self._zip_file.close()
+        if self._member_handle is not None:
+            self._member_handle.close()
+        if not isinstance(self._file_or_path, str):
+            self._file_or_path.close()
+        if self._owned_file is not None:
+            self._owned_file.close()
+        if self._parent_source is not None:
+            self._parent_source.close()
+
+
+class DirectorySource(ArchiveSource):
+    """A directory tree; entry names are the "/"-separated paths relative to the root."""
+
+    def __init__(self, root_directory: str):
+        self.location = root_directory
+        self.root_directory = root_directory
+        self._entry_infos = None
+
+
+    def infolist(self) -> list:
+        if self._entry_infos is None:
+            self._entry_infos = list(self.iter_entries())
+        return self._entry_infos
+
+
+    def iter_entries(self):
+        """Walks the tree, sorted per directory, and describes every folder and file as ZipInfo."""
+        for current_directory, directory_names, file_names in os.walk(self.root_directory):
+            directory_names.sort()
+            relative_directory = os.path.relpath(current_directory, self.root_directory)
+
+            for entry_name in directory_names + sorted(file_names):
+                full_path = os.path.join(current_directory, entry_name)
+                archive_name = entry_name if relative_directory == os.curdir \
+                    else os.path.join(relative_directory, entry_name)
+                entry_info = zipfile.ZipInfo.from_file(full_path, archive_name.replace(os.sep, ARCHIVE_PATH_SEPARATOR))
+                # Files are stored uncompressed, so both sizes are equal
+                entry_info.compress_size = entry_info.file_size
+                yield entry_info
+
+
+    def open(self, name_or_info, mode: str = "r"):
+        entry_info = name_or_info if isinstance(name_or_info, zipfile.ZipInfo) else self.getinfo(name_or_info)
+        if entry_info.is_dir():
+            return io.BytesIO(b"")
+        return open(os.path.join(self.root_directory, *entry_info.filename.split(ARCHIVE_PATH_SEPARATOR)), "rb")
+
+
+def _open_nested_archive(parent_source: ArchiveSource, member_name: str, location: str) -> ZipArchiveSource:
+    """
+    Opens a ZIP member of a source as archive, in memory if small enough, else from a temporary copy.
+    The parent is closed once the member is read.
+    """
+    member_info = parent_source.getinfo(member_name)
+    if member_info.file_size <= MAX_IN_MEMORY_NESTED_BYTES:
+        member_bytes = parent_source.read(member_info)
+        parent_source.close()
+        # BytesIO shares the immutable buffer, so every reopened handle is free
+        return ZipArchiveSource(io.BytesIO(member_bytes), location, reopen_function=lambda: io.BytesIO(member_bytes))
+
+    # A member stream is not seekable, every backward seek would decompress it from the start
+    member_copy = tempfile.TemporaryFile()
+    try:
+        with parent_source.open(member_info) as member_handle:
+            shutil.copyfileobj(member_handle, member_copy, NESTED_COPY_CHUNK_SIZE)
+    except Exception:
+        member_copy.close()
+        raise
+    parent_source.close()
+
+    copy_lock = threading.Lock()
+    reopen_function = lambda: _SharedFileView(member_copy, copy_lock)
+    return ZipArchiveSource(reopen_function(), location, reopen_function=reopen_function, owned_file=member_copy)
+
+
+def open_archive_source(location: str) -> ArchiveSource:
+    """
+    Opens a directory, a ZIP file or a nested ZIP member, see NESTED_ARCHIVE_SEPARATOR.
+    Raises OSError, KeyError or zipfile.BadZipFile if the location cannot be opened.
+    """
+    base_path, *member_names = location.split(NESTED_ARCHIVE_SEPARATOR)
+
+    if os.path.isdir(base_path):
+        source = DirectorySource(base_path)
+    else:
+        source = ZipArchiveSource(base_path, base_path, reopen_function=lambda: open(base_path, "rb"))
+
+    for nesting_depth, member_name in enumerate(member_names, start=1):
+        nested_location = NESTED_ARCHIVE_SEPARATOR.join([base_path, *member_names[:nesting_depth]])
+        try:
+            source = _open_nested_archive(source, member_name, nested_location)
+        except Exception:
+            source.close()
+            raise
+    return source
+
+
+def archive_source_exists(location: str) -> bool:
+    """Checks whether the file or directory a location starts from exists."""
+    return os.path.exists(location.split(NESTED_ARCHIVE_SEPARATOR, 1)[0])
+
+
+def fingerprint_source(location: str) -> str:
+    """
+    Identifies the content of a source for caching.
+    ZIP files are hashed by content, directories by names, sizes and modification times;
+    a nested location combines the fingerprint of its outer file with the member path.
+    """
+    base_path = location.split(NESTED_ARCHIVE_SEPARATOR, 1)[0]
+
+    if os.path.isdir(base_path):
+        digest = hashlib.sha256()
+        with DirectorySource(base_path) as directory_source:
+            for entry_info in directory_source.infolist():
+                digest.update(f"{entry_info.filename}\0{entry_info.file_size}\0{entry_info.date_time}\n".encode("utf-8"))
+        base_fingerprint = digest.hexdigest()
+    else:
+        base_fingerprint = fingerprint_file(base_path)
+
+    return extend_fingerprint(base_fingerprint, location[len(base_path):])
+
+
+def extend_fingerprint(fingerprint: str, nested_suffix: str) -> str:
+    """
+    Derives the fingerprint of a nested location from the fingerprint of its outer location,
+    e.g. of "outer.zip!/inner.zip" from "outer.zip" and the suffix "!/inner.zip".
+    Each nesting level is hashed on its own, so outer fingerprints can be extended step by step.
+    """
+    for member_name in nested_suffix.split(NESTED_ARCHIVE_SEPARATOR)[1:]:
+        fingerprint = hashlib.sha256(f"{fingerprint}{NESTED_ARCHIVE_SEPARATOR}{member_name}".encode("utf-8")).hexdigest()
+    return fingerprint
+
+
+def read_entries_parallel(location: str, entry_infos: list, read_function, max_workers: int = DEFAULT_READ_WORKERS) -> list:
+    """
+    Applies read_function(source, entry_info) to every entry on a thread pool.
+    Each worker opens its own source, so reads and decompression never share a handle;
+    a nested archive is extracted once and reopened by all workers.
+    Returns the results in the order of entry_infos.
+    """
+    if not entry_infos:
+        return []
+
+    worker_count = min(max_workers, len(entry_infos))
+    # Round-robin shares spread large and small entries evenly over the workers
+    entry_shares = [entry_infos[index::worker_count] for index in range(worker_count)]
+
+    with open_archive_source(location) as shared_source:
+        def open_worker_source() -> ArchiveSource:
+            if isinstance(shared_source, ZipArchiveSource) and shared_source._reopen_function is not None:
+                return shared_source.reopen()
+            return open_archive_source(location)
+
+        def read_share(entry_share: list) -> list:
+            with open_worker_source() as worker_source:
+                return [read_function(worker_source, entry_info) for entry_info in entry_share]
+
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            share_results = list(executor.map(read_share, entry_shares))
+
+    ordered_results = [None] * len(entry_infos)
+    for share_index, results in enumerate(share_results):
+        ordered_results[share_index::worker_count] = results
+    return ordered_results
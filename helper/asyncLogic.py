@@ -0,0 +1,155 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .logic import MachineBusinessLogic, UPLOAD_DIRECTORY_NAME
+
+# Executor Configuration
+# A single worker keeps all I/O of one session sequential, so the
+# business logic state is never mutated by two threads at once.
+SERVICE_WORKER_COUNT = 1
+SERVICE_THREAD_PREFIX = "machine-service"
+
+# Coalescing Keys
+OPERATION_MODE_LOAD = "mode_load"
+OPERATION_XML_LOAD = "xml_load"
+
+
+class AsyncMachineBusinessLogic(MachineBusinessLogic):
+    """
+    Non-blocking variant of the machine sequence business logic.
+    Runs every ZIP-bound operation in a background executor and coalesces
+    repeated requests, so Flet event handlers never block the event loop.
+    """
+
+    def __init__(
+        self,
+        upload_directory: str = UPLOAD_DIRECTORY_NAME,
+        parse_cache=None,
+        export_cache=None,
+        integrity_checker=None,
+        event_bus=None,
+        resource_limits=None,
+        executor: ThreadPoolExecutor = None
+    ):
+        super().__init__(upload_directory, parse_cache, export_cache, integrity_checker, event_bus, resource_limits)
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=SERVICE_WORKER_COUNT,
+            thread_name_prefix=SERVICE_THREAD_PREFIX
+        )
+        self._running_operations = {}
+        self._rerun_requested = set()
+
+
+    async def _run_in_executor(self, function, *args):
+        """Executes a blocking call on the service executor and awaits its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+
+    async def _run_coalesced(self, operation_key: str, function) -> None:
+        """
+        Runs an operation once per burst of requests.
+        While an operation is in flight, further requests only mark it for a
+        single re-run that picks up the latest state once the current run ends.
+        """
+        running_task = self._running_operations.get(operation_key)
+        if running_task is not None and not running_task.done():
+            self._rerun_requested.add(operation_key)
+            await asyncio.shield(running_task)
+            return
+
+        async def worker():
+            try:
+                while True:
+                    self._rerun_requested.discard(operation_key)
+                    await self._run_in_executor(function)
+                    if operation_key not in self._rerun_requested:
+                        break
+            finally:
+                self._running_operations.pop(operation_key, None)
+
+        task = asyncio.ensure_future(worker())
+        self._running_operations[operation_key] = task
+        await asyncio.shield(task)
+
+
+    def logic_cleanup_session(self) -> None:
+        """Removes the session files and stops the background worker."""
+        super().logic_cleanup_session()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+    def _load_mode_data(self) -> None:
+        """Loads file list and XML values for the current mode in one executor call."""
+        self.logic_load_files_for_mode()
+        self.logic_load_xml_data_for_files()
+
+
+    async def logic_handle_upload_async(self, file_info) -> str:
+        """Copies the uploaded file without blocking the event loop."""
+        return await self._run_in_executor(self.logic_handle_upload, file_info)
+
+
+    async def logic_open_source_async(self, source_location: str) -> str:
+        """Registers a local directory or (nested) ZIP without blocking the event loop."""
+        return await self._run_in_executor(self.logic_open_source, source_location)
+
+
+    async def logic_parse_config_async(self) -> None:
+        """Parses the machine configuration in the background."""
+        await self._run_in_executor(self.logic_parse_config)
+
+
+    async def logic_load_files_for_mode_async(self) -> None:
+        """Reloads file list and XML values for the current mode, coalescing rapid toggles."""
+        await self._run_coalesced(OPERATION_MODE_LOAD, self._load_mode_data)
+
+
+    async def logic_load_xml_data_for_files_async(self) -> None:
+        """Reloads the IST and SOLL values in the background."""
+        await self._run_coalesced(OPERATION_XML_LOAD, self.logic_load_xml_data_for_files)
+
+
+    async def logic_set_extraction_tags_async(self, tag_specs: list) -> None:
+        """Applies a new tag list and re-extracts the XML values in the background."""
+        self.logic_set_extraction_tags(tag_specs)
+        await self.logic_load_xml_data_for_files_async()
+
+
+    async def logic_check_integrity_async(self) -> dict:
+        """
+        CRC-checks the archive outside of the session worker, so it overlaps with parsing.
+        The checker distributes the members over its own worker pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.logic_check_integrity)
+
+
+    async def logic_import_previous_order_async(self, previous_export_path: str) -> dict:
+        """Reads a previous export and applies its file order in the background."""
+        return await self._run_in_executor(self.logic_import_previous_order, previous_export_path)
+
+
+    async def logic_toggle_feature_async(self, feature_name: str) -> None:
+        """Toggles a feature; dependent file reloads run in the background."""
+        await self._run_in_executor(self.logic_toggle_feature, feature_name)
+
+
+    async def logic_initialize_async(self) -> None:
+        """Parses the configuration and loads the data for the initial mode."""
+        await self.logic_parse_config_async()
+        await self.logic_load_files_for_mode_async()
+
+
+    async def logic_sort_by_deviation_async(self, descending: bool = True) -> None:
+        """Sorts by deviation on the session worker, so it never races a background reload of the order."""
+        await self._run_in_executor(self.logic_sort_by_deviation, descending)
+
+
+    async def logic_export_extracted_values_async(self, target_path: str) -> int:
+        """Writes the columnar value export in the background."""
+        return await self._run_in_executor(self.logic_export_extracted_values, target_path)
+
+
+    async def logic_export_async(self, target_zip_path: str) -> bool:
+        """Writes the deterministic export ZIP to the target path in the background."""
+        return await self._run_in_executor(self.logic_export, target_zip_path)
@@ -0,0 +1,144 @@
+import csv
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Parquet and Arrow output are optional; CSV always works
+    pa = None
+    pq = None
+
+# Output Formats
+FORMAT_CSV = ".csv"
+FORMAT_PARQUET = ".parquet"
+FORMAT_ARROW = ".arrow"
+FORMAT_FEATHER = ".feather"
+ARROW_FORMATS = {FORMAT_PARQUET, FORMAT_ARROW, FORMAT_FEATHER}
+
+# Column Layout
+COLUMN_FOLDER = "folder"
+COLUMN_FILE_NAME = "file_name"
+COLUMN_ORDER_INDEX = "file_order_index"
+COLUMN_IN_FINAL_ORDER = "in_final_order"
+BASE_COLUMNS = [COLUMN_FOLDER, COLUMN_FILE_NAME, COLUMN_ORDER_INDEX, COLUMN_IN_FINAL_ORDER]
+
+DEFAULT_BATCH_ROWS = 8192
+MISSING_ORDER_INDEX = -1
+
+
+def supported_formats() -> list[str]:
+    """Lists the file extensions that can be written in the current environment."""
+    if pa is None:
+        return [FORMAT_CSV]
+    return [FORMAT_CSV, FORMAT_PARQUET, FORMAT_ARROW, FORMAT_FEATHER]
+
+
+def iter_extracted_rows(
+    extracted_xml_data: dict,
+    folder_file_orders: dict,
+    active_folder: str,
+    tag_names: list
+):
+    """
+    Yields one row tuple per extracted file, matching BASE_COLUMNS + tag_names.
+    The order index is the position in the user ordering of the file's folder;
+    in_final_order marks the folder that ends up as FileOrder in config.json.
+    Rows are produced lazily straight from the extracted data, without a copy.
+    """
+    position_maps = {
+        folder: {name: index for index, name in enumerate(file_order)}
+        for folder, file_order in folder_file_orders.items()
+    }
+
+    for full_path, tag_values in extracted_xml_data.items():
+        folder, _, file_name = full_path.rpartition("/")
+        folder = f"{folder}/" if folder else ""
+        order_index = position_maps.get(folder, {}).get(file_name, MISSING_ORDER_INDEX)
+
+        yield (
+            folder,
+            file_name,
+            order_index,
+            folder == active_folder and order_index != MISSING_ORDER_INDEX,
+            *(tag_values.get(tag_name) for tag_name in tag_names)
+        )
+
+
+def write_csv(target_path: str, column_names: list, rows) -> int:
+    """Streams rows into a UTF-8 CSV file. Returns the number of written rows."""
+    row_count = 0
+    with open(target_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(column_names)
+        for row in rows:
+            writer.writerow(row)
+            row_count += 1
+    return row_count
+
+
+def _build_record_batch(schema, column_buffers: list):
+    """Converts one set of column buffers into an Arrow record batch."""
+    arrays = [pa.array(buffer, type=field.type) for field, buffer in zip(schema, column_buffers)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _iter_record_batches(schema, rows, batch_rows: int):
+    """Groups rows into Arrow record batches of at most batch_rows rows."""
+    column_buffers = [[] for _ in schema]
+    for row in rows:
+        for buffer, value in zip(column_buffers, row):
+            buffer.append(value)
+        if len(column_buffers[0]) >= batch_rows:
+            yield _build_record_batch(schema, column_buffers)
+            column_buffers = [[] for _ in schema]
+    if column_buffers[0]:
+        yield _build_record_batch(schema, column_buffers)
+
+
+def _arrow_schema(column_names: list):
+    """Schema of the export: fixed base columns followed by string tag columns."""
+    base_types = [pa.string(), pa.string(), pa.int64(), pa.bool_()]
+    tag_types = [pa.string()] * (len(column_names) - len(base_types))
+    return pa.schema(list(zip(column_names, base_types + tag_types)))
+
+
+def write_arrow(target_path: str, column_names: list, rows, batch_rows: int = DEFAULT_BATCH_ROWS) -> int:
+    """
+    Streams rows batch by batch into a Parquet or Arrow IPC file, chosen by extension.
+    Only one batch is held in memory at a time. Returns the number of written rows.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet/Arrow export")
+
+    schema = _arrow_schema(column_names)
+    is_parquet = os.path.splitext(target_path)[1].lower() == FORMAT_PARQUET
+    writer = pq.ParquetWriter(target_path, schema) if is_parquet else pa.ipc.new_file(target_path, schema)
+
+    row_count = 0
+    try:
+        for record_batch in _iter_record_batches(schema, rows, batch_rows):
+            writer.write_batch(record_batch)
+            row_count += record_batch.num_rows
+    finally:
+        writer.close()
+    return row_count
+
+
+def export_extracted_values(
+    target_path: str,
+    extracted_xml_data: dict,
+    folder_file_orders: dict,
+    active_folder: str,
+    tag_names: list
+) -> int:
+    """
+    Writes all extracted per-file values with their order position to target_path.
+    The format follows the extension (.csv, .parquet, .arrow, .feather). Returns the row count.
+    """
+    column_names = BASE_COLUMNS + list(tag_names)
+    rows = iter_extracted_rows(extracted_xml_data, folder_file_orders, active_folder, tag_names)
+
+    if os.path.splitext(target_path)[1].lower() in ARROW_FORMATS:
+        return write_arrow(target_path, column_names, rows)
+    return write_csv(target_path, column_names, rows)
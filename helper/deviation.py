@@ -0,0 +1,94 @@
+import numpy as np
+
+# Column Names
+COLUMN_IST = "ist"
+COLUMN_SOLL = "soll"
+COLUMN_DEVIATION = "deviation"
+COLUMN_ABSOLUTE_DEVIATION = "absolute_deviation"
+COLUMN_RELATIVE_DEVIATION = "relative_deviation"
+
+DECIMAL_COMMA = ","
+DECIMAL_POINT = "."
+
+
+def _parse_number(raw_value) -> float:
+    """Converts an extracted XML value to float; missing or invalid values become NaN."""
+    if raw_value is None:
+        return np.nan
+    try:
+        return float(str(raw_value).strip().replace(DECIMAL_COMMA, DECIMAL_POINT))
+    except ValueError:
+        return np.nan
+
+
+def build_deviation_columns(
+    file_names: list,
+    folder: str,
+    extracted_xml_data: dict,
+    ist_tag: str,
+    soll_tag: str
+) -> dict:
+    """
+    Builds numeric IST/SOLL columns in the order of file_names and derives the deviations.
+    All columns are float64 arrays of equal length; rows without usable numbers are NaN.
+    """
+    row_count = len(file_names)
+    row_values = [extracted_xml_data.get(f"{folder}{name}", {}) for name in file_names]
+
+    ist_values = np.fromiter((_parse_number(row.get(ist_tag)) for row in row_values), dtype=np.float64, count=row_count)
+    soll_values = np.fromiter((_parse_number(row.get(soll_tag)) for row in row_values), dtype=np.float64, count=row_count)
+
+    deviation = ist_values - soll_values
+    absolute_deviation = np.abs(deviation)
+    absolute_soll = np.abs(soll_values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_deviation = np.where(absolute_soll > 0, absolute_deviation / absolute_soll, np.nan)
+
+    return {
+        COLUMN_IST: ist_values,
+        COLUMN_SOLL: soll_values,
+        COLUMN_DEVIATION: deviation,
+        COLUMN_ABSOLUTE_DEVIATION: absolute_deviation,
+        COLUMN_RELATIVE_DEVIATION: relative_deviation
+    }
+
+
+def deviation_statistics(columns: dict) -> dict:
+    """Summarizes the absolute deviation column; rows without numbers are ignored."""
+    absolute_deviation = columns[COLUMN_ABSOLUTE_DEVIATION]
+    valid_mask = ~np.isnan(absolute_deviation)
+    valid_count = int(np.count_nonzero(valid_mask))
+
+    if valid_count == 0:
+        return {"row_count": len(absolute_deviation), "valid_count": 0}
+
+    valid_deviation = absolute_deviation[valid_mask]
+    return {
+        "row_count": len(absolute_deviation),
+        "valid_count": valid_count,
+        "mean": float(valid_deviation.mean()),
+        "std": float(valid_deviation.std()),
+        "min": float(valid_deviation.min()),
+        "max": float(valid_deviation.max()),
+        "median": float(np.median(valid_deviation))
+    }
+
+
+def indices_above_threshold(columns: dict, threshold: float, relative: bool = False) -> np.ndarray:
+    """Returns the row indices whose absolute (or relative) deviation reaches the threshold."""
+    column_name = COLUMN_RELATIVE_DEVIATION if relative else COLUMN_ABSOLUTE_DEVIATION
+    with np.errstate(invalid="ignore"):
+        return np.flatnonzero(columns[column_name] >= threshold)
+
+
+def order_by_deviation(columns: dict, descending: bool = True, relative: bool = False) -> np.ndarray:
+    """
+    Returns the row permutation sorted by deviation.
+    The sort is stable, so equal deviations keep their current order; rows without numbers go last.
+    """
+    column_name = COLUMN_RELATIVE_DEVIATION if relative else COLUMN_ABSOLUTE_DEVIATION
+    sort_keys = columns[column_name]
+    if descending:
+        sort_keys = -sort_keys
+    # NaN sorts last in NumPy, in both directions because the sign is flipped beforehand
+    return np.argsort(sort_keys, kind="stable")
@@ -0,0 +1,279 @@
+import atexit
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+# Event Fields
+FIELD_TIMESTAMP = "timestamp"
+FIELD_OPERATION = "operation"
+FIELD_ARCHIVE = "archive"
+FIELD_ENTRY = "entry"
+FIELD_COMPRESSED_SIZE = "compressed_size"
+FIELD_UNCOMPRESSED_SIZE = "uncompressed_size"
+FIELD_SECONDS = "seconds"
+FIELD_OUTCOME = "outcome"
+FIELD_MESSAGE = "message"
+
+# Outcomes
+OUTCOME_OK = "ok"
+OUTCOME_NOT_FOUND = "not_found"
+OUTCOME_INVALID_XML = "invalid_xml"
+OUTCOME_DECODE_ERROR = "decode_error"
+OUTCOME_ERROR = "error"
+OUTCOME_OVERSIZED = "oversized"
+OUTCOME_ENTRY_LIMIT = "entry_limit"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_MEMORY_LIMIT = "memory_limit"
+OUTCOME_WORKER_CRASHED = "worker_crashed"
+
+# Outcomes that leave a read incomplete for reasons other than the archive content,
+# e.g. I/O errors, caps or killed parse workers; results with them are not cached
+INCOMPLETE_OUTCOMES = frozenset((
+    OUTCOME_ERROR,
+    OUTCOME_ENTRY_LIMIT,
+    OUTCOME_TIMEOUT,
+    OUTCOME_MEMORY_LIMIT,
+    OUTCOME_WORKER_CRASHED,
+))
+
+# Sink Configuration
+DEFAULT_EVENT_LOG_PATH = os.path.join("logs", "zip_events.jsonl")
+DEFAULT_EVENT_LOG_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_EVENT_LOG_BACKUPS = 3
+DEFAULT_SLOWEST_COUNT = 10
+DEFAULT_MAX_FAILURES = 100
+EVENT_WRITER_THREAD_NAME = "event-log-writer"
+EVENT_WRITE_BATCH_SIZE = 1024
+_STOP_WRITER = object()
+
+# Errors are always logged here, also when no sink is registered
+logger = logging.getLogger(__name__)
+
+
+def build_entry_event(
+    operation: str,
+    archive_path: str,
+    entry_info,
+    seconds: float,
+    outcome: str,
+    message: str = ""
+) -> dict:
+    """
+    Builds one event for a processed archive entry.
+    entry_info is the zipfile.ZipInfo of the entry, or None for archive-level events.
+    """
+    return {
+        FIELD_TIMESTAMP: time.time(),
+        FIELD_OPERATION: operation,
+        FIELD_ARCHIVE: archive_path,
+        FIELD_ENTRY: entry_info.filename if entry_info is not None else "",
+        FIELD_COMPRESSED_SIZE: entry_info.compress_size if entry_info is not None else 0,
+        FIELD_UNCOMPRESSED_SIZE: entry_info.file_size if entry_info is not None else 0,
+        FIELD_SECONDS: seconds,
+        FIELD_OUTCOME: outcome,
+        FIELD_MESSAGE: message
+    }
+
+
+class DiagnosticsBus:
+    """
+    Distributes archive entry events to pluggable sinks.
+    A sink is any callable taking the event dict. Without sinks the bus is
+    disabled; producers check is_enabled and then skip timing and event building.
+    """
+
+    def __init__(self, sinks: list = None):
+        self._sinks = tuple(sinks or ())
+
+
+    @property
+    def is_enabled(self) -> bool:
+        """True if at least one sink receives events."""
+        return bool(self._sinks)
+
+
+    def add_sink(self, sink) -> None:
+        """Registers a sink. The tuple is replaced, so emitting threads never see a half-updated list."""
+        self._sinks = self._sinks + (sink,)
+
+
+    def remove_sink(self, sink) -> None:
+        """Unregisters a sink."""
+        self._sinks = tuple(registered for registered in self._sinks if registered is not sink)
+
+
+    def emit(self, event: dict) -> None:
+        """Passes an event to every sink; a failing sink never breaks the archive operation."""
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception:
+                logger.exception("Diagnostics sink failed")
+
+
+class _RotatingJsonLinesWriter:
+    """
+    Background thread that serializes queued events and appends them in batches
+    to a JSON-lines file, rotating it like logging.handlers.RotatingFileHandler.
+    """
+
+    def __init__(self, log_path: str, max_bytes: int, backup_count: int):
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue = queue.SimpleQueue()
+
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name=EVENT_WRITER_THREAD_NAME, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+
+    def put(self, event: dict) -> None:
+        """Enqueues an event; the caller never waits for serialization or disk I/O."""
+        self._queue.put(event)
+
+
+    def stop(self) -> None:
+        """Writes all queued events and ends the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP_WRITER)
+            self._thread.join()
+
+
+    def _run(self) -> None:
+        """Waits for events and writes everything queued so far with one write call."""
+        is_running = True
+        while is_running:
+            batch = [self._queue.get()]
+            while len(batch) < EVENT_WRITE_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get())
+
+            if _STOP_WRITER in batch:
+                is_running = False
+                batch = [event for event in batch if event is not _STOP_WRITER]
+
+            block = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in batch)
+            if block:
+                self._write_block(block)
+
+
+    def _write_block(self, block: str) -> None:
+        """Appends one block of lines, rotating the file first if it would exceed max_bytes."""
+        try:
+            current_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+            if self.max_bytes and current_size and current_size + len(block) > self.max_bytes:
+                self._rotate()
+            with open(self.log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(block)
+        except OSError:
+            logger.exception("Could not write event log %s", self.log_path)
+
+
+    def _rotate(self) -> None:
+        """Shifts log.jsonl -> log.jsonl.1 -> ... and drops the oldest backup."""
+        for backup_index in range(self.backup_count - 1, 0, -1):
+            source_path = f"{self.log_path}.{backup_index}"
+            if os.path.exists(source_path):
+                os.replace(source_path, f"{self.log_path}.{backup_index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_path, f"{self.log_path}.1")
+        else:
+            os.remove(self.log_path)
+
+
+class JsonLinesLogSink:
+    """
+    Writes every event as one JSON line into a size-rotated log file.
+    Emitting only enqueues the event; serialization and disk writes happen in
+    batches on a background thread. Sinks with the same path share one writer.
+    """
+
+    _writers = {}
+    _writers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        log_path: str = DEFAULT_EVENT_LOG_PATH,
+        max_bytes: int = DEFAULT_EVENT_LOG_MAX_BYTES,
+        backup_count: int = DEFAULT_EVENT_LOG_BACKUPS
+    ):
+        self.log_path = os.path.abspath(log_path)
+        with self._writers_lock:
+            writer = self._writers.get(self.log_path)
+            if writer is None:
+                writer = _RotatingJsonLinesWriter(self.log_path, max_bytes, backup_count)
+                self._writers[self.log_path] = writer
+        self._writer = writer
+
+
+    def __call__(self, event: dict) -> None:
+        self._writer.put(event)
+
+
+class EntrySummarySink:
+    """
+    Aggregates events for display: totals, the slowest entries and the latest failures.
+    entry_limit events are also kept apart, so a truncated read stays visible after many other failures.
+    Memory stays bounded by slowest_count and max_failures.
+    """
+
+    def __init__(self, slowest_count: int = DEFAULT_SLOWEST_COUNT, max_failures: int = DEFAULT_MAX_FAILURES):
+        self.slowest_count = slowest_count
+        self._lock = threading.Lock()
+        self._slowest_heap = []
+        self._sequence = itertools.count()
+        self._failures = deque(maxlen=max_failures)
+        self._limit_events = deque(maxlen=max_failures)
+        self._entry_count = 0
+        self._failure_count = 0
+        self._total_seconds = 0.0
+
+
+    def __call__(self, event: dict) -> None:
+        with self._lock:
+            self._entry_count += 1
+            self._total_seconds += event[FIELD_SECONDS]
+
+            if event[FIELD_OUTCOME] != OUTCOME_OK:
+                self._failure_count += 1
+                self._failures.append(event)
+            if event[FIELD_OUTCOME] == OUTCOME_ENTRY_LIMIT:
+                self._limit_events.append(event)
+
+            # Min-heap of the N slowest entries; the sequence number keeps equal times comparable
+            heap_item = (event[FIELD_SECONDS], next(self._sequence), event)
+            if len(self._slowest_heap) < self.slowest_count:
+                heapq.heappush(self._slowest_heap, heap_item)
+            elif heap_item[0] > self._slowest_heap[0][0]:
+                heapq.heapreplace(self._slowest_heap, heap_item)
+
+
+    def summary(self) -> dict:
+        """Returns {entry_count, failure_count, total_seconds, slowest: [...], failures: [...], limit_events: [...]}."""
+        with self._lock:
+            return {
+                "entry_count": self._entry_count,
+                "failure_count": self._failure_count,
+                "total_seconds": self._total_seconds,
+                "slowest": [item[2] for item in sorted(self._slowest_heap, key=lambda item: -item[0])],
+                "failures": list(self._failures),
+                "limit_events": list(self._limit_events)
+            }
+
+
+    def clear(self) -> None:
+        """Resets all counters, e.g. after a new archive was uploaded."""
+        with self._lock:
+            self._slowest_heap.clear()
+            self._failures.clear()
+            self._limit_events.clear()
+            self._entry_count = 0
+            self._failure_count = 0
+            self._total_seconds = 0.0
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import shutil
+import threading
+from .parseCache import fingerprint_file
+
+# Cache Configuration
+EXPORT_CACHE_DIRECTORY_NAME = "export_cache"
+EXPORT_FORMAT_VERSION = "1"
+ARTIFACT_EXTENSION = ".zip"
+HASH_EXTENSION = ".sha256"
+DEFAULT_MAX_EXPORT_CACHE_BYTES = 1024 * 1024 * 1024
+
+
+class ExportArtifactCache:
+    """
+    Content-addressed store of deterministic export archives.
+    An artifact is identified by the source archive fingerprint and the canonical
+    configuration, so an export with identical input is copied instead of rebuilt.
+    Beyond max_bytes, the least recently exported artifacts are deleted.
+    Files are replaced atomically, so processes sharing the directory never read partial artifacts.
+    """
+
+    def __init__(self, cache_directory: str = EXPORT_CACHE_DIRECTORY_NAME, max_bytes: int = DEFAULT_MAX_EXPORT_CACHE_BYTES):
+        # Resolved once, so a later change of the working directory does not split the cache
+        self.cache_directory = os.path.abspath(cache_directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._artifact_locks = {}
+
+
+    def build_key(self, source_fingerprint: str, canonical_configuration: str) -> str:
+        """Derives the artifact key from the source fingerprint and the canonical config JSON."""
+        digest = hashlib.sha256()
+        for part in (EXPORT_FORMAT_VERSION, source_fingerprint, canonical_configuration):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+    def export(self, artifact_key: str, target_path: str, build_function) -> str:
+        """
+        Writes the artifact for the key to the target path.
+        Builds it with build_function(path) -> bool only if it is not cached yet,
+        and skips the copy if the target already holds identical content.
+        Returns the SHA-256 of the exported archive, or an empty string on failure.
+        """
+        artifact_path = os.path.join(self.cache_directory, artifact_key + ARTIFACT_EXTENSION)
+        hash_path = os.path.join(self.cache_directory, artifact_key + HASH_EXTENSION)
+        temporary_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        artifact_lock = self._acquire_artifact_lock(artifact_key)
+        try:
+            # Only exports of the same artifact wait for each other; the build runs outside the cache-wide lock
+            with artifact_lock:
+                if os.path.exists(artifact_path) and os.path.exists(hash_path):
+                    # Marks the artifact as recently used for eviction
+                    os.utime(artifact_path)
+                else:
+                    temporary_path = artifact_path + temporary_suffix
+                    if not build_function(temporary_path):
+                        if os.path.exists(temporary_path):
+                            os.remove(temporary_path)
+                        return ""
+                    os.replace(temporary_path, artifact_path)
+                    temporary_hash_path = hash_path + temporary_suffix
+                    with open(temporary_hash_path, "w", encoding="utf-8") as hash_file:
+                        hash_file.write(fingerprint_file(artifact_path))
+                    os.replace(temporary_hash_path, hash_path)
+                    with self._lock:
+                        self._evict(keep_path=artifact_path)
+
+                with open(hash_path, "r", encoding="utf-8") as hash_file:
+                    artifact_hash = hash_file.read().strip()
+
+                target_is_identical = os.path.exists(target_path) and fingerprint_file(target_path) == artifact_hash
+                if not target_is_identical:
+                    shutil.copyfile(artifact_path, target_path)
+        finally:
+            self._release_artifact_lock(artifact_key)
+
+        return artifact_hash
+
+
+    def _acquire_artifact_lock(self, artifact_key: str) -> threading.Lock:
+        """Returns the lock of an artifact and registers the caller as its user, so eviction skips it."""
+        with self._lock:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            lock_entry = self._artifact_locks.setdefault(artifact_key, [threading.Lock(), 0])
+            lock_entry[1] += 1
+            return lock_entry[0]
+
+
+    def _release_artifact_lock(self, artifact_key: str) -> None:
+        """Unregisters a user of an artifact and drops its lock once no export uses it."""
+        with self._lock:
+            lock_entry = self._artifact_locks[artifact_key]
+            lock_entry[1] -= 1
+            if lock_entry[1] == 0:
+                del self._artifact_locks[artifact_key]
+
+
+    def _evict(self, keep_path: str) -> None:
+        """
+        Deletes the least recently used artifacts until the cache fits max_bytes.
+        Artifacts that an export is currently using are kept. Caller holds the lock.
+        """
+        if self.max_bytes is None:
+            return
+        artifacts = []
+        for file_name in os.listdir(self.cache_directory):
+            if not file_name.endswith(ARTIFACT_EXTENSION):
+                continue
+            artifact_path = os.path.join(self.cache_directory, file_name)
+            try:
+                file_stat = os.stat(artifact_path)
+            except OSError:
+                continue
+            artifacts.append((file_stat.st_mtime, file_stat.st_size, artifact_path))
+
+        cached_bytes = sum(file_size for _mtime, file_size, _path in artifacts)
+        for _mtime, file_size, artifact_path in sorted(artifacts):
+            if cached_bytes <= self.max_bytes:
+                break
+            artifact_key = os.path.basename(artifact_path)[:-len(ARTIFACT_EXTENSION)]
+            if artifact_path == keep_path or artifact_key in self._artifact_locks:
+                continue
+            for file_path in (artifact_path, artifact_path[:-len(ARTIFACT_EXTENSION)] + HASH_EXTENSION):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+            cached_bytes -= file_size
+
+
+# Shared instance used by all sessions of a process
+SHARED_EXPORT_CACHE = ExportArtifactCache()
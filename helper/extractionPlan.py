@@ -0,0 +1,120 @@
+import xml.etree.ElementTree as ET
+
+# Tag Specification Syntax
+#   "Is_Number"          root attribute of that name, else text of the first element with that tag
+#   "Tool/Length"        text of the first <Length> whose direct parent is <Tool>
+#   "Tool@id"            attribute "id" of the first <Tool> that has it
+#   "Tool/Insert@type"   attribute on a nested path
+#   "@version"           attribute of the root element
+# Paths and attributes may also address the root element, plain names only its descendants.
+PATH_SEPARATOR = "/"
+ATTRIBUTE_MARKER = "@"
+RELATIVE_PREFIXES = (".//", "//", "./")
+VALUE_NOT_FOUND = "NOT_FOUND"
+
+
+class ExtractionPlan:
+    """
+    Compiled form of a list of tag specifications.
+    All specifications are resolved during one walk over the XML tree; each
+    element is looked up once in a tag index instead of searching the tree per
+    specification, and the walk stops as soon as every value is found.
+    """
+
+    def __init__(self, tag_specs: list):
+        self.tag_specs = list(tag_specs)
+        self.root_attribute_specs = []
+        self.element_specs_by_tag = {}
+
+        for spec_index, tag_spec in enumerate(self.tag_specs):
+            self._compile_spec(spec_index, tag_spec)
+
+
+    def _compile_spec(self, spec_index: int, tag_spec: str) -> None:
+        """Splits one specification into path and attribute and registers it in the lookup tables."""
+        path_part = tag_spec
+        for prefix in RELATIVE_PREFIXES:
+            if path_part.startswith(prefix):
+                path_part = path_part[len(prefix):]
+                break
+
+        path_part, _, attribute_name = path_part.partition(ATTRIBUTE_MARKER)
+        path_tags = tuple(tag for tag in path_part.split(PATH_SEPARATOR) if tag)
+
+        if not path_tags:
+            self.root_attribute_specs.append((spec_index, attribute_name))
+            return
+
+        is_legacy_name = len(path_tags) == 1 and not attribute_name
+        if is_legacy_name:
+            # Plain names keep the original behaviour: a root attribute wins over element text
+            self.root_attribute_specs.append((spec_index, path_tags[0]))
+
+        # Like ".//tag", plain names only search below the root; paths and attributes may address the root
+        self.element_specs_by_tag.setdefault(path_tags[-1], []).append(
+            (spec_index, path_tags[:-1], attribute_name or None, not is_legacy_name)
+        )
+
+
+    def extract(self, xml_source) -> dict:
+        """
+        Resolves all specifications in a single pass over an XML file or file object.
+        Raises ET.ParseError for malformed XML.
+        Returns: { tag_spec: value } with VALUE_NOT_FOUND for unresolved specifications.
+        """
+        root = ET.parse(xml_source).getroot()
+
+        spec_count = len(self.tag_specs)
+        values = [VALUE_NOT_FOUND] * spec_count
+        is_resolved = [False] * spec_count
+        remaining_count = spec_count
+
+        for spec_index, attribute_name in self.root_attribute_specs:
+            if not is_resolved[spec_index] and attribute_name in root.attrib:
+                values[spec_index] = root.attrib[attribute_name]
+                is_resolved[spec_index] = True
+                remaining_count -= 1
+
+        # Preorder walk = document order
+        parent_map = None
+
+        for element in root.iter():
+            if remaining_count == 0:
+                break
+
+            candidate_specs = self.element_specs_by_tag.get(element.tag)
+            if not candidate_specs:
+                continue
+
+            for spec_index, parent_tags, attribute_name, may_match_root in candidate_specs:
+                if is_resolved[spec_index] or (element is root and not may_match_root):
+                    continue
+
+                if parent_tags:
+                    # Parent links are only built for files that actually need a nested path
+                    if parent_map is None:
+                        parent_map = {child: parent for parent in root.iter() for child in parent}
+                    if not self._has_parent_path(element, parent_tags, parent_map):
+                        continue
+
+                if attribute_name is None:
+                    values[spec_index] = element.text
+                elif attribute_name in element.attrib:
+                    values[spec_index] = element.attrib[attribute_name]
+                else:
+                    continue
+
+                is_resolved[spec_index] = True
+                remaining_count -= 1
+
+        return dict(zip(self.tag_specs, values))
+
+
+    def _has_parent_path(self, element, parent_tags: tuple, parent_map: dict) -> bool:
+        """Checks whether the direct ancestors of an element match the given tag path."""
+        current_element = element
+        for expected_tag in reversed(parent_tags):
+            current_element = parent_map.get(current_element)
+            if current_element is None or current_element.tag != expected_tag:
+                return False
+        return True
@@ -0,0 +1,358 @@
+import functools
+import numpy as np
+
+# Machine Specific Limits
+DEFAULT_MIN_MOUNT_COUNT = 0
+DEFAULT_MAX_MOUNT_COUNT = 25
+SMALL_SHELF_LIMIT = 9
+AS100_MODEL_LIMIT = 10
+MIN_COUNT_FOR_EQUIPPED_MODELS = 1
+
+# Features
+FEATURE_SHIFT_CUT = "ShiftCutDevice"
+FEATURE_SHELF_SMALL = "createShelf"
+FEATURE_SHELF_BIG = "createBigShelf"
+FEATURE_ROBOT_MODE = "RobotMode"
+SHELF_VALUE_SMALL = "smallShelf"
+SHELF_VALUE_BIG = "bigShelf"
+
+# Feature i of this tuple is bit i of a feature state mask
+FEATURES = (FEATURE_SHIFT_CUT, FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG, FEATURE_ROBOT_MODE)
+FEATURE_STATE_COUNT = 1 << len(FEATURES)
+
+# Mount Counts
+MOUNT_REQUIRED = 1
+MOUNT_NOT_REQUIRED = 0
+MODELS_WITH_MOUNT = {"AF500", "AF510", "AS100"}
+MIN_BATCH_MOUNT_COUNT = int(np.iinfo(np.int64).min)
+MAX_BATCH_MOUNT_COUNT = int(np.iinfo(np.int64).max)
+
+# Rule Kinds
+RULE_REQUIRES = "requires"    # an active feature needs at least one of the others
+RULE_EXCLUDES = "excludes"    # an active feature forbids all of the others
+
+# Resolutions, applied when a toggle violates a rule
+RESOLVE_DROP_FEATURES = "drop_features"      # switch the features off
+RESOLVE_ENABLE_OTHER = "enable_other"        # switch the first of the others on
+RESOLVE_DROP_UNTOGGLED = "drop_untoggled"    # the side just toggled on stays, the other side is switched off
+
+# Feature Rules: (kind, features, others, resolution, conflict message, UI label of a toggle the rule blocks)
+FEATURE_RULES = (
+    (RULE_EXCLUDES, (FEATURE_SHELF_SMALL,), (FEATURE_SHELF_BIG,), RESOLVE_DROP_UNTOGGLED,
+     "createShelf and createBigShelf are mutually exclusive", ""),
+    (RULE_REQUIRES, (FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG), (FEATURE_ROBOT_MODE,), RESOLVE_ENABLE_OTHER,
+     "A shelf requires RobotMode", " (Für Regal erforderlich)"),
+    (RULE_REQUIRES, (FEATURE_ROBOT_MODE,), (FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG), RESOLVE_DROP_FEATURES,
+     "RobotMode requires a shelf", " (Erfordert ein Regal)"),
+    (RULE_EXCLUDES, (FEATURE_SHIFT_CUT,), (FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG), RESOLVE_DROP_FEATURES,
+     "ShiftCutDevice is not possible with a shelf", " (Nicht mit Regal möglich)"),
+)
+
+# Mount Rules: (active feature or None, machine model or None, min, max, description); the first match wins
+MOUNT_RULES = (
+    (FEATURE_SHELF_SMALL, None, MIN_COUNT_FOR_EQUIPPED_MODELS, SMALL_SHELF_LIMIT, "(Small Shelf Limit)"),
+    (FEATURE_SHELF_BIG, None, MIN_COUNT_FOR_EQUIPPED_MODELS, DEFAULT_MAX_MOUNT_COUNT, "(Big Shelf Limit)"),
+    (None, "AS100", MIN_COUNT_FOR_EQUIPPED_MODELS, AS100_MODEL_LIMIT, "(AS100 Limit)"),
+)
+DEFAULT_MOUNT_RANGE = (DEFAULT_MIN_MOUNT_COUNT, DEFAULT_MAX_MOUNT_COUNT, "")
+
+# Models with rules of their own; all other models share the generic rule table
+MODELS_WITH_RULES = frozenset(MODELS_WITH_MOUNT | {model for _feature, model, *_limits in MOUNT_RULES if model is not None})
+GENERIC_RULE_MODEL = ""
+RULE_TABLE_CACHE_SIZE = 32
+
+# Features that only allow testing bars
+BARS_ONLY_FEATURES = (FEATURE_SHIFT_CUT,)
+BARS_ONLY_MESSAGE = "ShiftCutDevice requires TestBars"
+
+# Final Data Keys (config.json of the export), see MachineBusinessLogic.logic_prepare_final_data
+FINAL_KEY_MACHINE_MODEL = "MachineModel"
+FINAL_KEY_TEST_BARS = "TestBars"
+FINAL_KEY_FILE_ORDER = "FileOrder"
+FINAL_KEY_MOUNT_COUNT = "MountCount"
+FINAL_KEY_FEATURES = "Features"
+
+
+def feature_mask(feature_names) -> int:
+    """Combines feature names to a bit mask."""
+    mask = 0
+    for feature_name in feature_names:
+        mask |= 1 << FEATURES.index(feature_name)
+    return mask
+
+
+def state_to_mask(feature_state: dict) -> int:
+    """Converts a feature state {feature: bool} to its bit mask; unknown features are ignored."""
+    mask = 0
+    for bit_index, feature_name in enumerate(FEATURES):
+        if feature_state.get(feature_name):
+            mask |= 1 << bit_index
+    return mask
+
+
+def mask_to_state(mask: int) -> dict:
+    """Converts a bit mask back to a complete feature state."""
+    return {feature_name: bool(mask >> bit_index & 1) for bit_index, feature_name in enumerate(FEATURES)}
+
+
+def feature_state_from_final_features(final_features: list) -> dict:
+    """Converts the "Features" list of logic_prepare_final_data back into a feature state."""
+    feature_state = mask_to_state(0)
+    for feature in final_features:
+        for key, value in feature.items():
+            if key == FEATURE_SHELF_SMALL and value == SHELF_VALUE_BIG:
+                feature_state[FEATURE_SHELF_BIG] = True
+            elif key == FEATURE_SHELF_SMALL and value == SHELF_VALUE_SMALL:
+                feature_state[FEATURE_SHELF_SMALL] = True
+            else:
+                feature_state[key] = bool(value)
+    return feature_state
+
+
+class FeatureRuleTable:
+    """
+    FEATURE_RULES and MOUNT_RULES compiled for one machine model.
+    Every feature state is a bit mask, so conflicts, mount range, toggle results
+    and blocked toggles of all states are precomputed and looked up by index.
+    """
+
+    def __init__(self, machine_model_name: str):
+        self.machine_model_name = machine_model_name
+        self.default_mount_count = MOUNT_REQUIRED if machine_model_name in MODELS_WITH_MOUNT else MOUNT_NOT_REQUIRED
+        self._rules = [
+            (kind, feature_mask(features), feature_mask(others), resolution, message, block_label)
+            for kind, features, others, resolution, message, block_label in FEATURE_RULES
+        ]
+        bars_only_mask = feature_mask(BARS_ONLY_FEATURES)
+
+        self.conflicts = []
+        self.mount_ranges = []
+        self.transitions = []
+        self.blocked_labels = []
+        for mask in range(FEATURE_STATE_COUNT):
+            self.conflicts.append(tuple(rule[4] for rule in self._rules if self._is_violated(rule, mask)))
+            self.mount_ranges.append(self._match_mount_rule(mask))
+
+            toggle_results = {}
+            blocked_labels = {}
+            for bit_index, feature_name in enumerate(FEATURES):
+                toggle_results[feature_name], blocking_rule = self._resolve_toggle(mask, 1 << bit_index)
+                if toggle_results[feature_name] == mask and blocking_rule is not None:
+                    blocked_labels[feature_name] = blocking_rule[5]
+            self.transitions.append(toggle_results)
+            self.blocked_labels.append(blocked_labels)
+
+        # Columns for evaluate_batch
+        self.conflict_flags = np.array([bool(conflicts) for conflicts in self.conflicts])
+        self.min_mount_counts = np.array([mount_range[0] for mount_range in self.mount_ranges])
+        self.max_mount_counts = np.array([mount_range[1] for mount_range in self.mount_ranges])
+        self.bars_only_flags = np.array([bool(mask & bars_only_mask) for mask in range(FEATURE_STATE_COUNT)])
+
+
+    def _is_violated(self, rule: tuple, mask: int) -> bool:
+        kind, features, others = rule[0], rule[1], rule[2]
+        if not mask & features:
+            return False
+        if kind == RULE_REQUIRES:
+            return not mask & others
+        return bool(mask & others)
+
+
+    def _resolve(self, rule: tuple, mask: int, toggled_bit: int) -> int:
+        features, others, resolution = rule[1], rule[2], rule[3]
+        if resolution == RESOLVE_DROP_FEATURES:
+            return mask & ~features
+        if resolution == RESOLVE_ENABLE_OTHER:
+            return mask | (others & -others)
+        if toggled_bit & others:
+            return mask & ~features
+        return mask & ~others
+
+
+    def _resolve_toggle(self, mask: int, toggled_bit: int) -> tuple[int, tuple]:
+        """
+        Flips one feature and applies the resolutions of all violated rules until the state is stable.
+        Returns: (resulting mask, first rule that reverted the toggled feature or None)
+        """
+        state = mask ^ toggled_bit
+        blocking_rule = None
+        for _ in range(len(self._rules) + 1):
+            is_stable = True
+            for rule in self._rules:
+                if not self._is_violated(rule, state):
+                    continue
+                resolved_state = self._resolve(rule, state, toggled_bit)
+                if (resolved_state ^ state) & toggled_bit and blocking_rule is None:
+                    blocking_rule = rule
+                is_stable = is_stable and resolved_state == state
+                state = resolved_state
+            if is_stable:
+                break
+        return state, blocking_rule
+
+
+    def _match_mount_rule(self, mask: int) -> tuple[int, int, str]:
+        for feature_name, machine_model_name, min_allowed, max_allowed, description in MOUNT_RULES:
+            if feature_name is not None and not mask & feature_mask((feature_name,)):
+                continue
+            if machine_model_name is not None and machine_model_name != self.machine_model_name:
+                continue
+            return min_allowed, max_allowed, description
+        return DEFAULT_MOUNT_RANGE
+
+
+    def toggle(self, feature_state: dict, feature_name: str) -> dict:
+        """Returns the feature state after toggling one feature, with all dependent features adjusted."""
+        return mask_to_state(self.transitions[state_to_mask(feature_state)][feature_name])
+
+
+    def blocked_features(self, feature_state: dict) -> dict:
+        """Returns {feature: UI label} of all features whose toggle the rules would revert."""
+        return self.blocked_labels[state_to_mask(feature_state)]
+
+
+    def forces_bars_mode(self, feature_state: dict) -> bool:
+        """True if an active feature only allows testing bars."""
+        return bool(self.bars_only_flags[state_to_mask(feature_state)])
+
+
+    def mount_limits(self, feature_state: dict) -> tuple[int, int, str]:
+        """Returns: (min_allowed, max_allowed, limit_description)"""
+        return self.mount_ranges[state_to_mask(feature_state)]
+
+
+    def evaluate(self, feature_state: dict, mount_count, test_bars: bool = True) -> dict:
+        """
+        Checks one configuration.
+        Returns: {is_valid, conflicts, mount_count, mount_range, is_mount_count_valid, is_mode_valid}
+        """
+        mask = state_to_mask(feature_state)
+        min_allowed, max_allowed, _ = self.mount_ranges[mask]
+        is_mount_count_valid = is_mount_count_integer(mount_count) and min_allowed <= mount_count <= max_allowed
+        is_mode_valid = bool(test_bars) or not self.bars_only_flags[mask]
+        conflicts = list(self.conflicts[mask])
+        return {
+            "is_valid": not conflicts and is_mount_count_valid and is_mode_valid,
+            "conflicts": conflicts,
+            "mount_count": mount_count,
+            "mount_range": self.mount_ranges[mask],
+            "is_mount_count_valid": is_mount_count_valid,
+            "is_mode_valid": is_mode_valid
+        }
+
+
+    def evaluate_batch(self, masks: np.ndarray, mount_counts: np.ndarray, test_bars: np.ndarray) -> np.ndarray:
+        """
+        Checks many configurations of this model at once with array lookups.
+        masks are feature state masks, mount_counts integers and test_bars booleans of equal length.
+        Returns: boolean array, True where the configuration is valid.
+        """
+        mount_count_valid = (mount_counts >= self.min_mount_counts[masks]) & (mount_counts <= self.max_mount_counts[masks])
+        mode_valid = test_bars | ~self.bars_only_flags[masks]
+        return ~self.conflict_flags[masks] & mount_count_valid & mode_valid
+
+
+def is_mount_count_integer(mount_count) -> bool:
+    """True for int mount counts; bool is an int subclass but never a mount count."""
+    return isinstance(mount_count, int) and not isinstance(mount_count, bool)
+
+
+def rule_model_key(machine_model_name) -> str:
+    """
+    Maps a machine model to the model its rules are compiled for.
+    Unknown IDs and non-string values (e.g. from uploaded configs) map to the generic model.
+    """
+    if isinstance(machine_model_name, str) and machine_model_name in MODELS_WITH_RULES:
+        return machine_model_name
+    return GENERIC_RULE_MODEL
+
+
+def compile_rule_table(machine_model_name) -> FeatureRuleTable:
+    """
+    Returns the compiled rule table of a machine model; each table is compiled once per process.
+    Models without rules of their own share one table, so arbitrary IDs cannot grow the cache.
+    """
+    return _compile_rule_table(rule_model_key(machine_model_name))
+
+
+@functools.lru_cache(maxsize=RULE_TABLE_CACHE_SIZE)
+def _compile_rule_table(rule_model: str) -> FeatureRuleTable:
+    """Compiles the table of a normalized model, see rule_model_key."""
+    return FeatureRuleTable(rule_model)
+
+
+def compute_mount_limits(machine_model_name: str, feature_state: dict) -> tuple[int, int, str]:
+    """
+    Determines the allowed mount count range for a machine model and feature state.
+    Returns: (min_allowed, max_allowed, limit_description)
+    """
+    return compile_rule_table(machine_model_name).mount_limits(feature_state)
+
+
+def default_mount_count(machine_model_name: str) -> int:
+    """Returns the initial mount count of a machine model."""
+    return compile_rule_table(machine_model_name).default_mount_count
+
+
+def find_feature_conflicts(feature_state: dict) -> list[str]:
+    """
+    Lists the feature rules that a feature state violates.
+    A state reachable through the editor never has conflicts.
+    """
+    # Feature rules do not depend on the machine model
+    return list(compile_rule_table(GENERIC_RULE_MODEL).conflicts[state_to_mask(feature_state)])
+
+
+def validate_configurations(configurations: list) -> list[dict]:
+    """
+    Validates many configurations in the final data format (MachineModel, TestBars,
+    MountCount, Features) at once. Configurations are grouped by the rule table of their
+    machine model and checked with evaluate_batch; only invalid ones are evaluated again
+    for details. Mount counts outside the int64 range are evaluated one by one.
+    Returns one result per configuration, in order: see FeatureRuleTable.evaluate.
+    """
+    results = [None] * len(configurations)
+    indices_by_model = {}
+    for index, configuration in enumerate(configurations):
+        # Normalized first, so unhashable or unknown models share the generic group
+        rule_model = rule_model_key(configuration.get(FINAL_KEY_MACHINE_MODEL, ""))
+        indices_by_model.setdefault(rule_model, []).append(index)
+
+    for rule_model, indices in indices_by_model.items():
+        rule_table = compile_rule_table(rule_model)
+        feature_states = [
+            feature_state_from_final_features(configurations[index].get(FINAL_KEY_FEATURES, []))
+            for index in indices
+        ]
+        raw_mount_counts = [
+            configurations[index].get(FINAL_KEY_MOUNT_COUNT, rule_table.default_mount_count)
+            for index in indices
+        ]
+        test_bars = [bool(configurations[index].get(FINAL_KEY_TEST_BARS, True)) for index in indices]
+
+        # -1 is below every range: non-integer mount counts are invalid, out-of-range ones are checked by evaluate
+        is_batchable = [
+            is_mount_count_integer(mount_count) and MIN_BATCH_MOUNT_COUNT <= mount_count <= MAX_BATCH_MOUNT_COUNT
+            for mount_count in raw_mount_counts
+        ]
+        masks = np.array([state_to_mask(feature_state) for feature_state in feature_states], dtype=np.intp)
+        mount_counts = np.array([
+            mount_count if batchable else -1 for mount_count, batchable in zip(raw_mount_counts, is_batchable)
+        ], dtype=np.int64)
+        valid_flags = rule_table.evaluate_batch(masks, mount_counts, np.array(test_bars, dtype=bool))
+
+        for position, index in enumerate(indices):
+            if valid_flags[position]:
+                mask = masks[position]
+                results[index] = {
+                    "is_valid": True,
+                    "conflicts": [],
+                    "mount_count": raw_mount_counts[position],
+                    "mount_range": rule_table.mount_ranges[mask],
+                    "is_mount_count_valid": True,
+                    "is_mode_valid": True
+                }
+            else:
+                results[index] = rule_table.evaluate(feature_states[position], raw_mount_counts[position], test_bars[position])
+
+    return results
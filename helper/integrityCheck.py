@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from .archiveSource import open_archive_source, read_entries_parallel
+
+# Checker Configuration
+DEFAULT_MAX_VERIFIED_ARCHIVES = 32
+MAX_CHECK_WORKERS = 4
+VERIFY_CHUNK_SIZE = 1024 * 1024
+
+# Failure Kinds
+FAILURE_MISSING_ARCHIVE = "missing_archive"
+FAILURE_UNREADABLE_ARCHIVE = "unreadable_archive"
+FAILURE_CRC_MISMATCH = "crc_mismatch"
+FAILURE_TRUNCATED = "truncated"
+FAILURE_CORRUPT = "corrupt"
+FAILURE_UNSUPPORTED = "unsupported"
+FAILURE_ENTRY_LIMIT = "entry_limit"
+
+CRC_ERROR_MARKER = "Bad CRC-32"
+TRUNCATED_ERROR_MARKER = "Truncated"
+
+
+def classify_member_error(error: Exception) -> str:
+    """Maps an exception raised while reading a member to a failure kind."""
+    message = str(error)
+    if CRC_ERROR_MARKER in message:
+        return FAILURE_CRC_MISMATCH
+    if isinstance(error, EOFError) or TRUNCATED_ERROR_MARKER in message:
+        return FAILURE_TRUNCATED
+    if isinstance(error, (NotImplementedError, RuntimeError)):
+        # Unknown compression method or encrypted member
+        return FAILURE_UNSUPPORTED
+    return FAILURE_CORRUPT
+
+
+class ArchiveIntegrityChecker:
+    """
+    Verifies the CRC-32 of every archive member on a worker pool.
+    Each worker opens its own source handle and decompresses its share of the
+    members, so a check can run next to config and XML parsing. Members that
+    passed once are remembered per archive fingerprint and skipped by later checks.
+    With resource limits, the listing is streamed and capped at max_entries like the
+    governed reads of ZipService, and members are read through streamed handles.
+    """
+
+    def __init__(self, max_workers: int = None, max_archives: int = DEFAULT_MAX_VERIFIED_ARCHIVES):
+        self.worker_count = max_workers or min(MAX_CHECK_WORKERS, os.cpu_count() or 1)
+        self.max_archives = max_archives
+        self._lock = threading.Lock()
+        self._verified_members = OrderedDict()
+
+
+    def check(self, archive_path: str, fingerprint: str, resource_limits=None) -> dict:
+        """
+        CRC-checks all members of an archive that were not verified for this fingerprint yet.
+        With resource_limits, members beyond max_entries are not checked and reported as one entry_limit failure.
+        Returns a report: {archive, member_count, checked_count, skipped_count,
+        failure_count, is_valid, is_complete, seconds, failures: [{member, kind, message}]};
+        is_complete is False if the check stopped at the entry limit.
+        """
+        start_time = time.perf_counter()
+        failures = []
+
+        try:
+            with open_archive_source(archive_path) as archive_source:
+                member_infos = self._list_members(archive_source, resource_limits, failures)
+        except (OSError, KeyError, zipfile.BadZipFile) as error:
+            failures = [self._failure("", FAILURE_UNREADABLE_ARCHIVE, str(error))]
+            return self._report(archive_path, 0, 0, 0, failures, start_time)
+
+        verified_names = self._verified_names(fingerprint)
+        pending_infos = [info for info in member_infos if info.filename not in verified_names]
+
+        if pending_infos:
+            verify_function = self._verify_member if resource_limits is None else self._verify_streamed_member
+            member_failures = read_entries_parallel(archive_path, pending_infos, verify_function, self.worker_count)
+
+            passed_names = set()
+            for member_info, member_failure in zip(pending_infos, member_failures):
+                if member_failure is None:
+                    passed_names.add(member_info.filename)
+                else:
+                    failures.append(member_failure)
+            failures.sort(key=lambda failure: failure["member"])
+            self._remember_verified(fingerprint, passed_names)
+
+        skipped_count = len(member_infos) - len(pending_infos)
+        return self._report(archive_path, len(member_infos), len(pending_infos), skipped_count, failures, start_time)
+
+
+    def _list_members(self, archive_source, resource_limits, failures: list) -> list:
+        """Lists the file members to check; governed, the listing is streamed and stops after max_entries."""
+        if resource_limits is None:
+            return [info for info in archive_source.infolist() if not info.is_dir()]
+
+        member_infos = []
+        max_entries = resource_limits.max_entries
+        for entry_number, entry_info in enumerate(archive_source.iter_entries(), start=1):
+            if max_entries is not None and entry_number > max_entries:
+                failures.append(self._failure("", FAILURE_ENTRY_LIMIT,
+                                              f"More than {max_entries} entries, the remaining entries were not checked"))
+                break
+            if not entry_info.is_dir():
+                member_infos.append(entry_info)
+        return member_infos
+
+
+    def unavailable_report(self, archive_path: str, kind: str, message: str) -> dict:
+        """Returns the report of an archive that cannot be checked at all, e.g. because none is loaded."""
+        return self._report(archive_path, 0, 0, 0, [self._failure("", kind, message)], time.perf_counter())
+
+
+    def _verify_member(self, archive_source, member_info) -> dict:
+        """
+        Reads one member to the end, which makes zipfile compare its CRC-32.
+        Directory sources have no checksums; their files are only checked for readability.
+        Returns: None if the member is intact, else a failure entry.
+        """
+        try:
+            with archive_source.open(member_info) as member_handle:
+                while member_handle.read(VERIFY_CHUNK_SIZE):
+                    pass
+        except (OSError, EOFError, zlib.error, zipfile.BadZipFile, NotImplementedError, RuntimeError) as error:
+            return self._failure(member_info.filename, classify_member_error(error), str(error))
+        return None
+
+
+    def _verify_streamed_member(self, archive_source, member_info) -> dict:
+        """Like _verify_member, but reads through a streamed handle, so the source never loads its full listing."""
+        try:
+            with archive_source.open_streamed(member_info) as member_handle:
+                while member_handle.read(VERIFY_CHUNK_SIZE):
+                    pass
+        except (OSError, EOFError, zlib.error, zipfile.BadZipFile, NotImplementedError, RuntimeError) as error:
+            return self._failure(member_info.filename, classify_member_error(error), str(error))
+        return None
+
+
+    def _verified_names(self, fingerprint: str) -> set:
+        """Returns a copy of the member names already verified for a fingerprint."""
+        if not fingerprint:
+            return set()
+        with self._lock:
+            verified_names = self._verified_members.get(fingerprint)
+            if verified_names is None:
+                return set()
+            self._verified_members.move_to_end(fingerprint)
+            return set(verified_names)
+
+
+    def _remember_verified(self, fingerprint: str, passed_names: set) -> None:
+        """Stores passed members; failed members are checked again next time."""
+        if not fingerprint or not passed_names:
+            return
+        with self._lock:
+            self._verified_members.setdefault(fingerprint, set()).update(passed_names)
+            self._verified_members.move_to_end(fingerprint)
+            while len(self._verified_members) > self.max_archives:
+                self._verified_members.popitem(last=False)
+
+
+    def _report(
+        self,
+        archive_path: str,
+        member_count: int,
+        checked_count: int,
+        skipped_count: int,
+        failures: list,
+        start_time: float
+    ) -> dict:
+        """Builds the check report."""
+        return {
+            "archive": archive_path,
+            "member_count": member_count,
+            "checked_count": checked_count,
+            "skipped_count": skipped_count,
+            "failure_count": len(failures),
+            "is_valid": not failures,
+            "is_complete": all(failure["kind"] != FAILURE_ENTRY_LIMIT for failure in failures),
+            "seconds": time.perf_counter() - start_time,
+            "failures": failures
+        }
+
+
+    def _failure(self, member_name: str, kind: str, message: str) -> dict:
+        """Builds a single failure entry."""
+        return {"member": member_name, "kind": kind, "message": message}
+
+
+# Shared instance, so verified members are remembered across sessions of a server process
+SHARED_INTEGRITY_CHECKER = ArchiveIntegrityChecker()
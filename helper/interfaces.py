@@ -14,7 +14,12 @@ class IMachineService(Protocol):
     current_file_order: List[str]
     is_bars_mode: bool
     uploaded_file_path: str
+    upload_directory: str
     extracted_xml_data: Dict[str, Dict[str, str]]
+    xml_data_version: int
+    extraction_tags: List[str]
+    integrity_report: Dict[str, Any]
+    order_import_report: Dict[str, Any]
 
 
     def logic_handle_upload(self, file_info: Any) -> str:
@@ -30,6 +35,36 @@ class IMachineService(Protocol):
         ...
 
 
+    def logic_open_source(self, source_location: str) -> str:
+        """
+        Uses a local source in place instead of an uploaded copy: a directory tree,
+        a ZIP file or a ZIP nested in a ZIP ("outer.zip!/inner.zip").
+
+        Returns:
+            str: The display name of the source.
+        """
+        ...
+
+
+    def logic_cleanup_session(self) -> None:
+        """
+        Removes the upload directory of the current session including all uploaded files.
+        """
+        ...
+
+
+    def logic_check_integrity(self) -> Dict[str, Any]:
+        """
+        Verifies the CRC-32 of all archive members; members verified before for the same
+        archive fingerprint are skipped.
+
+        Returns:
+            dict: member_count, checked_count, skipped_count, failure_count, is_valid, is_complete, seconds
+                  and failures as a list of {member, kind, message}.
+        """
+        ...
+
+
     def logic_parse_config(self) -> None:
         """
         Reads the configuration file from the uploaded ZIP and determines the machine type.
@@ -57,6 +92,16 @@ class IMachineService(Protocol):
         """CHECKS if you are allowed to switch between Bars and Profiles"""
         ...
 
+    def logic_blocked_features(self) -> Dict[str, str]:
+        """
+        Lists the features whose toggle the feature rules would revert in the current state.
+
+        Returns:
+            dict: feature name -> reason label for the UI
+        """
+        ...
+
+
     def logic_load_files_for_mode(self) -> None:
         """
         Loads the list of files (Bars or Profiles) from the ZIP based on current mode.
@@ -70,6 +115,15 @@ class IMachineService(Protocol):
         ...
 
 
+    def logic_set_extraction_tags(self, tag_specs: List[str]) -> None:
+        """
+        Configures which XML values are extracted per file.
+        Supports plain tag names, nested paths ("Tool/Length") and attributes ("Tool@id", "@version").
+        IST and SOLL are always part of the list.
+        """
+        ...
+
+
     def logic_move_file(self, from_index: int, to_index: int) -> None:
         """
         Moves a file within the current file order sequence.
@@ -84,8 +138,172 @@ class IMachineService(Protocol):
         ...
 
 
+    def logic_import_previous_order(self, previous_export_path: str) -> Dict[str, Any]:
+        """
+        Applies the FileOrder of the config.json in a previously exported ZIP.
+        Known files keep their old position, new files are appended, missing files are reported.
+
+        Returns:
+            dict: source, folder, is_applied, message, kept_count, appended, missing
+        """
+        ...
+
+
+    def logic_deviation_statistics(self) -> Dict[str, Any]:
+        """
+        Computes statistics of the absolute IST/SOLL deviation of the current files.
+
+        Returns:
+            dict: row_count, valid_count and, if numbers exist, mean, std, min, max, median.
+        """
+        ...
+
+
+    def logic_sort_by_deviation(self, descending: bool = True) -> None:
+        """
+        Reorders the current file sequence by IST/SOLL deviation in a single operation.
+        """
+        ...
+
+
     def logic_prepare_final_data(self) -> Dict[str, Any]:
         """
         Compiles all configuration data into a dictionary for the final ZIP creation.
         """
-        ...
\ No newline at end of file
+        ...
+
+
+    def logic_export_extracted_values(self, target_path: str) -> int:
+        """
+        Streams the extracted per-file values and their FileOrder position into a columnar file.
+        The format is chosen by extension: .csv always, .parquet/.arrow/.feather with pyarrow.
+
+        Returns:
+            int: Number of written rows.
+        """
+        ...
+
+
+    def logic_export(self, target_zip_path: str) -> bool:
+        """
+        Writes the deterministic export ZIP (sorted members, fixed timestamps, canonical config.json).
+        An export with unchanged source archive and final data is copied from the artifact cache.
+
+        Returns:
+            bool: True if the export succeeded.
+        """
+        ...
+
+
+class IAsyncMachineService(IMachineService, Protocol):
+    """
+    Interface for the non-blocking Machine Sequence Business Logic.
+    Extends the synchronous contract with awaitable variants of all I/O-bound operations,
+    so that UI event handlers can await them without freezing the event loop.
+    """
+
+    async def logic_handle_upload_async(self, file_info: Any) -> str:
+        """
+        Copies the uploaded file in a background worker.
+
+        Returns:
+            str: The name of the successfully uploaded file.
+        """
+        ...
+
+
+    async def logic_open_source_async(self, source_location: str) -> str:
+        """
+        Registers a local directory or (nested) ZIP in a background worker.
+
+        Returns:
+            str: The display name of the source.
+        """
+        ...
+
+
+    async def logic_parse_config_async(self) -> None:
+        """
+        Reads the configuration file from the uploaded ZIP in a background worker.
+        """
+        ...
+
+
+    async def logic_check_integrity_async(self) -> Dict[str, Any]:
+        """
+        Verifies the archive members in the background, in parallel with the parsing calls.
+
+        Returns:
+            dict: The integrity report, see logic_check_integrity.
+        """
+        ...
+
+
+    async def logic_load_files_for_mode_async(self) -> None:
+        """
+        Loads files and XML values for the current mode in a background worker.
+        Repeated requests while a load is running are coalesced into one follow-up load.
+        """
+        ...
+
+
+    async def logic_load_xml_data_for_files_async(self) -> None:
+        """
+        Loads the IST and SOLL Number from Bars and Profiles in a background worker.
+        """
+        ...
+
+
+    async def logic_set_extraction_tags_async(self, tag_specs: List[str]) -> None:
+        """
+        Applies a new tag list and re-extracts the XML values in a background worker.
+        """
+        ...
+
+
+    async def logic_import_previous_order_async(self, previous_export_path: str) -> Dict[str, Any]:
+        """
+        Applies the file order of a previously exported ZIP in a background worker.
+        """
+        ...
+
+
+    async def logic_toggle_feature_async(self, feature_name: str) -> None:
+        """
+        Toggles a machine feature; dependent reloads run in a background worker.
+        """
+        ...
+
+
+    async def logic_initialize_async(self) -> None:
+        """
+        Parses the configuration and loads the data of the initial mode.
+        """
+        ...
+
+
+    async def logic_sort_by_deviation_async(self, descending: bool = True) -> None:
+        """
+        Reorders the current file sequence by IST/SOLL deviation in a background worker.
+        """
+        ...
+
+
+    async def logic_export_extracted_values_async(self, target_path: str) -> int:
+        """
+        Writes the columnar export of the extracted values in a background worker.
+
+        Returns:
+            int: Number of written rows.
+        """
+        ...
+
+
+    async def logic_export_async(self, target_zip_path: str) -> bool:
+        """
+        Writes the configured ZIP to the target path in a background worker.
+
+        Returns:
+            bool: True if the export succeeded.
+        """
+        ...
@@ -1,9 +1,35 @@
 import os
 import shutil
-from .zipService import ZipService
+from .zipService import ZipService, toCanonicalJson
+from .archiveSource import fingerprint_source, extend_fingerprint, open_archive_source, archive_source_exists, NESTED_ARCHIVE_SEPARATOR
+from .exportCache import SHARED_EXPORT_CACHE
+from .diagnostics import INCOMPLETE_OUTCOMES
+from .integrityCheck import ArchiveIntegrityChecker, FAILURE_MISSING_ARCHIVE, FAILURE_UNREADABLE_ARCHIVE
+from .deviation import build_deviation_columns, deviation_statistics, order_by_deviation
+from .columnarExport import export_extracted_values
+from .sequenceMerge import merge_file_order
+from .featureRules import (
+    compile_rule_table,
+    compute_mount_limits,
+    default_mount_count,
+    DEFAULT_MIN_MOUNT_COUNT,
+    FEATURE_SHIFT_CUT,
+    FEATURE_SHELF_SMALL,
+    FEATURE_SHELF_BIG,
+    FEATURE_ROBOT_MODE,
+    SHELF_VALUE_SMALL,
+    SHELF_VALUE_BIG,
+    FINAL_KEY_MACHINE_MODEL,
+    FINAL_KEY_TEST_BARS,
+    FINAL_KEY_FILE_ORDER,
+    FINAL_KEY_MOUNT_COUNT,
+    FINAL_KEY_FEATURES,
+)
 
 # Configuration Constants
 UPLOAD_DIRECTORY_NAME = "uploads"
+CONFIG_FILE_PATH = "Configuration/MainKonfiguration.txt"
+NESTED_ARCHIVE_EXTENSION = ".zip"
 MACHINE_TYPE_PREFIX = ";MACHINE_TYPE_"
 REAL_MACHINE_ID_PREFIX = "REAL_MACHINE_TYPE:"
 
@@ -11,41 +37,61 @@ FOLDER_BARS = "Bars/"
 FOLDER_PROFILES = "Profiles/"
 XML_TAG_IST = "Is_Number"
 XML_TAG_SOLL = "ReferenceValue"
-
-# Machine Specific Limits
-DEFAULT_MIN_MOUNT_COUNT = 0
-DEFAULT_MAX_MOUNT_COUNT = 25
-SMALL_SHELF_LIMIT = 9
-AS100_MODEL_LIMIT = 10
-MIN_COUNT_FOR_EQUIPPED_MODELS = 1
-
-# Features
-FEATURE_SHIFT_CUT = "ShiftCutDevice"
-FEATURE_SHELF_SMALL = "createShelf"
-FEATURE_SHELF_BIG = "createBigShelf"
-FEATURE_ROBOT_MODE = "RobotMode"
+DEFAULT_EXTRACTION_TAGS = [XML_TAG_IST, XML_TAG_SOLL]
+TAG_LIST_SEPARATOR = ","
 
 # Konstanten für die Parsing-Logik
 EXPECTED_KV_PARTS = 2
 INDEX_KEY = 0
 INDEX_VALUE = 1
 
-# Mount Counts
-MOUNT_REQUIRED = 1
-MOUNT_NOT_REQUIRED = 0
-MODELS_WITH_MOUNT = {"AF500", "AF510", "AS100"}
-
 SEPARATOR_ASSIGNMENT = "="
 SEPARATOR_PROPERTY = ":"
 
+# Parse Cache Entry Keys
+CACHE_KEY_CONFIG = "config"
+CACHE_KEY_FILES_PREFIX = "files:"
+CACHE_KEY_XML_DATA = "xml_data:"
+CACHE_KEY_ARCHIVE_ROOT = "archive_root"
+CACHE_KEY_INTEGRITY = "integrity"
+
+
+def sanitize_upload_name(file_name: str) -> str:
+    """
+    Reduces a client-supplied file name to its last path component, so an upload
+    cannot leave the session upload directory. Raises ValueError for empty, "." or ".." names.
+    """
+    base_name = os.path.basename(file_name or "")
+    if base_name in ("", os.curdir, os.pardir):
+        raise ValueError(f"Invalid file name: {file_name!r}")
+    return base_name
+
+
 class MachineBusinessLogic:
     """
     Concrete implementation of the machine sequence business logic.
     Handles data processing, file management, and configuration validation.
     """
     
-    def __init__(self):
-        self.zip_service = ZipService()
+    def __init__(
+        self,
+        upload_directory: str = UPLOAD_DIRECTORY_NAME,
+        parse_cache=None,
+        export_cache=None,
+        integrity_checker=None,
+        event_bus=None,
+        resource_limits=None
+    ):
+        self.zip_service = ZipService(event_bus, resource_limits)
+        self.export_cache = export_cache or SHARED_EXPORT_CACHE
+        self.integrity_checker = integrity_checker or ArchiveIntegrityChecker()
+        self.integrity_report = {}
+        # Increased whenever another archive is registered, so background results of the previous one are dropped
+        self.archive_generation = 0
+        self.order_import_report = {}
+        self.upload_directory = upload_directory
+        self.parse_cache = parse_cache
+        self.archive_fingerprint = ""
         self.uploaded_file_path = ""
         self.machine_model_name = "UNKNOWN"
         self.machine_display_string = "Unknown Machine"
@@ -54,6 +100,19 @@ class MachineBusinessLogic:
         self.is_bars_mode = True
         self.current_file_order = []
         self.extracted_xml_data = {}
+        # Increased whenever extracted_xml_data is replaced, so views can tell a reload from an unchanged dict
+        self.xml_data_version = 0
+        self.extraction_tags = list(DEFAULT_EXTRACTION_TAGS)
+
+        # Deviation columns and statistics of the last refresh, rebuilt only if data or files changed
+        self._deviation_columns_key = None
+        self._deviation_columns = {}
+        self._deviation_statistics_key = None
+        self._deviation_statistics = {}
+
+        # Per-folder caches, so that switching modes does not reopen the ZIP
+        self.folder_file_orders = {}
+        self.is_xml_data_loaded = False
         
         self.feature_state = {
             FEATURE_SHIFT_CUT: False,
@@ -61,23 +120,180 @@ class MachineBusinessLogic:
             FEATURE_SHELF_BIG: False,
             FEATURE_ROBOT_MODE: False
         }
-        os.makedirs(UPLOAD_DIRECTORY_NAME, exist_ok=True)
+        os.makedirs(self.upload_directory, exist_ok=True)
 
 
     def logic_handle_upload(self, file_info) -> str:
-        """Copies the uploaded file from the picker to the local directory."""
-        file_name = file_info.name
-        destination_path = os.path.join(UPLOAD_DIRECTORY_NAME, file_name)
-        shutil.copy2(file_info.path, destination_path)
-        self.uploaded_file_path = destination_path
+        """
+        Copies the uploaded file from the picker to the upload directory.
+        In web mode the file has no local path; it was already uploaded into
+        the upload directory and only needs to be registered.
+        Raises ValueError for file names that are not a plain file name.
+        """
+        file_name = sanitize_upload_name(file_info.name)
+        destination_path = os.path.join(self.upload_directory, file_name)
+        if file_info.path:
+            shutil.copy2(file_info.path, destination_path)
+        self._register_source(destination_path, is_upload=True)
         return file_name
 
 
+    def logic_open_source(self, source_location: str) -> str:
+        """
+        Uses a local directory tree, ZIP file or nested ZIP ("outer.zip!/inner.zip") in place,
+        without copying it into the upload directory.
+        """
+        self._register_source(source_location)
+        return os.path.basename(source_location.rstrip(os.sep))
+
+
+    def _register_source(self, source_location: str, is_upload: bool = False) -> None:
+        """
+        Makes a source the current archive and drops everything cached for the previous one.
+        With a parse cache, the wrapper descent is cached under the fingerprint of the source,
+        so an indexed archive is registered without opening it.
+        Uploads are cached by content only; their path is deleted with the session.
+        """
+        self._reset_archive_cache()
+        if self.parse_cache is None:
+            self.uploaded_file_path = self._resolve_archive_root(source_location)
+            return
+
+        try:
+            source_fingerprint = self.parse_cache.fingerprint(source_location, remember_path=not is_upload)
+        except OSError:
+            # Missing or unreadable sources are registered uncached; the following reads report the error
+            self.uploaded_file_path = self._resolve_archive_root(source_location)
+            return
+        def resolve_root_suffix():
+            archive_root, is_complete = self._descend_archive_root(source_location)
+            return archive_root[len(source_location):], is_complete
+
+        root_suffix = self.parse_cache.get_or_compute(source_fingerprint, CACHE_KEY_ARCHIVE_ROOT, resolve_root_suffix)
+        self.uploaded_file_path = source_location + root_suffix
+        self.archive_fingerprint = extend_fingerprint(source_fingerprint, root_suffix)
+
+
+    def _resolve_archive_root(self, source_location: str) -> str:
+        """
+        Descends into a wrapper archive: a source without configuration that holds
+        exactly one ZIP is replaced by that nested ZIP, at any depth.
+        """
+        return self._descend_archive_root(source_location)[0]
+
+
+    def _descend_archive_root(self, source_location: str) -> tuple[str, bool]:
+        """Like _resolve_archive_root; also returns False if a level could not be read."""
+        try:
+            with open_archive_source(source_location) as archive_source:
+                member_names = archive_source.namelist()
+        except Exception:
+            # Unreadable sources are kept; the following reads report the error
+            return source_location, False
+
+        if CONFIG_FILE_PATH in member_names:
+            return source_location, True
+
+        nested_archive_names = [name for name in member_names if name.lower().endswith(NESTED_ARCHIVE_EXTENSION)]
+        if len(nested_archive_names) != 1:
+            return source_location, True
+        return self._descend_archive_root(f"{source_location}{NESTED_ARCHIVE_SEPARATOR}{nested_archive_names[0]}")
+
+
+    def logic_cleanup_session(self) -> None:
+        """Removes the upload directory of this session including all uploaded files."""
+        shutil.rmtree(self.upload_directory, ignore_errors=True)
+        self.uploaded_file_path = ""
+        self._reset_archive_cache()
+        self.zip_service.close()
+
+
+    def _read_cached(self, entry_key: str, compute_function):
+        """
+        Reads an archive entry through the shared parse cache, if one is configured.
+        Empty results and reads cut short by I/O errors, caps or parse workers are not cached;
+        entries that fail because of their content (e.g. invalid XML) do not prevent caching.
+        """
+        if self.parse_cache is None or not self.archive_fingerprint:
+            return compute_function()
+
+        def compute_complete():
+            with self.zip_service.recordFailures() as failure_outcomes:
+                computed_value = compute_function()
+            is_complete = bool(computed_value) and INCOMPLETE_OUTCOMES.isdisjoint(failure_outcomes)
+            return computed_value, is_complete
+
+        return self.parse_cache.get_or_compute(self.archive_fingerprint, entry_key, compute_complete)
+
+
+    def _reset_archive_cache(self) -> None:
+        """Drops all cached folder data, e.g. after a new archive was uploaded."""
+        self.folder_file_orders = {}
+        self.is_xml_data_loaded = False
+        self.extracted_xml_data = {}
+        self.xml_data_version += 1
+        self.current_file_order = []
+        self.archive_fingerprint = ""
+        self.archive_generation += 1
+        self.integrity_report = {}
+        self.order_import_report = {}
+
+
+    def logic_check_integrity(self) -> dict:
+        """
+        CRC-checks all members of the uploaded archive and stores the report.
+        Safe to run next to the parsing calls; it only reads the archive.
+        Without a loaded or existing archive, the report holds a single missing_archive failure.
+        If another archive was registered meanwhile, the report is returned but not stored.
+        """
+        archive_path = self.uploaded_file_path
+        archive_fingerprint = self.archive_fingerprint
+        archive_generation = self.archive_generation
+        report = self._check_integrity(archive_path, archive_fingerprint)
+
+        if archive_path == self.uploaded_file_path and archive_generation == self.archive_generation:
+            self.integrity_report = report
+        return report
+
+
+    def _check_integrity(self, archive_path: str, archive_fingerprint: str) -> dict:
+        """
+        Builds the integrity report of an archive without touching the session state.
+        archive_fingerprint is the stored fingerprint of archive_path, empty if it is not known yet.
+        """
+        if not archive_path or not archive_source_exists(archive_path):
+            message = f"Archive not found: {archive_path}" if archive_path else "No archive loaded"
+            return self.integrity_checker.unavailable_report(archive_path, FAILURE_MISSING_ARCHIVE, message)
+
+        # Computed locally instead of stored, the parsing thread may set the fingerprint concurrently
+        try:
+            fingerprint = archive_fingerprint or fingerprint_source(archive_path)
+        except OSError as e:
+            return self.integrity_checker.unavailable_report(archive_path, FAILURE_UNREADABLE_ARCHIVE, str(e))
+        if self.parse_cache is None or not archive_fingerprint:
+            return self.integrity_checker.check(archive_path, fingerprint, self.zip_service.resourceLimits)
+
+        def check_complete():
+            report = self.integrity_checker.check(archive_path, fingerprint, self.zip_service.resourceLimits)
+            # Member failures belong to the content, an unreadable or capped check does not
+            is_complete = report["is_complete"] and all(
+                failure["kind"] != FAILURE_UNREADABLE_ARCHIVE for failure in report["failures"]
+            )
+            return report, is_complete
+
+        cached_report = self.parse_cache.get_or_compute(fingerprint, CACHE_KEY_INTEGRITY, check_complete)
+        # The cached report may come from another path of the same content
+        return dict(cached_report, archive=archive_path)
+
+
     def logic_parse_config(self) -> None:
         """Reads the configuration file and identifies the machine model."""
-        raw_content = self.zip_service.readSingleFile(
-            self.uploaded_file_path,
-            "Configuration/MainKonfiguration.txt"
+        raw_content = self._read_cached(
+            CACHE_KEY_CONFIG,
+            lambda: self.zip_service.readSingleFile(
+                self.uploaded_file_path,
+                CONFIG_FILE_PATH
+            )
         )
         if not raw_content:
             return
@@ -115,10 +331,7 @@ class MachineBusinessLogic:
 
     def _set_mount_count(self):
         """Calculates the mount count dependend on the machine"""
-        if self.machine_model_name in MODELS_WITH_MOUNT:
-            self.mount_count = MOUNT_REQUIRED
-        else:
-            self.mount_count = MOUNT_NOT_REQUIRED
+        self.mount_count = default_mount_count(self.machine_model_name)
 
 
     def logic_validate_mount_count(self, user_input_text: str) -> tuple[str, bool, str]:
@@ -126,20 +339,10 @@ class MachineBusinessLogic:
         Validates the mount count using named limits instead of magic numbers.
         Returns: (clamped_value, has_error, hint_message)
         """
-        min_allowed = DEFAULT_MIN_MOUNT_COUNT
-        max_allowed = DEFAULT_MAX_MOUNT_COUNT
-        limit_description = ""
-
         # Adjust limits based on active features or machine model
-        if self.feature_state.get(FEATURE_SHELF_SMALL):
-            min_allowed, max_allowed = MIN_COUNT_FOR_EQUIPPED_MODELS, SMALL_SHELF_LIMIT
-            limit_description = "(Small Shelf Limit)"
-        elif self.feature_state.get(FEATURE_SHELF_BIG):
-            min_allowed, max_allowed = MIN_COUNT_FOR_EQUIPPED_MODELS, DEFAULT_MAX_MOUNT_COUNT
-            limit_description = "(Big Shelf Limit)"
-        elif self.machine_model_name == "AS100":
-            min_allowed, max_allowed = MIN_COUNT_FOR_EQUIPPED_MODELS, AS100_MODEL_LIMIT
-            limit_description = "(AS100 Limit)"
+        min_allowed, max_allowed, limit_description = compute_mount_limits(
+            self.machine_model_name, self.feature_state
+        )
 
         try:
             numeric_value = int(user_input_text) if user_input_text else DEFAULT_MIN_MOUNT_COUNT
@@ -157,55 +360,96 @@ class MachineBusinessLogic:
 
 
     def logic_toggle_feature(self, feature_name: str) -> None:
-        """Toggles features and maintains logical consistency between options."""
-        self.feature_state[feature_name] = not self.feature_state.get(feature_name, False)
-        states = self.feature_state
-        if feature_name in [FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG] and states[feature_name]:
-            other = FEATURE_SHELF_BIG if feature_name == FEATURE_SHELF_SMALL else FEATURE_SHELF_SMALL
-            states[other] = False
-            states[FEATURE_ROBOT_MODE] = True
-            states[FEATURE_SHIFT_CUT] = False
-        else:
-            if not states[FEATURE_SHELF_SMALL] and not states[FEATURE_SHELF_BIG]:
-                states[FEATURE_ROBOT_MODE] = False
-
-        if feature_name == FEATURE_SHIFT_CUT and states[FEATURE_SHIFT_CUT]:
-            if states[FEATURE_SHELF_SMALL] or states[FEATURE_SHELF_BIG]:
-                states[FEATURE_SHIFT_CUT] = False
-            else:
-                self.is_bars_mode = True
-                self.logic_load_files_for_mode()
-                self.logic_load_xml_data_for_files()
+        """Toggles a feature; dependent features follow the compiled rule table (see helper.featureRules)."""
+        rule_table = compile_rule_table(self.machine_model_name)
+        # Updated in place, the view holds a reference to the state
+        self.feature_state.update(rule_table.toggle(self.feature_state, feature_name))
+
+        if self.feature_state.get(feature_name) and rule_table.forces_bars_mode(self.feature_state):
+            self.is_bars_mode = True
+            self.logic_load_files_for_mode()
+            self.logic_load_xml_data_for_files()
 
     def logic_is_mode_switch_allowed(self) -> bool:
         """CHECKS if you are allowed to switch between Bars and Profiles"""
-        return not self.feature_state.get(FEATURE_SHIFT_CUT, False)
+        return not compile_rule_table(self.machine_model_name).forces_bars_mode(self.feature_state)
+
+    def logic_blocked_features(self) -> dict:
+        """Returns {feature: reason label} of all features that cannot be toggled in the current state."""
+        return compile_rule_table(self.machine_model_name).blocked_features(self.feature_state)
 
     def logic_load_files_for_mode(self) -> None:
-        """Fetches file names from the ZIP for the selected mode."""
-        self.active_folder = "Bars/" if self.is_bars_mode else "Profiles/"
-        self.current_file_order = self.zip_service.getFileNamesInFolder(
-            self.uploaded_file_path, self.active_folder
-        )
+        """
+        Activates the file list of the selected mode.
+        Each folder is read from the ZIP only once; afterwards switching is a
+        plain swap that keeps the user ordering of both folders.
+        """
+        self.active_folder = FOLDER_BARS if self.is_bars_mode else FOLDER_PROFILES
+        self.current_file_order = self._folder_file_order(self.active_folder)
+
+
+    def _folder_file_order(self, folder: str) -> list:
+        """Returns the session ordering of a folder, reading its file names on first use."""
+        if folder not in self.folder_file_orders:
+            cached_names = self._read_cached(
+                CACHE_KEY_FILES_PREFIX + folder,
+                lambda: tuple(self.zip_service.getFileNamesInFolder(self.uploaded_file_path, folder))
+            )
+            # The cached tuple is shared, the ordering belongs to this session
+            self.folder_file_orders[folder] = list(cached_names)
+        return self.folder_file_orders[folder]
 
 
     def logic_load_xml_data_for_files(self) -> None:
         """
         Loads IST- and SOLL-Values from the XML in Bars/ and Profiles/.
         """
-        if not self.uploaded_file_path:
+        if not self.uploaded_file_path or self.is_xml_data_loaded:
             return
 
         target_folders = [FOLDER_BARS, FOLDER_PROFILES]
-        tags_to_find = [XML_TAG_IST, XML_TAG_SOLL]
-
-        raw_results = self.zip_service.extractXmlDataFromFolders(
-            self.uploaded_file_path, 
-            target_folders, 
-            tags_to_find
+        tags_to_find = list(self.extraction_tags)
+
+        # The active limits are part of the key, a read truncated under one cap is not reused under another
+        resource_limits = self.zip_service.resourceLimits
+        limits_key = resource_limits.result_key() if resource_limits is not None else ""
+        raw_results = self._read_cached(
+            CACHE_KEY_XML_DATA + limits_key + ":" + TAG_LIST_SEPARATOR.join(tags_to_find),
+            lambda: self.zip_service.extractXmlDataFromFolders(
+                self.uploaded_file_path,
+                target_folders,
+                tags_to_find
+            )
         )
 
         self.extracted_xml_data = raw_results
+        self.xml_data_version += 1
+        self.is_xml_data_loaded = True
+
+
+    def logic_preload_archive(self) -> None:
+        """
+        Parses everything the wizard reads from an archive: configuration, the file
+        lists of both folders and the XML values. With a persistent parse cache this
+        fills the index ahead of time (see helper.archiveIndexer).
+        """
+        self.logic_parse_config()
+        for folder in (FOLDER_BARS, FOLDER_PROFILES):
+            self._folder_file_order(folder)
+        self.logic_load_xml_data_for_files()
+
+
+    def logic_set_extraction_tags(self, tag_specs: list) -> None:
+        """
+        Sets the XML values to extract (names, paths like "Tool/Length", attributes like "Tool@id").
+        IST and SOLL are always extracted; the XML data is reloaded on the next load call.
+        """
+        requested_tags = [tag.strip() for tag in tag_specs if tag and tag.strip()]
+        combined_tags = list(dict.fromkeys(DEFAULT_EXTRACTION_TAGS + requested_tags))
+
+        if combined_tags != self.extraction_tags:
+            self.extraction_tags = combined_tags
+            self.is_xml_data_loaded = False
 
 
     def logic_reorder_drag_drop(self, source_index: int, destination_index: int) -> None:
@@ -215,18 +459,146 @@ class MachineBusinessLogic:
             self.current_file_order.insert(destination_index, moved_item)
 
 
+    def logic_import_previous_order(self, previous_export_path: str) -> dict:
+        """
+        Applies the FileOrder of a previously exported ZIP to the folder it was made for.
+        Files still present keep their old position, new files are appended and
+        files that no longer exist are only reported.
+        If the export was made for the other mode, the mode is switched where the features allow it;
+        otherwise only the other folder is updated and is_active_folder is False.
+        Returns: {source, folder, is_applied, message, kept_count, appended, missing, is_mode_switched, is_active_folder}
+        """
+        previous_config = self.zip_service.readExportedConfig(previous_export_path)
+        previous_order = previous_config.get(FINAL_KEY_FILE_ORDER)
+        report = {
+            "source": os.path.basename(previous_export_path),
+            "folder": "",
+            "is_applied": False,
+            "message": "",
+            "kept_count": 0,
+            "appended": [],
+            "missing": [],
+            "is_mode_switched": False,
+            "is_active_folder": False
+        }
+
+        if not isinstance(previous_order, list):
+            report["message"] = f"Keine {FINAL_KEY_FILE_ORDER} in {report['source']} gefunden"
+            self.order_import_report = report
+            return report
+
+        folder = FOLDER_BARS if previous_config.get(FINAL_KEY_TEST_BARS, True) else FOLDER_PROFILES
+        folder_order = self._folder_file_order(folder)
+        merge_result = merge_file_order([str(name) for name in previous_order], folder_order)
+        # In-place, so current_file_order and the per-folder cache keep pointing to the same list
+        folder_order[:] = merge_result["file_order"]
+
+        is_mode_switched = folder != self.active_folder and self.logic_is_mode_switch_allowed()
+        if is_mode_switched:
+            self.is_bars_mode = folder == FOLDER_BARS
+            self.logic_load_files_for_mode()
+
+        report.update(
+            folder=folder,
+            is_applied=True,
+            is_mode_switched=is_mode_switched,
+            is_active_folder=folder == self.active_folder,
+            message=f"{merge_result['kept_count']} von {len(previous_order)} Positionen übernommen",
+            kept_count=merge_result["kept_count"],
+            appended=merge_result["appended"],
+            missing=merge_result["missing"]
+        )
+        self.order_import_report = report
+        return report
+
+
+    def logic_build_deviation_columns(self) -> dict:
+        """
+        Builds numeric IST/SOLL/deviation columns in the current file order.
+        The columns are reused until the XML data or the order changes; treat them as read-only.
+        """
+        columns_key = (self.xml_data_version, self.active_folder, tuple(self.current_file_order))
+        if columns_key != self._deviation_columns_key:
+            self._deviation_columns = build_deviation_columns(
+                self.current_file_order,
+                self.active_folder,
+                self.extracted_xml_data,
+                XML_TAG_IST,
+                XML_TAG_SOLL
+            )
+            self._deviation_columns_key = columns_key
+        return self._deviation_columns
+
+
+    def logic_deviation_statistics(self) -> dict:
+        """
+        Returns statistics of the absolute IST/SOLL deviation of the current files.
+        They do not depend on the order, so drags and sorts reuse them until the data or the files change.
+        """
+        statistics_key = (self.xml_data_version, self.active_folder, frozenset(self.current_file_order))
+        if statistics_key != self._deviation_statistics_key:
+            self._deviation_statistics = deviation_statistics(self.logic_build_deviation_columns())
+            self._deviation_statistics_key = statistics_key
+        return dict(self._deviation_statistics)
+
+
+    def logic_sort_by_deviation(self, descending: bool = True) -> None:
+        """Reorders the current sequence by IST/SOLL deviation, largest first by default."""
+        permutation = order_by_deviation(self.logic_build_deviation_columns(), descending)
+        ordered_files = [self.current_file_order[index] for index in permutation]
+        # In-place, so the per-folder cache keeps the new ordering
+        self.current_file_order[:] = ordered_files
+
+
+    def logic_export_extracted_values(self, target_path: str) -> int:
+        """
+        Streams the extracted XML values of all files with their sequence position to a
+        CSV, Parquet or Arrow file (chosen by extension). Returns the number of rows.
+        """
+        return export_extracted_values(
+            target_path,
+            self.extracted_xml_data,
+            self.folder_file_orders,
+            self.active_folder,
+            self.extraction_tags
+        )
+
+
     def logic_prepare_final_data(self) -> dict:
         """Formats all configuration data for final processing."""
         final_features = []
         for key, active in self.feature_state.items():
             if active:
-                if key == FEATURE_SHELF_SMALL: final_features.append({FEATURE_SHELF_SMALL: "smallShelf"})
-                elif key == FEATURE_SHELF_BIG: final_features.append({FEATURE_SHELF_SMALL: "bigShelf"})
+                if key == FEATURE_SHELF_SMALL: final_features.append({FEATURE_SHELF_SMALL: SHELF_VALUE_SMALL})
+                elif key == FEATURE_SHELF_BIG: final_features.append({FEATURE_SHELF_SMALL: SHELF_VALUE_BIG})
                 else: final_features.append({key: active})
         return {
-            "MachineModel": self.machine_model_name,
-            "TestBars": self.is_bars_mode,
-            "FileOrder": self.current_file_order,
-            "MountCount": self.mount_count,
-            "Features": final_features
-        }
\ No newline at end of file
+            FINAL_KEY_MACHINE_MODEL: self.machine_model_name,
+            FINAL_KEY_TEST_BARS: self.is_bars_mode,
+            FINAL_KEY_FILE_ORDER: self.current_file_order,
+            FINAL_KEY_MOUNT_COUNT: self.mount_count,
+            FINAL_KEY_FEATURES: final_features
+        }
+
+
+    def logic_export(self, target_zip_path: str) -> bool:
+        """
+        Writes the deterministic export ZIP to the target path.
+        Reuses a cached artifact if source archive and final data are unchanged.
+        """
+        if not self.uploaded_file_path or not archive_source_exists(self.uploaded_file_path):
+            return False
+        if not self.archive_fingerprint:
+            self.archive_fingerprint = fingerprint_source(self.uploaded_file_path)
+
+        final_data = self.logic_prepare_final_data()
+        artifact_key = self.export_cache.build_key(self.archive_fingerprint, toCanonicalJson(final_data))
+
+        artifact_hash = self.export_cache.export(
+            artifact_key,
+            target_zip_path,
+            lambda build_path: self.zip_service.createDeterministicZipWithConfig(
+                self.uploaded_file_path, build_path, final_data
+            )
+        )
+        return bool(artifact_hash)
@@ -0,0 +1,96 @@
+import threading
+from collections import OrderedDict
+from .archiveSource import fingerprint_file, fingerprint_source
+
+# Cache Configuration
+DEFAULT_MAX_CACHED_ARCHIVES = 32
+
+
+class ArchiveParseCache:
+    """
+    Process-wide, thread-safe cache of parsed archive data.
+    Entries are keyed by the content fingerprint of the archive, so identical
+    uploads of different sessions share one parse. Concurrent requests for the
+    same entry are computed only once; later callers wait for the first result.
+    Only complete results are kept, a failed read is computed again by the next caller.
+    Cached values are shared between sessions and must be treated as read-only.
+    With a PersistentParseStore, misses are looked up on disk before parsing and
+    computed entries are written through, so they survive restarts and can be
+    filled ahead of time by the archive indexer.
+    """
+
+    def __init__(self, max_archives: int = DEFAULT_MAX_CACHED_ARCHIVES, store=None):
+        self.max_archives = max_archives
+        self.store = store
+        self._lock = threading.Lock()
+        self._archives = OrderedDict()
+        self._entry_locks = {}
+
+
+    def fingerprint(self, location: str, remember_path: bool = True) -> str:
+        """
+        Returns the fingerprint of a source location, answered from the store's path records if possible.
+        Without remember_path no path record is written, e.g. for uploads deleted with their session.
+        """
+        if self.store is not None:
+            return self.store.fingerprint(location, remember_path)
+        return fingerprint_source(location)
+
+
+    def get_or_compute(self, fingerprint: str, entry_key: str, compute_function):
+        """
+        Returns the cached entry of an archive, computing it once if missing.
+        compute_function returns (value, is_complete). Incomplete values (failed, empty or
+        truncated reads) are returned but neither cached nor stored, so the next caller retries.
+        """
+        with self._lock:
+            cached_value = self._lookup(fingerprint, entry_key)
+            if cached_value is not None:
+                return cached_value
+            entry_lock = self._entry_locks.setdefault((fingerprint, entry_key), threading.Lock())
+
+        with entry_lock:
+            with self._lock:
+                cached_value = self._lookup(fingerprint, entry_key)
+                if cached_value is not None:
+                    return cached_value
+
+            stored_entries = self.store.load(fingerprint) if self.store is not None else {}
+            if entry_key in stored_entries:
+                computed_value, is_complete = stored_entries[entry_key], True
+            else:
+                computed_value, is_complete = compute_function()
+                if self.store is not None and is_complete:
+                    self.store.save_entry(fingerprint, entry_key, computed_value)
+
+            with self._lock:
+                archive_entries = self._archives.setdefault(fingerprint, {})
+                for stored_key, stored_value in stored_entries.items():
+                    archive_entries.setdefault(stored_key, stored_value)
+                if is_complete:
+                    archive_entries[entry_key] = computed_value
+                self._archives.move_to_end(fingerprint)
+                while len(self._archives) > self.max_archives:
+                    self._archives.popitem(last=False)
+                self._entry_locks.pop((fingerprint, entry_key), None)
+
+        return computed_value
+
+
+    def _lookup(self, fingerprint: str, entry_key: str):
+        """Returns a cached entry and marks the archive as recently used. Caller holds the lock."""
+        archive_entries = self._archives.get(fingerprint)
+        if archive_entries is None or entry_key not in archive_entries:
+            return None
+        self._archives.move_to_end(fingerprint)
+        return archive_entries[entry_key]
+
+
+    def clear(self) -> None:
+        """Removes all cached archives."""
+        with self._lock:
+            self._archives.clear()
+
+
+# Shared instance used by all sessions of a server process
+SHARED_PARSE_CACHE = ArchiveParseCache()
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from .archiveSource import NESTED_ARCHIVE_SEPARATOR, extend_fingerprint, fingerprint_source
+
+# Store Configuration
+PARSE_STORE_DIRECTORY_NAME = "parse_cache"
+# Version 2: failed and truncated reads are no longer stored, older stores may hold them
+PARSE_STORE_FORMAT_VERSION = 2
+ARCHIVES_SUBDIRECTORY_NAME = "archives"
+PATHS_SUBDIRECTORY_NAME = "paths"
+ENTRY_FILE_EXTENSION = ".json"
+TEMPORARY_FILE_EXTENSION = ".tmp"
+DEFAULT_MAX_STORE_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+PRUNE_INTERVAL_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentParseStore:
+    """
+    On-disk backing store of the parse cache, shared between processes.
+    Holds one JSON file of parsed entries per archive fingerprint and one small path record
+    per archive file (path, size, mtime -> fingerprint), so an unchanged archive is not hashed again.
+    Files are replaced atomically; concurrent writers may lose an entry, which is then
+    simply parsed again on the next miss.
+    The store is pruned on start and at most every PRUNE_INTERVAL_SECONDS while writing:
+    entries unused for max_age_seconds and, beyond max_bytes, the least recently used entries
+    are deleted, as are path records of files that no longer exist.
+    """
+
+    def __init__(
+        self,
+        store_directory: str = PARSE_STORE_DIRECTORY_NAME,
+        max_bytes: int = DEFAULT_MAX_STORE_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS
+    ):
+        self.store_directory = store_directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._archives_directory = os.path.join(store_directory, ARCHIVES_SUBDIRECTORY_NAME)
+        self._paths_directory = os.path.join(store_directory, PATHS_SUBDIRECTORY_NAME)
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        os.makedirs(self._archives_directory, exist_ok=True)
+        os.makedirs(self._paths_directory, exist_ok=True)
+        self.prune()
+
+
+    def fingerprint(self, location: str, remember_path: bool = True) -> str:
+        """
+        Returns the fingerprint of a source location like fingerprint_source.
+        Archive files whose size and mtime match their path record reuse the stored hash.
+        Without remember_path (e.g. for short-lived session uploads) the file is hashed and no record is written.
+        """
+        base_path = location.split(NESTED_ARCHIVE_SEPARATOR, 1)[0]
+        if not remember_path or not os.path.isfile(base_path):
+            return fingerprint_source(location)
+
+        absolute_path = os.path.abspath(base_path)
+        record_path = self._path_record_path(absolute_path)
+        file_stat = os.stat(base_path)
+        path_record = self._read_json(record_path)
+        if path_record.get("path") == absolute_path and path_record.get("state") == [file_stat.st_size, file_stat.st_mtime_ns]:
+            base_fingerprint = path_record["fingerprint"]
+        else:
+            base_fingerprint = fingerprint_source(base_path)
+            self._write_json(record_path, {
+                "path": absolute_path,
+                "state": [file_stat.st_size, file_stat.st_mtime_ns],
+                "fingerprint": base_fingerprint
+            })
+
+        return extend_fingerprint(base_fingerprint, location[len(base_path):])
+
+
+    def load(self, fingerprint: str) -> dict:
+        """Returns all stored entries of an archive, or an empty dict if none are stored. Marks them as recently used."""
+        entry_path = self._entry_path(fingerprint)
+        stored_document = self._read_json(entry_path)
+        if stored_document.get("format") != PARSE_STORE_FORMAT_VERSION:
+            return {}
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return stored_document.get("entries", {})
+
+
+    def save_entry(self, fingerprint: str, entry_key: str, value) -> bool:
+        """Adds one entry to the stored entries of an archive. Returns False if the value is not JSON serializable."""
+        with self._lock:
+            stored_entries = self.load(fingerprint)
+            stored_entries[entry_key] = value
+            try:
+                self._write_json(self._entry_path(fingerprint), {"format": PARSE_STORE_FORMAT_VERSION, "entries": stored_entries})
+            except (TypeError, ValueError) as e:
+                logger.warning("Parse cache entry %s of %s not stored: %s", entry_key, fingerprint, e)
+                return False
+            is_prune_due = time.monotonic() - self._last_prune >= PRUNE_INTERVAL_SECONDS
+        if is_prune_due:
+            self.prune()
+        return True
+
+
+    def prune(self) -> None:
+        """Deletes expired and least recently used entries beyond max_bytes, and path records of vanished files."""
+        self._last_prune = time.monotonic()
+        expiry_time = time.time() - self.max_age_seconds if self.max_age_seconds else None
+
+        entry_files = []
+        for entry_path in self._list_files(self._archives_directory):
+            try:
+                file_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            if expiry_time is not None and file_stat.st_mtime < expiry_time:
+                self._remove(entry_path)
+            else:
+                entry_files.append((file_stat.st_mtime, file_stat.st_size, entry_path))
+
+        if self.max_bytes is not None:
+            stored_bytes = sum(file_size for _mtime, file_size, _path in entry_files)
+            for _mtime, file_size, entry_path in sorted(entry_files):
+                if stored_bytes <= self.max_bytes:
+                    break
+                self._remove(entry_path)
+                stored_bytes -= file_size
+
+        for record_path in self._list_files(self._paths_directory):
+            archive_path = self._read_json(record_path).get("path")
+            if not archive_path or not os.path.isfile(archive_path):
+                self._remove(record_path)
+
+
+    def _entry_path(self, fingerprint: str) -> str:
+        return os.path.join(self._archives_directory, fingerprint + ENTRY_FILE_EXTENSION)
+
+
+    def _path_record_path(self, absolute_path: str) -> str:
+        path_hash = hashlib.sha256(absolute_path.encode("utf-8", "surrogateescape")).hexdigest()
+        return os.path.join(self._paths_directory, path_hash + ENTRY_FILE_EXTENSION)
+
+
+    @staticmethod
+    def _list_files(directory_path: str) -> list[str]:
+        """Returns the stored JSON files of a directory; temporary files of running writers are skipped."""
+        try:
+            file_names = os.listdir(directory_path)
+        except OSError:
+            return []
+        return [os.path.join(directory_path, file_name) for file_name in file_names if file_name.endswith(ENTRY_FILE_EXTENSION)]
+
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+    @staticmethod
+    def _read_json(file_path: str) -> dict:
+        try:
+            with open(file_path, "r", encoding="utf-8") as json_file:
+                stored_document = json.load(json_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable parse cache file %s: %s", file_path, e)
+            return {}
+        return stored_document if isinstance(stored_document, dict) else {}
+
+
+    @staticmethod
+    def _write_json(file_path: str, document: dict) -> None:
+        """Serializes first, then replaces the file atomically, so readers never see partial content."""
+        serialized_document = json.dumps(document, ensure_ascii=False)
+        temporary_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}{TEMPORARY_FILE_EXTENSION}"
+        with open(temporary_path, "w", encoding="utf-8") as json_file:
+            json_file.write(serialized_document)
+        os.replace(temporary_path, file_path)
@@ -0,0 +1,450 @@
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from multiprocessing.connection import wait as wait_for_connections
+from .extractionPlan import ExtractionPlan
+from .diagnostics import (
+    OUTCOME_OK,
+    OUTCOME_INVALID_XML,
+    OUTCOME_ERROR,
+    OUTCOME_TIMEOUT,
+    OUTCOME_MEMORY_LIMIT,
+    OUTCOME_WORKER_CRASHED,
+)
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; workers run without an address space limit there, the timeout still applies
+    resource = None
+
+# Supervisor Configuration
+# Spawned instead of forked: the UI process runs threads, which a fork would copy in an undefined state
+WORKER_START_METHOD = "spawn"
+PARSE_BATCH_ENTRIES = 64
+PARSE_BATCH_BYTES = 1024 * 1024
+INPUT_POLL_SECONDS = 0.1
+RESULT_FLUSH_SECONDS = 0.05
+WORKER_STOP_SECONDS = 1.0
+WORKER_START_SECONDS = 60.0
+MAX_WORKER_START_FAILURES = 3
+STATM_PATH = "/proc/self/statm"
+# Exit codes of workers killed from outside (kill, OOM killer, shutdown) rather than by their own memory limit
+EXTERNAL_KILL_EXIT_CODES = (-signal.SIGKILL, -signal.SIGTERM) if hasattr(signal, "SIGKILL") else ()
+_STOP_WORKER = None
+_WORKER_READY = "ready"
+
+logger = logging.getLogger(__name__)
+
+
+class ParseWorkerStartError(RuntimeError):
+    """
+    Raised when parse workers die or hang before they are ready, e.g. in a broken frozen build.
+    remaining_entries holds every queue item the parse has not yielded yet, in queue order,
+    as (item, parse result or None), so the caller can finish the parse without workers.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.remaining_entries = []
+
+
+def _limit_address_space(memory_limit_bytes: int) -> None:
+    """Caps the address space of the worker at its size after start-up plus the limit."""
+    if resource is None or not memory_limit_bytes:
+        return
+    baseline_bytes = 0
+    try:
+        with open(STATM_PATH, "r", encoding="ascii") as statm_file:
+            baseline_bytes = int(statm_file.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    limit_bytes = baseline_bytes + memory_limit_bytes
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    except (OSError, ValueError) as error:
+        logger.warning("Parse worker runs without memory limit: %s", error)
+
+
+def _parse_worker_main(connection, memory_limit_bytes: int) -> None:
+    """
+    Worker process: announces itself as ready, then receives (tag_specs, [xml bytes, ...])
+    batches and answers with lists of (outcome, values or message, parse seconds), one per entry in batch order.
+    Results are sent at least every RESULT_FLUSH_SECONDS, so a hanging entry is detected by missing progress.
+    """
+    _limit_address_space(memory_limit_bytes)
+    connection.send(_WORKER_READY)
+    extraction_plan = None
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is _STOP_WORKER:
+            return
+
+        tag_specs, xml_batch = message
+        if extraction_plan is None or extraction_plan.tag_specs != tag_specs:
+            extraction_plan = ExtractionPlan(tag_specs)
+
+        results = []
+        last_flush = time.perf_counter()
+        for xml_bytes in xml_batch:
+            start_time = time.perf_counter()
+            try:
+                result = (OUTCOME_OK, extraction_plan.extract(io.BytesIO(xml_bytes)))
+            except ET.ParseError as error:
+                result = (OUTCOME_INVALID_XML, str(error))
+            except MemoryError:
+                result = (OUTCOME_MEMORY_LIMIT, f"Parser exceeded the memory limit of {memory_limit_bytes} bytes")
+            except Exception as error:
+                result = (OUTCOME_ERROR, str(error))
+            results.append((*result, time.perf_counter() - start_time))
+            if time.perf_counter() - last_flush >= RESULT_FLUSH_SECONDS:
+                connection.send(results)
+                results = []
+                last_flush = time.perf_counter()
+        if results:
+            connection.send(results)
+
+
+class _ParseWorker:
+    """Parent-side handle of one worker process and the entries it was sent but has not answered yet."""
+
+    def __init__(self, context, memory_limit_bytes: int):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_parse_worker_main,
+            args=(child_connection, memory_limit_bytes),
+            daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        # Spawning imports the interpreter and this package; entry deadlines start once the worker is ready
+        self.is_ready = False
+        self.started = time.perf_counter()
+        # (sequence, item) of the sent batch; the first one is being parsed since entry_started
+        self.pending_entries = deque()
+        self.entry_started = 0.0
+
+
+    def deadline(self, entry_timeout_seconds: float) -> float:
+        if not self.is_ready:
+            return self.started + WORKER_START_SECONDS
+        return self.entry_started + entry_timeout_seconds
+
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+    def stop(self) -> None:
+        try:
+            self.connection.send(_STOP_WORKER)
+        except OSError:
+            pass
+        self.process.join(WORKER_STOP_SECONDS)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class XmlParseSupervisor:
+    """
+    Parses XML entries in supervised worker processes instead of the calling process.
+    Every entry has a timeout and every worker an address space limit (where the OS
+    supports it), so one huge, deeply nested or entity-expanding file can neither stall
+    nor exhaust the UI process. A worker that exceeds the timeout or dies is killed and
+    replaced. If only one entry of its batch was unanswered, that entry is reported;
+    otherwise the unanswered entries are retried one per batch, so only the culprit is reported.
+    Every parse leases its own workers from the idle pool, so concurrent parses never wait
+    for each other. Up to worker_count workers are shared; a parse that finds all of them
+    leased starts one extra worker, which is stopped when returned to a full pool.
+    """
+
+    def __init__(self, worker_count: int, entry_timeout_seconds: float, memory_limit_bytes: int = None):
+        self.worker_count = max(1, worker_count)
+        self.entry_timeout_seconds = entry_timeout_seconds
+        self.memory_limit_bytes = memory_limit_bytes
+        self.restart_count = 0
+        # Set once workers repeatedly failed to start; callers then parse without workers
+        self.has_start_failed = False
+        self._start_failure_count = 0
+        self._context = multiprocessing.get_context(WORKER_START_METHOD)
+        # Guards only the pool bookkeeping; it is never held while parsing
+        self._lock = threading.Lock()
+        self._idle_workers = []
+        self._leased_worker_count = 0
+        self._is_closed = False
+
+
+    def parse_queued(self, tag_specs: list, entry_queue: queue.Queue, end_marker):
+        """
+        Parses the items of a queue until end_marker arrives.
+        The second element of every item is the XML bytes; items are passed through unchanged.
+        Items are only taken from the queue while a worker is idle, so the producer is throttled.
+        @return A generator of (item, outcome, values or message, parse seconds) in queue order.
+        """
+        tag_specs = list(tag_specs)
+        workers = self._lease_workers()
+        undispatched_entries = deque()
+        finished_entries = {}
+        next_sequence = 0
+        next_yield_sequence = 0
+        is_input_done = False
+
+        try:
+            while True:
+                while next_yield_sequence in finished_entries:
+                    yield finished_entries.pop(next_yield_sequence)
+                    next_yield_sequence += 1
+
+                busy_workers = [worker for worker in workers if worker.pending_entries]
+                if is_input_done and not undispatched_entries and not busy_workers:
+                    return
+
+                # Take input only for idle workers; block only if nothing else is running
+                idle_count = len(workers) - len(busy_workers)
+                while not is_input_done and len(undispatched_entries) < idle_count * PARSE_BATCH_ENTRIES:
+                    is_blocking = not busy_workers and not undispatched_entries
+                    try:
+                        item = entry_queue.get(block=is_blocking, timeout=None if is_blocking else 0)
+                    except queue.Empty:
+                        break
+                    if item is end_marker:
+                        is_input_done = True
+                        break
+                    undispatched_entries.append((next_sequence, item, False))
+                    next_sequence += 1
+
+                self._dispatch(workers, tag_specs, undispatched_entries)
+                self._collect(workers, undispatched_entries, finished_entries, is_input_done)
+
+        except ParseWorkerStartError as error:
+            remaining_entries = {sequence: (parse_result[0], parse_result) for sequence, parse_result in finished_entries.items()}
+            remaining_entries.update((sequence, (item, None)) for sequence, item, _is_suspect in undispatched_entries)
+            for worker in workers:
+                remaining_entries.update((sequence, (item, None)) for sequence, item in worker.pending_entries)
+            error.remaining_entries = [remaining_entries[sequence] for sequence in sorted(remaining_entries)]
+            raise
+
+        finally:
+            self._return_workers(workers)
+
+
+    def _lease_workers(self) -> list:
+        """
+        Takes idle workers for one parse and starts the missing ones.
+        The pool is topped up to worker_count; with all workers leased, the parse gets one of its own.
+        """
+        with self._lock:
+            lease = [worker for worker in self._idle_workers if worker.process.is_alive()][:self.worker_count]
+            dead_workers = [worker for worker in self._idle_workers if worker not in lease and not worker.process.is_alive()]
+            self._idle_workers = [worker for worker in self._idle_workers if worker not in lease and worker not in dead_workers]
+            free_slots = self.worker_count - self._leased_worker_count - len(lease) - len(self._idle_workers)
+            start_count = max(min(free_slots, self.worker_count - len(lease)), 0 if lease else 1)
+            self._leased_worker_count += len(lease) + start_count
+
+        for worker in dead_workers:
+            worker.kill()
+        lease.extend(_ParseWorker(self._context, self.memory_limit_bytes) for _ in range(start_count))
+        return lease
+
+
+    def _return_workers(self, workers: list) -> None:
+        """Puts the workers of a finished parse back into the idle pool; surplus workers are stopped."""
+        # Results of an abandoned parse must not leak into the next one
+        abandoned_workers = [worker for worker in workers if worker.pending_entries or not worker.process.is_alive()]
+        with self._lock:
+            self._leased_worker_count -= len(workers)
+            returned_workers = [worker for worker in workers if worker not in abandoned_workers]
+            free_slots = 0 if self._is_closed else max(0, self.worker_count - len(self._idle_workers))
+            self._idle_workers.extend(returned_workers[:free_slots])
+            surplus_workers = returned_workers[free_slots:]
+
+        for worker in abandoned_workers:
+            worker.kill()
+        for worker in surplus_workers:
+            worker.stop()
+
+
+    def _dispatch(self, workers: list, tag_specs: list, undispatched_entries: deque) -> None:
+        """Sends one batch to every idle worker of the lease; suspects of a failed batch are sent alone."""
+        for worker in workers:
+            if worker.pending_entries or not undispatched_entries:
+                continue
+            batch_bytes = 0
+            while undispatched_entries and len(worker.pending_entries) < PARSE_BATCH_ENTRIES:
+                _sequence, next_item, is_suspect = undispatched_entries[0]
+                if worker.pending_entries and (is_suspect or batch_bytes + len(next_item[1]) > PARSE_BATCH_BYTES):
+                    break
+                sequence, item, _is_suspect = undispatched_entries.popleft()
+                worker.pending_entries.append((sequence, item))
+                batch_bytes += len(item[1])
+                if is_suspect:
+                    break
+            worker.entry_started = time.perf_counter()
+            try:
+                worker.connection.send((tag_specs, [item[1] for _sequence, item in worker.pending_entries]))
+            except OSError:
+                # Died while idle: no entry is to blame, the batch goes back to the queue
+                self._return_entries(worker, undispatched_entries, is_suspect=False)
+                workers[workers.index(worker)] = self._restart(worker, "Parse worker was gone before dispatch")
+
+
+    def _collect(self, workers: list, undispatched_entries: deque, finished_entries: dict, is_input_done: bool) -> None:
+        """Waits for results until the next entry deadline and handles timed-out or dead workers of the lease."""
+        busy_workers = [worker for worker in workers if worker.pending_entries]
+        if not busy_workers:
+            return
+
+        now = time.perf_counter()
+        wait_seconds = min(worker.deadline(self.entry_timeout_seconds) for worker in busy_workers) - now
+        has_idle_worker = len(busy_workers) < len(workers)
+        if has_idle_worker and not is_input_done:
+            # Idle workers pick up new input at the next poll
+            wait_seconds = min(wait_seconds, INPUT_POLL_SECONDS)
+
+        ready_connections = wait_for_connections([worker.connection for worker in busy_workers], max(0.0, wait_seconds))
+        now = time.perf_counter()
+
+        for worker in busy_workers:
+            if worker.connection in ready_connections:
+                try:
+                    while worker.pending_entries and worker.connection.poll():
+                        message = worker.connection.recv()
+                        if not worker.is_ready:
+                            worker.is_ready = True
+                            worker.entry_started = now
+                            self._start_failure_count = 0
+                            continue
+                        for outcome, payload, parse_seconds in message:
+                            sequence, item = worker.pending_entries.popleft()
+                            finished_entries[sequence] = (item, outcome, payload, parse_seconds)
+                        worker.entry_started = now
+                except (EOFError, OSError):
+                    worker.process.join(WORKER_STOP_SECONDS)
+                    exit_code = worker.process.exitcode
+                    if not worker.is_ready:
+                        self._replace_unready_worker(workers, worker, undispatched_entries, f"exited during start-up (exit code {exit_code})")
+                        continue
+                    self._replace_worker(workers, worker, undispatched_entries, finished_entries, OUTCOME_WORKER_CRASHED,
+                                         f"Parse worker died (exit code {exit_code})", now)
+                    continue
+
+            if not worker.pending_entries or now < worker.deadline(self.entry_timeout_seconds):
+                continue
+            if not worker.is_ready:
+                self._replace_unready_worker(workers, worker, undispatched_entries, f"not ready after {WORKER_START_SECONDS} s")
+                continue
+            self._replace_worker(workers, worker, undispatched_entries, finished_entries, OUTCOME_TIMEOUT,
+                                 f"No result within {self.entry_timeout_seconds} s", now)
+
+
+    def _replace_worker(self, workers: list, worker: _ParseWorker, undispatched_entries: deque, finished_entries: dict,
+                        outcome: str, message: str, now: float) -> None:
+        """
+        Kills a worker and reports its unanswered entry. Results are sent in groups, so with
+        several unanswered entries the culprit is unknown; they are returned as suspects.
+        An allocation beyond the address space limit can kill the interpreter instead of raising
+        MemoryError, so a worker that died on its own under a memory limit is reported as memory_limit.
+        """
+        exit_code = worker.process.exitcode
+        if outcome == OUTCOME_WORKER_CRASHED and self._is_memory_limited() and exit_code and exit_code not in EXTERNAL_KILL_EXIT_CODES:
+            outcome = OUTCOME_MEMORY_LIMIT
+            message = f"Parse worker exceeded the memory limit of {self.memory_limit_bytes} bytes (exit code {exit_code})"
+
+        if len(worker.pending_entries) == 1:
+            sequence, item = worker.pending_entries.popleft()
+            finished_entries[sequence] = (item, outcome, message, now - worker.entry_started)
+        else:
+            self._return_entries(worker, undispatched_entries, is_suspect=True)
+
+        workers[workers.index(worker)] = self._restart(worker, f"{outcome}: {message}")
+
+
+    def _is_memory_limited(self) -> bool:
+        return resource is not None and bool(self.memory_limit_bytes)
+
+
+    def _replace_unready_worker(self, workers: list, worker: _ParseWorker, undispatched_entries: deque, reason: str) -> None:
+        """Replaces a worker that failed before parsing anything; raises once start-up fails repeatedly."""
+        self._start_failure_count += 1
+        if self._start_failure_count > MAX_WORKER_START_FAILURES:
+            self.has_start_failed = True
+            raise ParseWorkerStartError(f"Parse worker {reason}")
+        self._return_entries(worker, undispatched_entries, is_suspect=False)
+        workers[workers.index(worker)] = self._restart(worker, f"start-up failure: {reason}")
+
+
+    @staticmethod
+    def _return_entries(worker: _ParseWorker, undispatched_entries: deque, is_suspect: bool) -> None:
+        """Puts the unanswered entries of a worker back at the front of the queue."""
+        undispatched_entries.extendleft(
+            (sequence, item, is_suspect) for sequence, item in reversed(worker.pending_entries)
+        )
+        worker.pending_entries.clear()
+
+
+    def _restart(self, worker: _ParseWorker, reason: str) -> _ParseWorker:
+        """Kills a worker and returns its replacement."""
+        worker.kill()
+        with self._lock:
+            self.restart_count += 1
+        logger.warning("Restarted parse worker after %s", reason)
+        return _ParseWorker(self._context, self.memory_limit_bytes)
+
+
+    def close(self) -> None:
+        """Stops all idle worker processes; workers of running parses are stopped when those return them."""
+        with self._lock:
+            self._is_closed = True
+            idle_workers, self._idle_workers = self._idle_workers, []
+        for worker in idle_workers:
+            worker.stop()
+
+
+class SharedParseSupervisors:
+    """
+    One supervisor per combination of limits for the whole process, so web sessions and
+    indexed archives reuse the same warm workers instead of spawning their own.
+    Parses of different callers lease their own workers; the workers are stopped at interpreter exit.
+    """
+
+    def __init__(self):
+        self._supervisors = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+
+    def get(self, worker_count: int, entry_timeout_seconds: float, memory_limit_bytes: int = None) -> XmlParseSupervisor:
+        """Returns the supervisor for these limits, created on first use."""
+        supervisor_key = (max(1, worker_count), entry_timeout_seconds, memory_limit_bytes)
+        with self._lock:
+            if supervisor_key not in self._supervisors:
+                self._supervisors[supervisor_key] = XmlParseSupervisor(worker_count, entry_timeout_seconds, memory_limit_bytes)
+            return self._supervisors[supervisor_key]
+
+
+    def close(self) -> None:
+        """Stops the workers of all supervisors."""
+        with self._lock:
+            supervisors, self._supervisors = list(self._supervisors.values()), {}
+        for supervisor in supervisors:
+            supervisor.close()
+
+
+# Shared instance used by all services of a process
+SHARED_PARSE_SUPERVISORS = SharedParseSupervisors()
@@ -0,0 +1,103 @@
+import threading
+
+# Default Caps of the resource-governed mode
+DEFAULT_MAX_ENTRY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 250_000
+DEFAULT_MAX_IN_FLIGHT_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_IN_FLIGHT_ENTRIES = 1024
+DEFAULT_PARSE_WORKERS = 2
+DEFAULT_PARSE_TIMEOUT_SECONDS = 10.0
+DEFAULT_PARSE_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+class ResourceLimits:
+    """
+    Caps of the resource-governed read mode of ZipService.
+    max_entry_bytes      members with a larger uncompressed size are skipped and reported
+    max_entries          archive entries read or parsed per call; the rest is skipped and reported (None = no cap).
+                         Name listings only hold names and are not capped, so file lists stay complete
+    max_in_flight_bytes  decompressed bytes waiting between the decompression and the parse stage
+    parse_workers        worker processes that parse the XML entries (0 = parse in the calling thread)
+    parse_timeout_seconds  per-entry parse time after which a worker is killed and the entry reported
+    parse_memory_bytes   address space a worker may grow by while parsing (None = no limit)
+    """
+
+    def __init__(
+        self,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+        max_in_flight_entries: int = DEFAULT_MAX_IN_FLIGHT_ENTRIES,
+        parse_workers: int = DEFAULT_PARSE_WORKERS,
+        parse_timeout_seconds: float = DEFAULT_PARSE_TIMEOUT_SECONDS,
+        parse_memory_bytes: int = DEFAULT_PARSE_MEMORY_BYTES
+    ):
+        # A single member must always fit into the in-flight budget
+        self.max_entry_bytes = min(max_entry_bytes, max_in_flight_bytes)
+        self.max_entries = max_entries
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.max_in_flight_entries = max_in_flight_entries
+        self.parse_workers = parse_workers
+        self.parse_timeout_seconds = parse_timeout_seconds
+        self.parse_memory_bytes = parse_memory_bytes
+
+
+    def result_key(self) -> str:
+        """
+        Identifies the caps that can change what a read returns, for use in cache keys,
+        so a result truncated under one set of limits is not reused under another.
+        """
+        return "limits:{}:{}:{}:{}:{}".format(
+            self.max_entry_bytes,
+            self.max_entries,
+            bool(self.parse_workers),
+            self.parse_timeout_seconds,
+            self.parse_memory_bytes
+        )
+
+
+class ByteBudget:
+    """
+    Counting semaphore over bytes: acquire blocks while the reserved bytes would
+    exceed the capacity, which throttles a producer to the speed of its consumer.
+    """
+
+    def __init__(self, capacity_bytes: int):
+        self.capacity_bytes = capacity_bytes
+        self._reserved_bytes = 0
+        self._is_cancelled = False
+        self._condition = threading.Condition()
+
+
+    def acquire(self, byte_count: int) -> bool:
+        """Reserves bytes, waiting for releases if needed. Returns False once cancelled."""
+        with self._condition:
+            # An empty budget always admits one reservation, so nothing can deadlock
+            while (not self._is_cancelled and self._reserved_bytes
+                   and self._reserved_bytes + byte_count > self.capacity_bytes):
+                self._condition.wait()
+            if self._is_cancelled:
+                return False
+            self._reserved_bytes += byte_count
+            return True
+
+
+    def release(self, byte_count: int) -> None:
+        """Returns reserved bytes and wakes up waiting producers."""
+        with self._condition:
+            self._reserved_bytes -= byte_count
+            self._condition.notify_all()
+
+
+    def cancel(self) -> None:
+        """Wakes up all waiters; every further acquire fails."""
+        with self._condition:
+            self._is_cancelled = True
+            self._condition.notify_all()
+
+
+    @property
+    def reserved_bytes(self) -> int:
+        """Bytes currently reserved."""
+        with self._condition:
+            return self._reserved_bytes
@@ -0,0 +1,37 @@
+from collections import Counter
+
+
+def merge_file_order(previous_order: list, current_files: list) -> dict:
+    """
+    Applies a previously exported FileOrder to the files of the current archive.
+    Files of both lists keep their previous position, files only in the archive are
+    appended in archive order, files only in the previous order are reported as missing.
+    Names are matched through a count map, so the merge is linear and a file name that
+    occurs several times (same name in different subfolders) is matched as often as it exists.
+    Returns: {file_order, kept_count, appended, missing}
+    """
+    available_counts = Counter(current_files)
+    merged_order = []
+    missing_files = []
+
+    for file_name in previous_order:
+        if available_counts[file_name] > 0:
+            available_counts[file_name] -= 1
+            merged_order.append(file_name)
+        else:
+            missing_files.append(file_name)
+
+    kept_count = len(merged_order)
+    appended_files = []
+    for file_name in current_files:
+        if available_counts[file_name] > 0:
+            available_counts[file_name] -= 1
+            appended_files.append(file_name)
+    merged_order.extend(appended_files)
+
+    return {
+        "file_order": merged_order,
+        "kept_count": kept_count,
+        "appended": appended_files,
+        "missing": missing_files
+    }
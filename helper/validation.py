@@ -0,0 +1,174 @@
+import json
+import time
+from .zipService import ZipService
+from .featureRules import validate_configurations, BARS_ONLY_MESSAGE
+
+# Test Description Keys
+KEY_TARGETS = "Targets"
+KEY_TARGET_NAME = "TargetName"
+KEY_MACHINE_MODEL = "MachineModel"
+KEY_TEST_BARS = "TestBars"
+KEY_TEST_FOLDERS = "TestFolders"
+KEY_FOLDER = "Folder"
+KEY_TOOL_STOCKS = "ToolStocks"
+KEY_TOOLSTOCK_FILE = "ToolstockFile"
+KEY_MOUNT_COUNT = "MountCount"
+KEY_FEATURES = "Features"
+
+# Issue Kinds
+ISSUE_MISSING_FOLDER = "missing_folder"
+ISSUE_MISSING_TOOLSTOCK = "missing_toolstock"
+ISSUE_FEATURE_CONFLICT = "feature_conflict"
+ISSUE_MOUNT_COUNT = "mount_count_out_of_range"
+ISSUE_MODE_CONFLICT = "mode_conflict"
+ISSUE_MALFORMED = "malformed_entry"
+
+FOLDER_SEPARATOR = "/"
+
+
+def load_test_description(description_path: str) -> dict:
+    """Reads a TestDescription.json file."""
+    with open(description_path, "r", encoding="utf-8") as description_file:
+        return json.load(description_file)
+
+
+class TestDescriptionValidator:
+    """
+    Checks all targets of a test description against the contents of one archive.
+    The archive name index is loaded once; every folder and toolstock reference
+    is then a set lookup, and feature and mount rules are evaluated with the same
+    functions the editor uses. Malformed entries (e.g. a string where an object is
+    expected) are reported as malformed_entry issues instead of failing the run.
+    """
+
+    def __init__(self, zip_service: ZipService = None):
+        self.zip_service = zip_service or ZipService()
+
+
+    def validate(self, archive_path: str, test_description: dict) -> dict:
+        """
+        Validates every target of the description in one pass.
+        Returns a report: {archive, target_count, issue_count, is_valid, seconds, targets: [...]}
+        """
+        start_time = time.perf_counter()
+        name_index = self.zip_service.getNameIndex(archive_path)
+
+        targets = test_description.get(KEY_TARGETS, []) if isinstance(test_description, dict) else None
+        if not isinstance(targets, list):
+            target_reports = [self._malformed_report(KEY_TARGETS, "Expected an object with a list of targets")]
+        else:
+            # Feature and mount rules of all well-formed targets are checked in one batch
+            valid_targets = [self._sanitize_features(target)[0] for target in targets if isinstance(target, dict)]
+            rule_results = iter(validate_configurations(valid_targets))
+            target_reports = [
+                self.validate_target(target, name_index, next(rule_results)) if isinstance(target, dict)
+                else self._malformed_report(f"{KEY_TARGETS}[{index}]", "Expected a target object")
+                for index, target in enumerate(targets)
+            ]
+        issue_count = sum(len(report["issues"]) for report in target_reports)
+
+        return {
+            "archive": archive_path,
+            "target_count": len(target_reports),
+            "issue_count": issue_count,
+            "is_valid": issue_count == 0,
+            "seconds": time.perf_counter() - start_time,
+            "targets": target_reports
+        }
+
+
+    def validate_target(self, target: dict, name_index: set, rule_result: dict = None) -> dict:
+        """
+        Checks folders, toolstocks, feature rules and mount limits of a single target.
+        rule_result is the target's result of validate_configurations, if already computed.
+        """
+        machine_model_name = target.get(KEY_MACHINE_MODEL, "")
+        sanitized_target, issues = self._sanitize_features(target)
+        rule_result = rule_result or validate_configurations([sanitized_target])[0]
+
+        test_folders = target.get(KEY_TEST_FOLDERS, [])
+        if not isinstance(test_folders, list):
+            issues.append(self._issue(ISSUE_MALFORMED, KEY_TEST_FOLDERS, "Expected a list of folders"))
+            test_folders = []
+
+        for folder_index, test_folder in enumerate(test_folders):
+            folder_entry_path = f"{KEY_TEST_FOLDERS}[{folder_index}]"
+            if not isinstance(test_folder, dict) or not isinstance(test_folder.get(KEY_FOLDER, ""), str):
+                issues.append(self._issue(ISSUE_MALFORMED, folder_entry_path, f"Expected an object with a {KEY_FOLDER} string"))
+                continue
+
+            folder_path = test_folder.get(KEY_FOLDER, "")
+            folder_prefix = folder_path.rstrip(FOLDER_SEPARATOR) + FOLDER_SEPARATOR
+            if folder_prefix not in name_index:
+                issues.append(self._issue(ISSUE_MISSING_FOLDER, folder_path, "Folder not found in archive"))
+
+            tool_stocks = test_folder.get(KEY_TOOL_STOCKS, [])
+            if not isinstance(tool_stocks, list):
+                issues.append(self._issue(ISSUE_MALFORMED, f"{folder_entry_path}.{KEY_TOOL_STOCKS}", "Expected a list of toolstocks"))
+                continue
+
+            for stock_index, tool_stock in enumerate(tool_stocks):
+                if not isinstance(tool_stock, dict) or not isinstance(tool_stock.get(KEY_TOOLSTOCK_FILE, ""), str):
+                    issues.append(self._issue(
+                        ISSUE_MALFORMED,
+                        f"{folder_entry_path}.{KEY_TOOL_STOCKS}[{stock_index}]",
+                        f"Expected an object with a {KEY_TOOLSTOCK_FILE} string"
+                    ))
+                    continue
+                toolstock_path = tool_stock.get(KEY_TOOLSTOCK_FILE, "")
+                if toolstock_path not in name_index:
+                    issues.append(self._issue(ISSUE_MISSING_TOOLSTOCK, toolstock_path, "Toolstock file not found in archive"))
+
+        for conflict in rule_result["conflicts"]:
+            issues.append(self._issue(ISSUE_FEATURE_CONFLICT, KEY_FEATURES, conflict))
+
+        if not rule_result["is_mode_valid"]:
+            issues.append(self._issue(ISSUE_MODE_CONFLICT, KEY_TEST_BARS, BARS_ONLY_MESSAGE))
+
+        if not rule_result["is_mount_count_valid"]:
+            min_allowed, max_allowed, limit_description = rule_result["mount_range"]
+            issues.append(self._issue(
+                ISSUE_MOUNT_COUNT,
+                KEY_MOUNT_COUNT,
+                f"{rule_result['mount_count']} outside range {min_allowed} - {max_allowed} {limit_description}".strip()
+            ))
+
+        return {
+            "target_name": target.get(KEY_TARGET_NAME, ""),
+            "machine_model": machine_model_name,
+            "is_valid": not issues,
+            "issues": issues
+        }
+
+
+    def _sanitize_features(self, target: dict) -> tuple[dict, list]:
+        """
+        Drops Features items that are not objects, so the rule check can run.
+        Returns: (target with usable Features, malformed_entry issues of the dropped items)
+        """
+        features = target.get(KEY_FEATURES, [])
+        if not isinstance(features, list):
+            return dict(target, **{KEY_FEATURES: []}), [self._issue(ISSUE_MALFORMED, KEY_FEATURES, "Expected a list of features")]
+
+        issues = [
+            self._issue(ISSUE_MALFORMED, f"{KEY_FEATURES}[{index}]", "Expected a feature object")
+            for index, feature in enumerate(features) if not isinstance(feature, dict)
+        ]
+        if not issues:
+            return target, issues
+        return dict(target, **{KEY_FEATURES: [feature for feature in features if isinstance(feature, dict)]}), issues
+
+
+    def _malformed_report(self, path: str, message: str) -> dict:
+        """Builds the report of an entry that is not a target object."""
+        return {
+            "target_name": "",
+            "machine_model": "",
+            "is_valid": False,
+            "issues": [self._issue(ISSUE_MALFORMED, path, message)]
+        }
+
+
+    def _issue(self, kind: str, path: str, message: str) -> dict:
+        """Builds a single report entry."""
+        return {"kind": kind, "path": path, "message": message}
@@ -1,15 +1,253 @@
 import zipfile
+import io
 import os
+import queue
+import threading
+import logging
 import json
-from typing import List, Dict, Any
+import time
+import struct
+import zlib
+import contextlib
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple
 import xml.etree.ElementTree as ET
+from .extractionPlan import ExtractionPlan
+from .archiveSource import (
+    ArchiveSource,
+    open_archive_source,
+    archive_source_exists,
+)
+from .diagnostics import (
+    DiagnosticsBus,
+    build_entry_event,
+    OUTCOME_OK,
+    OUTCOME_NOT_FOUND,
+    OUTCOME_INVALID_XML,
+    OUTCOME_DECODE_ERROR,
+    OUTCOME_ERROR,
+    OUTCOME_OVERSIZED,
+    OUTCOME_ENTRY_LIMIT,
+)
+from .resourceLimits import ResourceLimits, ByteBudget
+from .parseSupervisor import XmlParseSupervisor, ParseWorkerStartError, SHARED_PARSE_SUPERVISORS
+
+logger = logging.getLogger(__name__)
+
+# Parallel Compression Configuration
+# Maps a lower-case file extension to (compression method, compression level).
+# Already compressed assets are stored, text formats are deflated.
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_COMPRESSION_RULE = (zipfile.ZIP_DEFLATED, DEFAULT_COMPRESSION_LEVEL)
+DEFAULT_COMPRESSION_RULES = {
+    ".xml": (zipfile.ZIP_DEFLATED, DEFAULT_COMPRESSION_LEVEL),
+    ".txt": (zipfile.ZIP_DEFLATED, DEFAULT_COMPRESSION_LEVEL),
+    ".json": (zipfile.ZIP_DEFLATED, DEFAULT_COMPRESSION_LEVEL),
+    ".zip": (zipfile.ZIP_STORED, 0),
+    ".gz": (zipfile.ZIP_STORED, 0),
+    ".7z": (zipfile.ZIP_STORED, 0),
+    ".png": (zipfile.ZIP_STORED, 0),
+    ".jpg": (zipfile.ZIP_STORED, 0),
+    ".jpeg": (zipfile.ZIP_STORED, 0),
+}
+RAW_DEFLATE_WINDOW_BITS = -15
+IN_FLIGHT_MEMBERS_PER_WORKER = 2
+BYTES_PER_MEGABYTE = 1024 * 1024
+
+# Resource-Governed Reads
+PRODUCER_THREAD_NAME = "zip-decompression"
+HANDOFF_POLL_SECONDS = 0.1
+_END_OF_MEMBERS = object()
+
+# Outcome lists of the active recordFailures blocks; threads started by a read inherit them
+_FAILURE_RECORDER = contextvars.ContextVar("zipServiceFailureRecorder", default=None)
+
+# ZIP Record Layout (see PKWARE APPNOTE 4.3.12, 4.3.14 to 4.3.16 and 4.5.3)
+ZIP_CENTRAL_DIRECTORY_STRUCT = "<4s4B4HL2L5H2L"
+ZIP_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x01\x02"
+ZIP_END_RECORD_STRUCT = "<4s4H2LH"
+ZIP_END_RECORD_SIGNATURE = b"PK\x05\x06"
+ZIP64_END_RECORD_STRUCT = "<4sQ2H2L4Q"
+ZIP64_END_RECORD_SIGNATURE = b"PK\x06\x06"
+ZIP64_END_LOCATOR_STRUCT = "<4sLQL"
+ZIP64_END_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_EXTRA_FIELD_ID = 0x0001
+ZIP64_VERSION = 45
+ZIP_CLASSIC_SIZE_LIMIT = 0xFFFFFFFF
+ZIP_CLASSIC_COUNT_LIMIT = 0xFFFF
+ZIP_FLAG_UTF8_FILENAME = 0x800
+
+# Deterministic Export Configuration
+EXPORT_CONFIG_FILE_NAME = "config.json"
+DETERMINISTIC_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+DETERMINISTIC_CREATE_SYSTEM = 3
+DETERMINISTIC_FILE_ATTRIBUTES = 0o100644 << 16
+DETERMINISTIC_DIRECTORY_ATTRIBUTES = (0o40755 << 16) | 0x10
+CANONICAL_JSON_INDENT = 4
+
+
+def toCanonicalJson(data: Any) -> str:
+    """
+    @brief Serializes data to canonical JSON: sorted keys, fixed indentation and separators.
+    @param data The JSON-serializable data.
+    @return The canonical JSON string; equal data always yields an equal string.
+    """
+    return json.dumps(data, sort_keys=True, indent=CANONICAL_JSON_INDENT, separators=(",", ": "), ensure_ascii=False)
+
+
+def compressMemberPayload(payloadBytes: bytes, compressType: int, compressLevel: int) -> Tuple[int, bytes]:
+    """
+    @brief Compresses one ZIP member. Runs inside the worker pool; zlib releases the GIL.
+    @param payloadBytes The uncompressed member content.
+    @param compressType zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED.
+    @param compressLevel The zlib compression level (ignored for stored members).
+    @return A tuple of (CRC-32, compressed bytes).
+    """
+    checksum = zlib.crc32(payloadBytes)
+
+    if compressType == zipfile.ZIP_STORED:
+        return checksum, payloadBytes
+
+    compressorObject = zlib.compressobj(compressLevel, zlib.DEFLATED, RAW_DEFLATE_WINDOW_BITS)
+    compressedBytes = compressorObject.compress(payloadBytes) + compressorObject.flush()
+    return checksum, compressedBytes
 
 
 class ZipService:
     """
     @brief Provides services to handle ZIP file operations.
+    Every read accepts a source location: a ZIP file, a directory tree or a ZIP
+    nested inside a ZIP ("outer.zip!/inner.zip"), see helper.archiveSource.
+    Failures are logged and, like per-entry parse timings, emitted as structured
+    events to the sinks of the diagnostics bus (see helper.diagnostics).
+    With resource limits the reads are governed: the central directory is streamed
+    instead of loaded, oversized members and entries beyond the cap are skipped and
+    reported (name listings are never capped), and XML extraction runs as a bounded
+    two-stage pipeline whose parse stage runs in supervised worker processes
+    (see helper.parseSupervisor).
     """
 
+    def __init__(self, eventBus: DiagnosticsBus = None, resourceLimits: ResourceLimits = None):
+        """
+        @param eventBus Receives one event per processed entry. Without sinks no timing is taken.
+        @param resourceLimits Enables the resource-governed mode (see helper.resourceLimits).
+        """
+        self.eventBus = eventBus or DiagnosticsBus()
+        self.resourceLimits = resourceLimits
+        self._parseSupervisor = None
+        self._parseSupervisorLock = threading.Lock()
+
+
+    def _getParseSupervisor(self, resourceLimits: ResourceLimits) -> XmlParseSupervisor:
+        """@brief Returns the process-wide worker pool for these limits, started on first use and kept for later reads."""
+        with self._parseSupervisorLock:
+            if self._parseSupervisor is None:
+                self._parseSupervisor = SHARED_PARSE_SUPERVISORS.get(
+                    resourceLimits.parse_workers,
+                    resourceLimits.parse_timeout_seconds,
+                    resourceLimits.parse_memory_bytes
+                )
+            return self._parseSupervisor
+
+
+    def close(self) -> None:
+        """@brief Releases the worker pool, e.g. when the session ends. The shared workers keep running for other services until exit."""
+        with self._parseSupervisorLock:
+            self._parseSupervisor = None
+
+
+    def _iterEntries(self, sourceHandle: ArchiveSource, operationName: str, pathToZipFile: str, applyEntryCap: bool = True):
+        """
+        @brief Yields the entries of a source; governed, the listing is streamed and capped.
+        Once max_entries is exceeded, the rest is skipped and reported as one entry_limit event.
+        @param sourceHandle The opened source.
+        @param applyEntryCap False for reads that only look at names; they stay complete, since
+               the ordering and the export must never work on a partial file list.
+        @return An iterable of zipfile.ZipInfo. Read governed entries with open_streamed.
+        """
+        if self.resourceLimits is None:
+            yield from sourceHandle.infolist()
+            return
+
+        maxEntries = self.resourceLimits.max_entries if applyEntryCap else None
+        for entryNumber, fileInfo in enumerate(sourceHandle.iter_entries(), start=1):
+            if maxEntries is not None and entryNumber > maxEntries:
+                self._reportFailure(operationName, pathToZipFile, None, OUTCOME_ENTRY_LIMIT,
+                                    f"More than {maxEntries} entries, the remaining entries were skipped")
+                return
+            yield fileInfo
+
+
+    @contextlib.contextmanager
+    def recordFailures(self):
+        """
+        @brief Collects the outcomes of all failures reported by reads inside the block,
+        including those of the producer thread of a governed read.
+        Callers use it to tell a complete result from one with skipped or failed entries.
+        @return A context manager yielding the list of failure outcomes.
+        """
+        recordedOutcomes = []
+        resetToken = _FAILURE_RECORDER.set(recordedOutcomes)
+        try:
+            yield recordedOutcomes
+        finally:
+            _FAILURE_RECORDER.reset(resetToken)
+
+
+    def _isOversized(self, fileInfo, operationName: str, pathToZipFile: str) -> bool:
+        """
+        @brief Checks a member against max_entry_bytes and reports it if it is too large.
+        @return True if the member must be skipped.
+        """
+        if self.resourceLimits is None or fileInfo.file_size <= self.resourceLimits.max_entry_bytes:
+            return False
+        self._reportFailure(operationName, pathToZipFile, fileInfo, OUTCOME_OVERSIZED,
+                            f"{fileInfo.file_size} bytes exceed the limit of {self.resourceLimits.max_entry_bytes} bytes")
+        return True
+
+
+    def _readGovernedMember(self, sourceHandle: ArchiveSource, fileInfo, operationName: str, pathToZipFile: str) -> bytes:
+        """
+        @brief Reads one streamed member, at most max_entry_bytes.
+        Directory members may have grown since they were listed, so the cap is checked on the data itself.
+        @return The member bytes, or None if the member turned out to be oversized (it is reported).
+        """
+        maxEntryBytes = self.resourceLimits.max_entry_bytes
+        with sourceHandle.open_streamed(fileInfo) as fileHandle:
+            memberBytes = fileHandle.read(maxEntryBytes + 1)
+        if len(memberBytes) > maxEntryBytes:
+            self._reportFailure(operationName, pathToZipFile, fileInfo, OUTCOME_OVERSIZED,
+                                f"More than {maxEntryBytes} bytes after decompression")
+            return None
+        return memberBytes
+
+
+    def _reportFailure(
+        self,
+        operationName: str,
+        pathToZipFile: str,
+        entryInfo,
+        outcome: str,
+        error: Any,
+        elapsedSeconds: float = 0.0
+    ) -> None:
+        """
+        @brief Logs a failed archive or entry operation and emits it as event.
+        @param entryInfo The zipfile.ZipInfo of the entry, or None if the whole archive failed.
+        """
+        recordedOutcomes = _FAILURE_RECORDER.get()
+        if recordedOutcomes is not None:
+            recordedOutcomes.append(outcome)
+
+        entryName = entryInfo.filename if entryInfo is not None else ""
+        logger.warning("%s failed for %s %s: %s (%s)", operationName, pathToZipFile, entryName, outcome, error)
+
+        if self.eventBus.is_enabled:
+            self.eventBus.emit(build_entry_event(operationName, pathToZipFile, entryInfo, elapsedSeconds, outcome, str(error)))
+
+
     def readContentFromZip(
         self,
         pathToZipFile: str,
@@ -24,17 +262,18 @@ class ZipService:
 
         extractedContentMap = {}
 
-        pathExists = os.path.exists(pathToZipFile)
+        pathExists = archive_source_exists(pathToZipFile)
         if not pathExists:
             return extractedContentMap
 
-        try:
-            with zipfile.ZipFile(pathToZipFile, 'r') as zipFileHandle:
+        isTracing = self.eventBus.is_enabled
 
-                unsortedFileNames = zipFileHandle.namelist()
-                listOfFileNames = sorted(unsortedFileNames)
+        try:
+            with open_archive_source(pathToZipFile) as zipFileHandle:
 
-                for currentFileName in listOfFileNames:
+                # Sorted once at the end, so a governed read never holds the whole listing
+                for currentFileInfo in self._iterEntries(zipFileHandle, "readContentFromZip", pathToZipFile):
+                    currentFileName = currentFileInfo.filename
 
                     isTargetFile = False
 
@@ -49,23 +288,40 @@ class ZipService:
                     isDirectory = currentFileName.endswith("/")
                     shouldProcessFile = isTargetFile and not isDirectory
 
+                    if shouldProcessFile and self._isOversized(currentFileInfo, "readContentFromZip", pathToZipFile):
+                        continue
+
                     if shouldProcessFile:
+                        startTime = time.perf_counter() if isTracing else 0.0
                         try:
-                            with zipFileHandle.open(currentFileName) as fileHandle:
-                                fileContentBytes = fileHandle.read()
-                                fileContentString = fileContentBytes.decode(
-                                    'utf-8')
+                            if self.resourceLimits is not None:
+                                fileContentBytes = self._readGovernedMember(zipFileHandle, currentFileInfo, "readContentFromZip", pathToZipFile)
+                                if fileContentBytes is None:
+                                    continue
+                            else:
+                                with zipFileHandle.open(currentFileInfo) as fileHandle:
+                                    fileContentBytes = fileHandle.read()
+                            fileContentString = fileContentBytes.decode(
+                                'utf-8')
 
-                                extractedContentMap[currentFileName] = fileContentString
+                            extractedContentMap[currentFileName] = fileContentString
 
-                        except Exception:
+                        except Exception as exceptionObject:
                             errorMessage = "Error: Could not decode file content."
                             extractedContentMap[currentFileName] = errorMessage
+                            elapsedSeconds = time.perf_counter() - startTime if isTracing else 0.0
+                            self._reportFailure("readContentFromZip", pathToZipFile, currentFileInfo, OUTCOME_DECODE_ERROR, exceptionObject, elapsedSeconds)
+                            continue
+
+                        if isTracing:
+                            self.eventBus.emit(build_entry_event(
+                                "readContentFromZip", pathToZipFile, currentFileInfo, time.perf_counter() - startTime, OUTCOME_OK
+                            ))
 
         except Exception as exceptionObject:
-            print(f"Error reading zip: {exceptionObject}")
+            self._reportFailure("readContentFromZip", pathToZipFile, None, OUTCOME_ERROR, exceptionObject)
 
-        return extractedContentMap
+        return dict(sorted(extractedContentMap.items()))
 
 
     def readSingleFile(
@@ -81,29 +337,72 @@ class ZipService:
         """
         fileContentResult = ""
 
-        pathExists = os.path.exists(pathToZipFile)
+        pathExists = archive_source_exists(pathToZipFile)
         if not pathExists:
             return fileContentResult
 
         try:
-            with zipfile.ZipFile(pathToZipFile, 'r') as zipFileHandle:
+            with open_archive_source(pathToZipFile) as zipFileHandle:
 
-                allFileNamesList = zipFileHandle.namelist()
-                fileIsPresentInZip = targetFileName in allFileNamesList
+                if self.resourceLimits is not None:
+                    # Governed, the listing is streamed until the file is found
+                    entryInfos = self._iterEntries(zipFileHandle, "readSingleFile", pathToZipFile, applyEntryCap=False)
+                    targetFileInfo = next((fileInfo for fileInfo in entryInfos if fileInfo.filename == targetFileName), None)
+                elif targetFileName in zipFileHandle.namelist():
+                    targetFileInfo = zipFileHandle.getinfo(targetFileName)
+                else:
+                    targetFileInfo = None
 
-                if fileIsPresentInZip:
-                    with zipFileHandle.open(targetFileName) as fileHandle:
-                        rawBytes = fileHandle.read()
+                if targetFileInfo is not None:
+                    startTime = time.perf_counter()
+                    if self.resourceLimits is not None:
+                        rawBytes = self._readGovernedMember(zipFileHandle, targetFileInfo, "readSingleFile", pathToZipFile)
+                    else:
+                        with zipFileHandle.open(targetFileInfo) as fileHandle:
+                            rawBytes = fileHandle.read()
+
+                    if rawBytes is not None:
                         fileContentResult = rawBytes.decode(
                             'utf-8', errors='ignore')
+
+                    if rawBytes is not None and self.eventBus.is_enabled:
+                        self.eventBus.emit(build_entry_event(
+                            "readSingleFile", pathToZipFile, targetFileInfo, time.perf_counter() - startTime, OUTCOME_OK
+                        ))
                 else:
-                    print(f"File {targetFileName} not found in ZIP.")
+                    self._reportFailure("readSingleFile", pathToZipFile, zipfile.ZipInfo(targetFileName), OUTCOME_NOT_FOUND, "File not found in ZIP")
 
         except Exception as exceptionObject:
-            print(f"Error reading single file: {exceptionObject}")
+            self._reportFailure("readSingleFile", pathToZipFile, None, OUTCOME_ERROR, exceptionObject)
 
         return fileContentResult
 
+    def readExportedConfig(
+        self,
+        pathToZipFile: str,
+        configFileName: str = EXPORT_CONFIG_FILE_NAME
+    ) -> Dict[str, Any]:
+        """
+        @brief Reads the config.json of a previously exported ZIP (see createDeterministicZipWithConfig).
+        @param pathToZipFile The path to the exported ZIP file.
+        @param configFileName The name of the config file inside the ZIP (default: config.json).
+        @return The parsed configuration, or an empty dictionary if it is missing or invalid.
+        """
+        jsonContentString = self.readSingleFile(pathToZipFile, configFileName)
+        if not jsonContentString:
+            return {}
+
+        try:
+            configurationData = json.loads(jsonContentString)
+        except ValueError as error:
+            self._reportFailure("readExportedConfig", pathToZipFile, zipfile.ZipInfo(configFileName), OUTCOME_DECODE_ERROR, error)
+            return {}
+
+        if not isinstance(configurationData, dict):
+            self._reportFailure("readExportedConfig", pathToZipFile, zipfile.ZipInfo(configFileName), OUTCOME_DECODE_ERROR, "Configuration is not a JSON object")
+            return {}
+        return configurationData
+
     def extractXmlDataFromFolders(
         self,
         pathToZipFile: str,
@@ -114,46 +413,228 @@ class ZipService:
         @brief Liest XML-Dateien aus bestimmten Ordnern und extrahiert spezifische Werte.
         @param targetFolders Liste der Ordner (z.B. ["FolderA/", "FolderB/"])
         @param tagsToFind Liste der XML-Tags, deren Text extrahiert werden soll.
+               Unterstützt auch Pfade und Attribute (z.B. "Tool/Length", "Tool@id"), siehe ExtractionPlan.
         @return Ein Dictionary: { dateiname: { tag_name: wert } }
         """
         extractedDataMap = {}
+        extractionPlan = ExtractionPlan(tagsToFind)
 
-        if not os.path.exists(pathToZipFile):
+        if not archive_source_exists(pathToZipFile):
             return extractedDataMap
 
+        if self.resourceLimits is not None:
+            return dict(self.iterXmlDataFromFolders(pathToZipFile, targetFolders, tagsToFind))
+
+        isTracing = self.eventBus.is_enabled
+
         try:
-            with zipfile.ZipFile(pathToZipFile, 'r') as zipFileHandle:
-                for fileName in zipFileHandle.namelist():
+            with open_archive_source(pathToZipFile) as zipFileHandle:
+                for fileInfo in zipFileHandle.infolist():
+                    fileName = fileInfo.filename
                     
                     isInTargetFolder = any(fileName.startswith(folder) for folder in targetFolders)
                     isXmlFile = fileName.lower().endswith('.xml')
                     
                     if isInTargetFolder and isXmlFile:
+                        startTime = time.perf_counter() if isTracing else 0.0
                         try:
-                            with zipFileHandle.open(fileName) as fileHandle:
-                                tree = ET.parse(fileHandle)
-                                root = tree.getroot()
+                            with zipFileHandle.open(fileInfo) as fileHandle:
+                                extractedDataMap[fileName] = extractionPlan.extract(fileHandle)
                                 
-                                fileResults = {}
-                                for tag in tagsToFind:
-                                    if tag in root.attrib:
-                                        fileResults[tag] = root.attrib[tag]
-                                    else:
-                                        element = root.find(f".//{tag}")
-                                        fileResults[tag] = element.text if element is not None else "NOT_FOUND"
-                                
-                                extractedDataMap[fileName] = fileResults
-                                
-                        except ET.ParseError:
-                            print(f"Fehler: {fileName} ist kein gültiges XML.")
+                        except ET.ParseError as error:
+                            elapsedSeconds = time.perf_counter() - startTime if isTracing else 0.0
+                            self._reportFailure("extractXmlDataFromFolders", pathToZipFile, fileInfo, OUTCOME_INVALID_XML, error, elapsedSeconds)
+                            continue
                         except Exception as error:
-                            print(f"Fehler beim Verarbeiten von {fileName}: {error}")
+                            elapsedSeconds = time.perf_counter() - startTime if isTracing else 0.0
+                            self._reportFailure("extractXmlDataFromFolders", pathToZipFile, fileInfo, OUTCOME_ERROR, error, elapsedSeconds)
+                            continue
+
+                        if isTracing:
+                            self.eventBus.emit(build_entry_event(
+                                "extractXmlDataFromFolders", pathToZipFile, fileInfo, time.perf_counter() - startTime, OUTCOME_OK
+                            ))
 
         except Exception as error:
-            print(f"Allgemeiner Fehler beim Zugriff auf ZIP: {error}")
+            self._reportFailure("extractXmlDataFromFolders", pathToZipFile, None, OUTCOME_ERROR, error)
 
         return extractedDataMap
 
+    def iterXmlDataFromFolders(
+        self,
+        pathToZipFile: str,
+        targetFolders: List[str],
+        tagsToFind: List[str]
+    ):
+        """
+        @brief Resource-governed variant of extractXmlDataFromFolders that yields results one by one.
+        A producer thread streams the central directory and decompresses the target members;
+        the parse stage parses them in the caller's thread or, with parse_workers, in worker processes. Decompressed bytes waiting for the parser reserve
+        max_in_flight_bytes, so a slow parser blocks the producer instead of growing memory.
+        Oversized members and entries beyond max_entries are skipped and reported.
+        Entries that exceed the parse timeout or memory limit of a worker are reported,
+        the other results are still returned.
+        Closing the generator early stops the producer.
+        @param pathToZipFile The path to the ZIP file (or another source location).
+        @param targetFolders List of folder prefixes (e.g. ["FolderA/", "FolderB/"]).
+        @param tagsToFind Tags, paths or attributes to extract, see ExtractionPlan.
+        @return A generator of (file name, {tag_name: value}) tuples in archive order.
+        """
+        resourceLimits = self.resourceLimits or ResourceLimits()
+        if not archive_source_exists(pathToZipFile):
+            return
+
+        isTracing = self.eventBus.is_enabled
+        byteBudget = ByteBudget(resourceLimits.max_in_flight_bytes)
+        handoffQueue = queue.Queue(maxsize=resourceLimits.max_in_flight_entries)
+        stopEvent = threading.Event()
+
+        # Run in a copy of the caller's context, so its failures reach an active recordFailures block
+        producerThread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._decompressTargetMembers, pathToZipFile, targetFolders, resourceLimits, byteBudget, handoffQueue, stopEvent),
+            name=PRODUCER_THREAD_NAME,
+            daemon=True
+        )
+        producerThread.start()
+
+        if resourceLimits.parse_workers:
+            parsedItems = self._parseSupervisedItems(self._getParseSupervisor(resourceLimits), tagsToFind, handoffQueue)
+        else:
+            parsedItems = self._parseHandoffItems(ExtractionPlan(tagsToFind), handoffQueue)
+
+        try:
+            for (fileInfo, memberBytes, readSeconds), outcome, payload, parseSeconds in parsedItems:
+                byteBudget.release(len(memberBytes))
+                del memberBytes
+                elapsedSeconds = readSeconds + parseSeconds if isTracing else 0.0
+
+                if outcome != OUTCOME_OK:
+                    self._reportFailure("iterXmlDataFromFolders", pathToZipFile, fileInfo, outcome, payload, elapsedSeconds)
+                    continue
+
+                if isTracing:
+                    self.eventBus.emit(build_entry_event(
+                        "iterXmlDataFromFolders", pathToZipFile, fileInfo, elapsedSeconds, OUTCOME_OK
+                    ))
+                yield fileInfo.filename, payload
+
+        finally:
+            # Stops the parse stage first, then unblocks a producer waiting for budget or for space in the queue
+            parsedItems.close()
+            stopEvent.set()
+            byteBudget.cancel()
+            while producerThread.is_alive():
+                try:
+                    handoffQueue.get(timeout=HANDOFF_POLL_SECONDS)
+                except queue.Empty:
+                    pass
+            producerThread.join()
+
+
+    @classmethod
+    def _parseSupervisedItems(cls, parseSupervisor: XmlParseSupervisor, tagsToFind: List[str], handoffQueue: queue.Queue):
+        """
+        @brief Parse stage of iterXmlDataFromFolders in worker processes.
+        If the workers cannot be started (e.g. spawning fails in a frozen build or an embedded
+        interpreter), the rest of the queue is parsed in the calling thread instead of being lost.
+        @return A generator of (handoff item, outcome, values or message, parse seconds), like XmlParseSupervisor.parse_queued.
+        """
+        extractionPlan = ExtractionPlan(tagsToFind)
+        if parseSupervisor.has_start_failed:
+            yield from cls._parseHandoffItems(extractionPlan, handoffQueue)
+            return
+
+        try:
+            yield from parseSupervisor.parse_queued(tagsToFind, handoffQueue, _END_OF_MEMBERS)
+        except ParseWorkerStartError as error:
+            logger.warning("Parse workers unavailable (%s), parsing in the calling thread", error)
+            for handoffItem, parseResult in error.remaining_entries:
+                yield parseResult if parseResult is not None else cls._parseHandoffItem(extractionPlan, handoffItem)
+            yield from cls._parseHandoffItems(extractionPlan, handoffQueue)
+
+
+    @classmethod
+    def _parseHandoffItems(cls, extractionPlan: ExtractionPlan, handoffQueue: queue.Queue):
+        """
+        @brief Parse stage of iterXmlDataFromFolders in the calling thread (parse_workers = 0).
+        @return A generator of (handoff item, outcome, values or message, parse seconds), like XmlParseSupervisor.parse_queued.
+        """
+        while True:
+            handoffItem = handoffQueue.get()
+            if handoffItem is _END_OF_MEMBERS:
+                return
+            yield cls._parseHandoffItem(extractionPlan, handoffItem)
+
+
+    @staticmethod
+    def _parseHandoffItem(extractionPlan: ExtractionPlan, handoffItem: tuple) -> tuple:
+        """@brief Parses one handoff item. @return (handoff item, outcome, values or message, parse seconds)."""
+        startTime = time.perf_counter()
+        try:
+            parseResult = (OUTCOME_OK, extractionPlan.extract(io.BytesIO(handoffItem[1])))
+        except ET.ParseError as error:
+            parseResult = (OUTCOME_INVALID_XML, error)
+        except Exception as error:
+            parseResult = (OUTCOME_ERROR, error)
+        return (handoffItem, *parseResult, time.perf_counter() - startTime)
+
+
+    def _decompressTargetMembers(
+        self,
+        pathToZipFile: str,
+        targetFolders: List[str],
+        resourceLimits: ResourceLimits,
+        byteBudget: ByteBudget,
+        handoffQueue: queue.Queue,
+        stopEvent: threading.Event
+    ) -> None:
+        """
+        @brief Producer stage of iterXmlDataFromFolders: reads the target XML members into the queue.
+        Every queued member holds a reservation of its size in byteBudget until it is parsed.
+        """
+        isTracing = self.eventBus.is_enabled
+        try:
+            with open_archive_source(pathToZipFile) as zipFileHandle:
+                for fileInfo in self._iterEntries(zipFileHandle, "iterXmlDataFromFolders", pathToZipFile):
+                    if stopEvent.is_set():
+                        break
+
+                    fileName = fileInfo.filename
+                    isInTargetFolder = any(fileName.startswith(folder) for folder in targetFolders)
+                    isXmlFile = fileName.lower().endswith('.xml')
+                    if not (isInTargetFolder and isXmlFile):
+                        continue
+                    if self._isOversized(fileInfo, "iterXmlDataFromFolders", pathToZipFile):
+                        continue
+
+                    if not byteBudget.acquire(fileInfo.file_size):
+                        break
+
+                    startTime = time.perf_counter() if isTracing else 0.0
+                    try:
+                        memberBytes = self._readGovernedMember(zipFileHandle, fileInfo, "iterXmlDataFromFolders", pathToZipFile)
+                    except Exception as error:
+                        memberBytes = None
+                        elapsedSeconds = time.perf_counter() - startTime if isTracing else 0.0
+                        self._reportFailure("iterXmlDataFromFolders", pathToZipFile, fileInfo, OUTCOME_ERROR, error, elapsedSeconds)
+
+                    if memberBytes is None:
+                        byteBudget.release(fileInfo.file_size)
+                        continue
+
+                    # The reservation is corrected to the actual size, which the parse stage releases
+                    byteBudget.release(fileInfo.file_size - len(memberBytes))
+                    readSeconds = time.perf_counter() - startTime if isTracing else 0.0
+                    handoffQueue.put((fileInfo, memberBytes, readSeconds))
+
+        except Exception as error:
+            self._reportFailure("iterXmlDataFromFolders", pathToZipFile, None, OUTCOME_ERROR, error)
+
+        finally:
+            handoffQueue.put(_END_OF_MEMBERS)
+
+
     def getFileNamesInFolder(
         self,
         pathToZipFile: str,
@@ -167,15 +648,15 @@ class ZipService:
         """
         fileListResult = []
 
-        pathExists = os.path.exists(pathToZipFile)
+        pathExists = archive_source_exists(pathToZipFile)
         if not pathExists:
             return fileListResult
 
         try:
-            with zipfile.ZipFile(pathToZipFile, 'r') as zipFileHandle:
+            with open_archive_source(pathToZipFile) as zipFileHandle:
 
-                unsortedFiles = zipFileHandle.namelist()
-                allFilesSorted = sorted(unsortedFiles)
+                entryInfos = self._iterEntries(zipFileHandle, "getFileNamesInFolder", pathToZipFile, applyEntryCap=False)
+                allFilesSorted = sorted(fileInfo.filename for fileInfo in entryInfos if fileInfo.filename.startswith(folderName))
 
                 for fullPathString in allFilesSorted:
 
@@ -192,26 +673,66 @@ class ZipService:
                             fileListResult.append(cleanFileName)
 
         except Exception as exceptionObject:
-            print(f"Error listing files: {exceptionObject}")
+            self._reportFailure("getFileNamesInFolder", pathToZipFile, None, OUTCOME_ERROR, exceptionObject)
 
         return fileListResult
 
 
+    def getNameIndex(
+        self,
+        pathToZipFile: str
+    ) -> set[str]:
+        """
+        @brief Builds a lookup set of all member names and their implied folder prefixes.
+        Folders are contained with a trailing slash even if the ZIP has no explicit entry for them.
+        @param pathToZipFile The path to the ZIP file.
+        @return Set of member names and folder prefixes (e.g. {"Bars/", "Bars/A.xml"}).
+        """
+        nameIndexResult = set()
+
+        if not archive_source_exists(pathToZipFile):
+            return nameIndexResult
+
+        try:
+            with open_archive_source(pathToZipFile) as zipFileHandle:
+                for fileInfo in self._iterEntries(zipFileHandle, "getNameIndex", pathToZipFile, applyEntryCap=False):
+                    fullPathString = fileInfo.filename
+                    nameIndexResult.add(fullPathString)
+
+                    separatorPosition = fullPathString.rfind("/", 0, len(fullPathString) - 1)
+                    while separatorPosition > 0:
+                        folderPrefix = fullPathString[:separatorPosition + 1]
+                        if folderPrefix in nameIndexResult:
+                            break
+                        nameIndexResult.add(folderPrefix)
+                        separatorPosition = fullPathString.rfind("/", 0, separatorPosition)
+
+        except Exception as exceptionObject:
+            self._reportFailure("getNameIndex", pathToZipFile, None, OUTCOME_ERROR, exceptionObject)
+
+        return nameIndexResult
+
+
     def createNewZipWithChanges(
         self,
         originalZipPath: str,
         newZipPath: str,
-        editedDataMap: Dict[str, str]
+        editedDataMap: Dict[str, str],
+        parallelCompression: bool = False
     ) -> bool:
         """
         @brief Creates a new ZIP file by merging original content with edited data.
         @param originalZipPath Path to the source ZIP.
         @param newZipPath Path where the modified ZIP will be saved.
         @param editedDataMap Dictionary of {filename: new_content}.
+        @param parallelCompression Compress all members on a worker pool (see repackZipParallel).
         @return True if successful, False otherwise.
         """
+        if parallelCompression:
+            return bool(self.repackZipParallel(originalZipPath, newZipPath, editedDataMap))
+
         try:
-            with zipfile.ZipFile(originalZipPath, 'r') as sourceZipHandle:
+            with open_archive_source(originalZipPath) as sourceZipHandle:
                 with zipfile.ZipFile(newZipPath, 'w') as targetZipHandle:
 
                     listOfInfoObjects = sourceZipHandle.infolist()
@@ -239,7 +760,7 @@ class ZipService:
             return True
 
         except Exception as exceptionObject:
-            print(f"Error saving zip: {exceptionObject}")
+            self._reportFailure("createNewZipWithChanges", originalZipPath, None, OUTCOME_ERROR, exceptionObject)
             return False
 
 
@@ -248,7 +769,8 @@ class ZipService:
             originalZipPath: str,
             targetZipPath: str,
             configurationData: Dict[str, Any],
-            configFileName: str = "config.json"
+            configFileName: str = EXPORT_CONFIG_FILE_NAME,
+            parallelCompression: bool = False
     ) -> bool:
         """
         @brief Creates a new ZIP based on the original one and adds a generated config.json to the root.
@@ -256,16 +778,21 @@ class ZipService:
         @param targetZipPath Path where the final ZIP should be saved.
         @param configurationData Dictionary containing the data to be written into config.json.
         @param configFileName The name of the config file inside the ZIP (default: config.json).
+        @param parallelCompression Compress all members on a worker pool (see repackZipParallel).
         @return True if successful, False otherwise.
         """
-        pathExists = os.path.exists(originalZipPath)
+        pathExists = archive_source_exists(originalZipPath)
         if not pathExists:
             return False
 
+        if parallelCompression:
+            jsonContentString = json.dumps(configurationData, indent=4)
+            return bool(self.repackZipParallel(originalZipPath, targetZipPath, {configFileName: jsonContentString}))
+
         try:
             jsonContentString = json.dumps(configurationData, indent=4)
 
-            with zipfile.ZipFile(originalZipPath, 'r') as sourceZipHandle:
+            with open_archive_source(originalZipPath) as sourceZipHandle:
                 with zipfile.ZipFile(targetZipPath, 'w') as targetZipHandle:
 
                     for item in sourceZipHandle.infolist():
@@ -277,5 +804,286 @@ class ZipService:
             return True
 
         except Exception as exceptionObject:
-            print(f"Error creating final zip: {exceptionObject}")
+            self._reportFailure("createZipWithAddedConfig", originalZipPath, None, OUTCOME_ERROR, exceptionObject)
             return False
+
+
+    def resolveCompressionRule(
+        self,
+        fileName: str,
+        compressionRules: Dict[str, Tuple[int, int]]
+    ) -> Tuple[int, int]:
+        """
+        @brief Determines compression method and level of a member by its file extension.
+        @param fileName The member name inside the ZIP.
+        @param compressionRules Mapping of lower-case extension to (method, level).
+        @return A tuple of (compression method, compression level).
+        """
+        fileExtension = os.path.splitext(fileName)[1].lower()
+        return compressionRules.get(fileExtension, DEFAULT_COMPRESSION_RULE)
+
+
+    def repackZipParallel(
+        self,
+        originalZipPath: str,
+        newZipPath: str,
+        editedDataMap: Dict[str, str] = None,
+        compressionRules: Dict[str, Tuple[int, int]] = None,
+        maxWorkers: int = None,
+        useProcesses: bool = False,
+        deterministic: bool = False
+    ) -> Dict[str, Any]:
+        """
+        @brief Rewrites a ZIP archive and compresses its members on a worker pool.
+        Members are written in source order; edited members replace their original,
+        new names from editedDataMap are appended in insertion order.
+        @param originalZipPath Path to the source ZIP.
+        @param newZipPath Path where the repacked ZIP will be saved.
+        @param editedDataMap Optional dictionary of {filename: new_content}.
+        @param compressionRules Optional mapping of extension to (method, level), see DEFAULT_COMPRESSION_RULES.
+        @param maxWorkers Number of pool workers (default: number of CPUs).
+        @param useProcesses Use a process pool instead of a thread pool.
+        @param deterministic Write members sorted by name with fixed timestamps and attributes,
+               so identical input always produces identical bytes.
+        @return Statistics (members, bytes, seconds, MB/s), or an empty dictionary on failure.
+        """
+        repackStatistics = {}
+        editedDataMap = editedDataMap or {}
+        compressionRules = compressionRules or DEFAULT_COMPRESSION_RULES
+
+        if not archive_source_exists(originalZipPath):
+            return repackStatistics
+
+        executorClass = ProcessPoolExecutor if useProcesses else ThreadPoolExecutor
+        workerCount = maxWorkers or os.cpu_count() or 1
+        maxInFlight = IN_FLIGHT_MEMBERS_PER_WORKER * workerCount
+        startTime = time.perf_counter()
+        uncompressedByteCount = 0
+        centralDirectoryEntries = []
+
+        try:
+            with open_archive_source(originalZipPath) as sourceZipHandle, \
+                    open(newZipPath, 'wb') as targetFileHandle, \
+                    executorClass(max_workers=workerCount) as workerPool:
+
+                pendingMembers = deque()
+
+                for memberInfo, payloadBytes in self._iterateRepackMembers(sourceZipHandle, editedDataMap, deterministic):
+                    uncompressedByteCount += len(payloadBytes)
+                    compressType, compressLevel = self.resolveCompressionRule(memberInfo.filename, compressionRules)
+                    if memberInfo.is_dir():
+                        compressType = zipfile.ZIP_STORED
+                    memberInfo.compress_type = compressType
+                    memberInfo.file_size = len(payloadBytes)
+
+                    pendingFuture = workerPool.submit(compressMemberPayload, payloadBytes, compressType, compressLevel)
+                    pendingMembers.append((memberInfo, pendingFuture))
+
+                    # Bounded window: write finished members in order before reading more
+                    while len(pendingMembers) >= maxInFlight:
+                        self._writeRepackedMember(targetFileHandle, pendingMembers.popleft(), centralDirectoryEntries)
+
+                while pendingMembers:
+                    self._writeRepackedMember(targetFileHandle, pendingMembers.popleft(), centralDirectoryEntries)
+
+                self._writeCentralDirectory(targetFileHandle, centralDirectoryEntries)
+
+        except Exception as exceptionObject:
+            self._reportFailure("repackZipParallel", originalZipPath, None, OUTCOME_ERROR, exceptionObject)
+            return repackStatistics
+
+        elapsedSeconds = time.perf_counter() - startTime
+        compressedByteCount = sum(entry.compress_size for entry in centralDirectoryEntries)
+
+        repackStatistics = {
+            "memberCount": len(centralDirectoryEntries),
+            "uncompressedBytes": uncompressedByteCount,
+            "compressedBytes": compressedByteCount,
+            "seconds": elapsedSeconds,
+            "throughputMBs": (uncompressedByteCount / BYTES_PER_MEGABYTE) / elapsedSeconds if elapsedSeconds > 0 else 0.0
+        }
+        return repackStatistics
+
+
+    def _iterateRepackMembers(
+        self,
+        sourceZipHandle: ArchiveSource,
+        editedDataMap: Dict[str, str],
+        deterministic: bool = False
+    ):
+        """
+        @brief Yields (fresh ZipInfo, uncompressed bytes) for every member of the repacked archive.
+        @param deterministic Sort members by name and use fixed timestamps and attributes.
+        """
+        sourceInfoMap = {}
+        for sourceInfo in sourceZipHandle.infolist():
+            sourceInfoMap.setdefault(sourceInfo.filename, sourceInfo)
+
+        memberNames = list(sourceInfoMap) + [name for name in editedDataMap if name not in sourceInfoMap]
+        if deterministic:
+            memberNames.sort()
+
+        currentTimestamp = time.localtime(time.time())[:6]
+
+        for currentFileName in memberNames:
+            sourceInfo = sourceInfoMap.get(currentFileName)
+
+            if deterministic:
+                memberInfo = zipfile.ZipInfo(currentFileName, DETERMINISTIC_DATE_TIME)
+                memberInfo.create_system = DETERMINISTIC_CREATE_SYSTEM
+                memberInfo.external_attr = DETERMINISTIC_DIRECTORY_ATTRIBUTES if currentFileName.endswith("/") \
+                    else DETERMINISTIC_FILE_ATTRIBUTES
+            elif sourceInfo is not None:
+                memberInfo = zipfile.ZipInfo(currentFileName, sourceInfo.date_time)
+                memberInfo.external_attr = sourceInfo.external_attr
+                memberInfo.create_system = sourceInfo.create_system
+            else:
+                memberInfo = zipfile.ZipInfo(currentFileName, currentTimestamp)
+                memberInfo.external_attr = DETERMINISTIC_FILE_ATTRIBUTES
+
+            if currentFileName in editedDataMap:
+                if not deterministic:
+                    memberInfo.date_time = currentTimestamp
+                yield memberInfo, editedDataMap[currentFileName].encode('utf-8')
+            else:
+                yield memberInfo, sourceZipHandle.read(sourceInfo)
+
+
+    def _writeRepackedMember(self, targetFileHandle, pendingMember, centralDirectoryEntries: list) -> None:
+        """
+        @brief Waits for one compressed member and appends local header and data to the target.
+        """
+        memberInfo, pendingFuture = pendingMember
+        checksum, compressedBytes = pendingFuture.result()
+
+        memberInfo.CRC = checksum
+        memberInfo.compress_size = len(compressedBytes)
+        memberInfo.header_offset = targetFileHandle.tell()
+
+        # Sizes are known before the header is written, so ZIP64 is only used where required
+        requiresZip64 = (
+            memberInfo.file_size > ZIP_CLASSIC_SIZE_LIMIT
+            or memberInfo.compress_size > ZIP_CLASSIC_SIZE_LIMIT
+        )
+        targetFileHandle.write(memberInfo.FileHeader(zip64=requiresZip64))
+        targetFileHandle.write(compressedBytes)
+        centralDirectoryEntries.append(memberInfo)
+
+
+    def _writeCentralDirectory(self, targetFileHandle, centralDirectoryEntries: list) -> None:
+        """
+        @brief Appends the central directory and the end record for all written members.
+        Sizes, offsets and member counts beyond the classic limits are written as ZIP64
+        extra fields and a ZIP64 end record, like zipfile does.
+        """
+        centralDirectoryOffset = targetFileHandle.tell()
+
+        for memberInfo in centralDirectoryEntries:
+            dateTime = memberInfo.date_time
+            dosDate = (dateTime[0] - 1980) << 9 | dateTime[1] << 5 | dateTime[2]
+            dosTime = dateTime[3] << 11 | dateTime[4] << 5 | (dateTime[5] // 2)
+            encodedName = memberInfo.filename.encode('utf-8')
+            flagBits = memberInfo.flag_bits | (ZIP_FLAG_UTF8_FILENAME if not memberInfo.filename.isascii() else 0)
+
+            zip64Values = []
+            fileSize = memberInfo.file_size
+            compressSize = memberInfo.compress_size
+            headerOffset = memberInfo.header_offset
+            if fileSize > ZIP_CLASSIC_SIZE_LIMIT or compressSize > ZIP_CLASSIC_SIZE_LIMIT:
+                zip64Values += [fileSize, compressSize]
+                fileSize = compressSize = ZIP_CLASSIC_SIZE_LIMIT
+            if headerOffset > ZIP_CLASSIC_SIZE_LIMIT:
+                zip64Values.append(headerOffset)
+                headerOffset = ZIP_CLASSIC_SIZE_LIMIT
+
+            extraField = b""
+            extractVersion = memberInfo.extract_version
+            createVersion = memberInfo.create_version
+            if zip64Values:
+                extraField = struct.pack(
+                    "<2H" + "Q" * len(zip64Values),
+                    ZIP64_EXTRA_FIELD_ID, 8 * len(zip64Values), *zip64Values
+                )
+                extractVersion = max(extractVersion, ZIP64_VERSION)
+                createVersion = max(createVersion, ZIP64_VERSION)
+
+            centralDirectoryRecord = struct.pack(
+                ZIP_CENTRAL_DIRECTORY_STRUCT,
+                ZIP_CENTRAL_DIRECTORY_SIGNATURE,
+                createVersion, memberInfo.create_system,
+                extractVersion, memberInfo.reserved,
+                flagBits, memberInfo.compress_type, dosTime, dosDate,
+                memberInfo.CRC, compressSize, fileSize,
+                len(encodedName), len(extraField), 0, 0,
+                memberInfo.internal_attr, memberInfo.external_attr,
+                headerOffset
+            )
+            targetFileHandle.write(centralDirectoryRecord)
+            targetFileHandle.write(encodedName)
+            targetFileHandle.write(extraField)
+
+        zip64EndRecordOffset = targetFileHandle.tell()
+        centralDirectoryCount = len(centralDirectoryEntries)
+        centralDirectorySize = zip64EndRecordOffset - centralDirectoryOffset
+
+        requiresZip64 = (
+            centralDirectoryCount > ZIP_CLASSIC_COUNT_LIMIT
+            or centralDirectoryOffset > ZIP_CLASSIC_SIZE_LIMIT
+            or centralDirectorySize > ZIP_CLASSIC_SIZE_LIMIT
+        )
+        if requiresZip64:
+            zip64EndRecord = struct.pack(
+                ZIP64_END_RECORD_STRUCT,
+                ZIP64_END_RECORD_SIGNATURE,
+                struct.calcsize(ZIP64_END_RECORD_STRUCT) - 12,
+                ZIP64_VERSION, ZIP64_VERSION,
+                0, 0,
+                centralDirectoryCount, centralDirectoryCount,
+                centralDirectorySize, centralDirectoryOffset
+            )
+            targetFileHandle.write(zip64EndRecord)
+            targetFileHandle.write(struct.pack(
+                ZIP64_END_LOCATOR_STRUCT,
+                ZIP64_END_LOCATOR_SIGNATURE,
+                0, zip64EndRecordOffset, 1
+            ))
+            centralDirectoryCount = min(centralDirectoryCount, ZIP_CLASSIC_COUNT_LIMIT)
+            centralDirectorySize = min(centralDirectorySize, ZIP_CLASSIC_SIZE_LIMIT)
+            centralDirectoryOffset = min(centralDirectoryOffset, ZIP_CLASSIC_SIZE_LIMIT)
+
+        endRecord = struct.pack(
+            ZIP_END_RECORD_STRUCT,
+            ZIP_END_RECORD_SIGNATURE,
+            0, 0,
+            centralDirectoryCount, centralDirectoryCount,
+            centralDirectorySize, centralDirectoryOffset,
+            0
+        )
+        targetFileHandle.write(endRecord)
+
+
+    def createDeterministicZipWithConfig(
+            self,
+            originalZipPath: str,
+            targetZipPath: str,
+            configurationData: Dict[str, Any],
+            configFileName: str = EXPORT_CONFIG_FILE_NAME
+    ) -> bool:
+        """
+        @brief Creates a reproducible ZIP with an added config file.
+        Members are sorted by name, timestamps and attributes are fixed and the
+        config is written as canonical JSON, so equal input yields equal bytes.
+        Archives beyond the classic ZIP limits are written with ZIP64 records.
+        @param originalZipPath Path to the source ZIP.
+        @param targetZipPath Path where the final ZIP should be saved.
+        @param configurationData Dictionary containing the data to be written into config.json.
+        @param configFileName The name of the config file inside the ZIP (default: config.json).
+        @return True if successful, False otherwise.
+        """
+        repackStatistics = self.repackZipParallel(
+            originalZipPath,
+            targetZipPath,
+            {configFileName: toCanonicalJson(configurationData)},
+            deterministic=True
+        )
+        return bool(repackStatistics)
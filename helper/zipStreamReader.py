@@ -0,0 +1,162 @@
+import os
+import struct
+import zipfile
+
+# ZIP Record Layout (see PKWARE APPNOTE 4.3.7, 4.3.12, 4.3.14 - 4.3.16)
+END_RECORD_STRUCT = "<4s4H2LH"
+END_RECORD_SIGNATURE = b"PK\x05\x06"
+END_RECORD_MAX_COMMENT = 0xFFFF
+ZIP64_LOCATOR_STRUCT = "<4sLQL"
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_END_RECORD_STRUCT = "<4sQ2H2L4Q"
+ZIP64_END_RECORD_SIGNATURE = b"PK\x06\x06"
+CENTRAL_DIRECTORY_STRUCT = "<4s4B4HL2L5H2L"
+CENTRAL_DIRECTORY_SIGNATURE = b"PK\x01\x02"
+LOCAL_HEADER_STRUCT = "<4s2B4HL2L2H"
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+EXTRA_HEADER_STRUCT = "<2H"
+ZIP64_EXTRA_ID = 0x0001
+ZIP64_SIZE_MARKER = 0xFFFFFFFF
+ZIP64_COUNT_MARKER = 0xFFFF
+
+END_RECORD_SIZE = struct.calcsize(END_RECORD_STRUCT)
+ZIP64_LOCATOR_SIZE = struct.calcsize(ZIP64_LOCATOR_STRUCT)
+ZIP64_END_RECORD_SIZE = struct.calcsize(ZIP64_END_RECORD_STRUCT)
+CENTRAL_DIRECTORY_SIZE = struct.calcsize(CENTRAL_DIRECTORY_STRUCT)
+LOCAL_HEADER_SIZE = struct.calcsize(LOCAL_HEADER_STRUCT)
+EXTRA_HEADER_SIZE = struct.calcsize(EXTRA_HEADER_STRUCT)
+
+# General Purpose Flags
+FLAG_ENCRYPTED = 0x1
+FLAG_COMPRESSED_PATCH = 0x20
+FLAG_STRONG_ENCRYPTION = 0x40
+FLAG_UTF8_FILENAME = 0x800
+LEGACY_FILENAME_ENCODING = "cp437"
+
+
+def _read_exactly(file_object, byte_count: int) -> bytes:
+    """Reads byte_count bytes or raises BadZipFile for a truncated archive."""
+    data = file_object.read(byte_count)
+    if len(data) != byte_count:
+        raise zipfile.BadZipFile("Truncated central directory")
+    return data
+
+
+def _read_directory_location(file_object) -> tuple[int, int, int]:
+    """
+    Locates the central directory via the end record (and its ZIP64 variant).
+    Returns: (entry count, directory offset, offset correction for prepended data)
+    """
+    file_object.seek(0, os.SEEK_END)
+    file_size = file_object.tell()
+    search_size = min(file_size, END_RECORD_SIZE + END_RECORD_MAX_COMMENT)
+    file_object.seek(file_size - search_size)
+    tail_bytes = file_object.read(search_size)
+
+    end_record_position = tail_bytes.rfind(END_RECORD_SIGNATURE)
+    if end_record_position < 0 or len(tail_bytes) - end_record_position < END_RECORD_SIZE:
+        raise zipfile.BadZipFile("File is not a zip file")
+
+    end_record = struct.unpack(END_RECORD_STRUCT, tail_bytes[end_record_position:end_record_position + END_RECORD_SIZE])
+    entry_count, directory_size, directory_offset = end_record[4], end_record[5], end_record[6]
+    directory_end = file_size - search_size + end_record_position
+
+    locator_position = end_record_position - ZIP64_LOCATOR_SIZE
+    if locator_position >= 0 and tail_bytes[locator_position:locator_position + 4] == ZIP64_LOCATOR_SIGNATURE:
+        file_object.seek(directory_end - ZIP64_LOCATOR_SIZE - ZIP64_END_RECORD_SIZE)
+        zip64_record = struct.unpack(ZIP64_END_RECORD_STRUCT, _read_exactly(file_object, ZIP64_END_RECORD_SIZE))
+        if zip64_record[0] != ZIP64_END_RECORD_SIGNATURE:
+            raise zipfile.BadZipFile("Corrupt ZIP64 end of central directory record")
+        entry_count, directory_size, directory_offset = zip64_record[7], zip64_record[8], zip64_record[9]
+        directory_end -= ZIP64_LOCATOR_SIZE + ZIP64_END_RECORD_SIZE
+
+    # Like zipfile: data prepended to the archive (e.g. self-extractors) shifts all offsets
+    offset_correction = directory_end - directory_size - directory_offset
+    return entry_count, directory_offset + offset_correction, offset_correction
+
+
+def _apply_zip64_extra(entry_info: zipfile.ZipInfo, extra_bytes: bytes) -> None:
+    """Replaces 0xFFFFFFFF placeholders with the 64-bit values of the ZIP64 extra field."""
+    position = 0
+    while position + EXTRA_HEADER_SIZE <= len(extra_bytes):
+        header_id, data_size = struct.unpack_from(EXTRA_HEADER_STRUCT, extra_bytes, position)
+        data_start = position + EXTRA_HEADER_SIZE
+        if header_id == ZIP64_EXTRA_ID:
+            values = iter(struct.unpack_from(f"<{data_size // 8}Q", extra_bytes, data_start))
+            # The field only holds the values whose 32-bit slot is saturated, in this order
+            if entry_info.file_size == ZIP64_SIZE_MARKER:
+                entry_info.file_size = next(values)
+            if entry_info.compress_size == ZIP64_SIZE_MARKER:
+                entry_info.compress_size = next(values)
+            if entry_info.header_offset == ZIP64_SIZE_MARKER:
+                entry_info.header_offset = next(values)
+            return
+        position = data_start + data_size
+
+
+def iter_central_directory(file_object):
+    """
+    Yields one zipfile.ZipInfo per archive entry, parsed straight from the central directory.
+    Unlike zipfile.ZipFile nothing is retained, so memory does not grow with the entry count.
+    """
+    entry_count, directory_offset, offset_correction = _read_directory_location(file_object)
+    file_object.seek(directory_offset)
+
+    for _ in range(entry_count):
+        record = struct.unpack(CENTRAL_DIRECTORY_STRUCT, _read_exactly(file_object, CENTRAL_DIRECTORY_SIZE))
+        if record[0] != CENTRAL_DIRECTORY_SIGNATURE:
+            raise zipfile.BadZipFile("Bad magic number for central directory")
+
+        (_, create_version, create_system, extract_version, reserved, flag_bits, compress_type,
+         dos_time, dos_date, crc, compress_size, file_size, name_length, extra_length,
+         comment_length, _, internal_attr, external_attr, header_offset) = record
+
+        raw_name = _read_exactly(file_object, name_length)
+        extra_bytes = _read_exactly(file_object, extra_length)
+        comment_bytes = _read_exactly(file_object, comment_length)
+
+        file_name = raw_name.decode("utf-8" if flag_bits & FLAG_UTF8_FILENAME else LEGACY_FILENAME_ENCODING)
+        date_time = ((dos_date >> 9) + 1980, (dos_date >> 5) & 0xF, dos_date & 0x1F,
+                     dos_time >> 11, (dos_time >> 5) & 0x3F, (dos_time & 0x1F) * 2)
+
+        entry_info = zipfile.ZipInfo(file_name, date_time)
+        entry_info.create_version = create_version
+        entry_info.create_system = create_system
+        entry_info.extract_version = extract_version
+        entry_info.reserved = reserved
+        entry_info.flag_bits = flag_bits
+        entry_info.compress_type = compress_type
+        entry_info.CRC = crc
+        entry_info.compress_size = compress_size
+        entry_info.file_size = file_size
+        entry_info.header_offset = header_offset
+        entry_info.internal_attr = internal_attr
+        entry_info.external_attr = external_attr
+        entry_info.extra = extra_bytes
+        entry_info.comment = comment_bytes
+
+        if ZIP64_SIZE_MARKER in (file_size, compress_size, header_offset):
+            _apply_zip64_extra(entry_info, extra_bytes)
+        entry_info.header_offset += offset_correction
+        yield entry_info
+
+
+def open_member_stream(file_object, entry_info: zipfile.ZipInfo):
+    """
+    Opens one member for reading, given a ZipInfo from iter_central_directory.
+    The returned stream decompresses and verifies the CRC-32 like ZipFile.open; it
+    reads from file_object directly, so only one member may be open per handle.
+    """
+    if entry_info.flag_bits & FLAG_COMPRESSED_PATCH:
+        raise NotImplementedError("compressed patched data (flag bit 5)")
+    if entry_info.flag_bits & (FLAG_ENCRYPTED | FLAG_STRONG_ENCRYPTION):
+        raise RuntimeError(f"File {entry_info.filename!r} is encrypted")
+
+    file_object.seek(entry_info.header_offset)
+    local_header = struct.unpack(LOCAL_HEADER_STRUCT, _read_exactly(file_object, LOCAL_HEADER_SIZE))
+    if local_header[0] != LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile("Bad magic number for file header")
+
+    # Name and extra field of the local header may differ in length from the central directory
+    file_object.seek(local_header[10] + local_header[11], os.SEEK_CUR)
+    return zipfile.ZipExtFile(file_object, "r", entry_info)
@@ -0,0 +1,194 @@
+import itertools
+import unittest
+from helper.featureRules import (
+    FEATURES, FEATURE_STATE_COUNT, FEATURE_SHIFT_CUT, FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG, FEATURE_ROBOT_MODE,
+    FINAL_KEY_MACHINE_MODEL, FINAL_KEY_TEST_BARS, FINAL_KEY_MOUNT_COUNT, FINAL_KEY_FEATURES,
+    SHELF_VALUE_SMALL, SHELF_VALUE_BIG, compile_rule_table, compute_mount_limits, default_mount_count,
+    find_feature_conflicts, mask_to_state, validate_configurations
+)
+
+# Models with rules of their own, a generic model and IDs that only occur in uploaded configs
+CHECKED_MODELS = ("AF500", "AF510", "AS100", "AF300", "UNKNOWN", "", None, 42)
+CHECKED_MOUNT_COUNTS = tuple(range(-2, 28)) + (2 ** 70, -2 ** 70, True, False, 3.0, "3", None)
+
+ROBOT_MODE_REQUIRED_LABEL = " (Für Regal erforderlich)"
+ROBOT_MODE_NEEDS_SHELF_LABEL = " (Erfordert ein Regal)"
+SHIFT_CUT_BLOCKED_LABEL = " (Nicht mit Regal möglich)"
+
+
+# Documented Rules: the editor behavior before the rules were compiled into tables
+
+def documented_mount_limits(machine_model_name, feature_state: dict) -> tuple:
+    if feature_state[FEATURE_SHELF_SMALL]:
+        return 1, 9, "(Small Shelf Limit)"
+    if feature_state[FEATURE_SHELF_BIG]:
+        return 1, 25, "(Big Shelf Limit)"
+    if machine_model_name == "AS100":
+        return 1, 10, "(AS100 Limit)"
+    return 0, 25, ""
+
+
+def documented_default_mount_count(machine_model_name) -> int:
+    return 1 if machine_model_name in ("AF500", "AF510", "AS100") else 0
+
+
+def documented_conflicts(feature_state: dict) -> list:
+    conflicts = []
+    any_shelf_active = feature_state[FEATURE_SHELF_SMALL] or feature_state[FEATURE_SHELF_BIG]
+    if feature_state[FEATURE_SHELF_SMALL] and feature_state[FEATURE_SHELF_BIG]:
+        conflicts.append("createShelf and createBigShelf are mutually exclusive")
+    if any_shelf_active and not feature_state[FEATURE_ROBOT_MODE]:
+        conflicts.append("A shelf requires RobotMode")
+    if feature_state[FEATURE_ROBOT_MODE] and not any_shelf_active:
+        conflicts.append("RobotMode requires a shelf")
+    if feature_state[FEATURE_SHIFT_CUT] and any_shelf_active:
+        conflicts.append("ShiftCutDevice is not possible with a shelf")
+    return conflicts
+
+
+def documented_toggle(feature_state: dict, feature_name: str) -> dict:
+    """
+    Toggle of the editor, with the intended change: switching RobotMode off while
+    a shelf is active is refused instead of leaving a conflicting state.
+    """
+    states = dict(feature_state)
+    if feature_name == FEATURE_ROBOT_MODE and states[FEATURE_ROBOT_MODE] \
+            and (states[FEATURE_SHELF_SMALL] or states[FEATURE_SHELF_BIG]):
+        return states
+
+    states[feature_name] = not states[feature_name]
+    if feature_name in (FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG) and states[feature_name]:
+        other = FEATURE_SHELF_BIG if feature_name == FEATURE_SHELF_SMALL else FEATURE_SHELF_SMALL
+        states[other] = False
+        states[FEATURE_ROBOT_MODE] = True
+        states[FEATURE_SHIFT_CUT] = False
+    elif not states[FEATURE_SHELF_SMALL] and not states[FEATURE_SHELF_BIG]:
+        states[FEATURE_ROBOT_MODE] = False
+
+    if feature_name == FEATURE_SHIFT_CUT and states[FEATURE_SHIFT_CUT] \
+            and (states[FEATURE_SHELF_SMALL] or states[FEATURE_SHELF_BIG]):
+        states[FEATURE_SHIFT_CUT] = False
+    return states
+
+
+def documented_blocked_features(feature_state: dict) -> dict:
+    """Blocked buttons of the editor, plus RobotMode while a shelf needs it."""
+    if feature_state[FEATURE_SHELF_SMALL] or feature_state[FEATURE_SHELF_BIG]:
+        return {FEATURE_SHIFT_CUT: SHIFT_CUT_BLOCKED_LABEL, FEATURE_ROBOT_MODE: ROBOT_MODE_REQUIRED_LABEL}
+    return {FEATURE_ROBOT_MODE: ROBOT_MODE_NEEDS_SHELF_LABEL}
+
+
+def documented_evaluate(machine_model_name, feature_state: dict, mount_count, test_bars: bool) -> dict:
+    min_allowed, max_allowed, _ = documented_mount_limits(machine_model_name, feature_state)
+    is_mount_count_valid = isinstance(mount_count, int) and not isinstance(mount_count, bool) \
+        and min_allowed <= mount_count <= max_allowed
+    is_mode_valid = test_bars or not feature_state[FEATURE_SHIFT_CUT]
+    conflicts = documented_conflicts(feature_state)
+    return {
+        "is_valid": not conflicts and is_mount_count_valid and is_mode_valid,
+        "conflicts": conflicts,
+        "is_mount_count_valid": is_mount_count_valid,
+        "is_mode_valid": is_mode_valid
+    }
+
+
+def final_features(feature_state: dict) -> list:
+    """Converts a feature state into the "Features" list of the final data."""
+    features = [{FEATURE_SHIFT_CUT: feature_state[FEATURE_SHIFT_CUT]}, {FEATURE_ROBOT_MODE: feature_state[FEATURE_ROBOT_MODE]}]
+    if feature_state[FEATURE_SHELF_SMALL]:
+        features.append({FEATURE_SHELF_SMALL: SHELF_VALUE_SMALL})
+    if feature_state[FEATURE_SHELF_BIG]:
+        features.append({FEATURE_SHELF_SMALL: SHELF_VALUE_BIG})
+    return features
+
+
+ALL_FEATURE_STATES = [mask_to_state(mask) for mask in range(FEATURE_STATE_COUNT)]
+
+
+class FeatureRuleTableTest(unittest.TestCase):
+    """Compares the compiled rule tables of all 16 feature states with the documented rules."""
+
+    def test_conflicts(self):
+        for machine_model_name, feature_state in itertools.product(CHECKED_MODELS, ALL_FEATURE_STATES):
+            with self.subTest(model=machine_model_name, state=feature_state):
+                self.assertEqual(find_feature_conflicts(feature_state), documented_conflicts(feature_state))
+                self.assertEqual(
+                    compile_rule_table(machine_model_name).evaluate(feature_state, 1)["conflicts"],
+                    documented_conflicts(feature_state)
+                )
+
+
+    def test_mount_limits(self):
+        for machine_model_name, feature_state in itertools.product(CHECKED_MODELS, ALL_FEATURE_STATES):
+            with self.subTest(model=machine_model_name, state=feature_state):
+                self.assertEqual(
+                    compute_mount_limits(machine_model_name, feature_state),
+                    documented_mount_limits(machine_model_name, feature_state)
+                )
+                self.assertEqual(default_mount_count(machine_model_name), documented_default_mount_count(machine_model_name))
+
+
+    def test_bars_mode(self):
+        for machine_model_name, feature_state in itertools.product(CHECKED_MODELS, ALL_FEATURE_STATES):
+            with self.subTest(model=machine_model_name, state=feature_state):
+                self.assertEqual(
+                    compile_rule_table(machine_model_name).forces_bars_mode(feature_state),
+                    feature_state[FEATURE_SHIFT_CUT]
+                )
+
+
+    def test_toggle_of_reachable_states(self):
+        """States without conflicts are the ones the editor can reach."""
+        reachable_states = [feature_state for feature_state in ALL_FEATURE_STATES if not documented_conflicts(feature_state)]
+        for machine_model_name, feature_state, feature_name in itertools.product(CHECKED_MODELS, reachable_states, FEATURES):
+            with self.subTest(model=machine_model_name, state=feature_state, feature=feature_name):
+                rule_table = compile_rule_table(machine_model_name)
+                self.assertEqual(rule_table.toggle(feature_state, feature_name), documented_toggle(feature_state, feature_name))
+                self.assertEqual(rule_table.blocked_features(feature_state), documented_blocked_features(feature_state))
+
+
+    def test_toggle_never_keeps_a_conflict(self):
+        """Conflicting states only come from uploaded configs; every toggle resolves them."""
+        for machine_model_name, feature_state, feature_name in itertools.product(CHECKED_MODELS, ALL_FEATURE_STATES, FEATURES):
+            with self.subTest(model=machine_model_name, state=feature_state, feature=feature_name):
+                toggled_state = compile_rule_table(machine_model_name).toggle(feature_state, feature_name)
+                self.assertEqual(documented_conflicts(toggled_state), [])
+
+
+    def test_robot_mode_stays_on_with_shelf(self):
+        for shelf_feature in (FEATURE_SHELF_SMALL, FEATURE_SHELF_BIG):
+            feature_state = dict(mask_to_state(0), **{shelf_feature: True, FEATURE_ROBOT_MODE: True})
+            with self.subTest(shelf=shelf_feature):
+                self.assertEqual(compile_rule_table("AF500").toggle(feature_state, FEATURE_ROBOT_MODE), feature_state)
+
+
+    def test_evaluate(self):
+        checked_cases = itertools.product(CHECKED_MODELS, ALL_FEATURE_STATES, CHECKED_MOUNT_COUNTS, (True, False))
+        for machine_model_name, feature_state, mount_count, test_bars in checked_cases:
+            with self.subTest(model=machine_model_name, state=feature_state, mount_count=mount_count, test_bars=test_bars):
+                result = compile_rule_table(machine_model_name).evaluate(feature_state, mount_count, test_bars)
+                expected = documented_evaluate(machine_model_name, feature_state, mount_count, test_bars)
+                self.assertEqual({key: result[key] for key in expected}, expected)
+
+
+    def test_validate_configurations_matches_evaluate(self):
+        checked_cases = list(itertools.product(CHECKED_MODELS, ALL_FEATURE_STATES, CHECKED_MOUNT_COUNTS, (True, False)))
+        configurations = [
+            {
+                FINAL_KEY_MACHINE_MODEL: machine_model_name,
+                FINAL_KEY_TEST_BARS: test_bars,
+                FINAL_KEY_MOUNT_COUNT: mount_count,
+                FINAL_KEY_FEATURES: final_features(feature_state)
+            }
+            for machine_model_name, feature_state, mount_count, test_bars in checked_cases
+        ]
+        results = validate_configurations(configurations)
+
+        for (machine_model_name, feature_state, mount_count, test_bars), result in zip(checked_cases, results):
+            with self.subTest(model=machine_model_name, state=feature_state, mount_count=mount_count, test_bars=test_bars):
+                expected = documented_evaluate(machine_model_name, feature_state, mount_count, test_bars)
+                self.assertEqual({key: result[key] for key in expected}, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import flet as ft
+
+# Timing Configuration
+FRAME_SECONDS = 1 / 60
+DEFAULT_DEBOUNCE_SECONDS = 0.3
+
+
+class UpdateScheduler:
+    """
+    Coalesces UI state changes into batched page updates.
+    Controls marked dirty within one frame are sent in a single page.update() call;
+    Flet then only transmits the properties that actually changed. Debounced
+    callbacks run once after the input has been quiet for the given delay; the
+    frame flush leaves them alone, only flush_debounced runs them early.
+    Safe to use from sync handlers (worker threads) and async handlers alike.
+    """
+
+    def __init__(self, page: ft.Page, frame_seconds: float = FRAME_SECONDS):
+        self.page = page
+        self.frame_seconds = frame_seconds
+        self._lock = threading.Lock()
+        self._dirty_controls = {}
+        self._is_flush_pending = False
+        self._debounce_versions = {}
+        self._pending_debounced = {}
+
+
+    def schedule(self, *controls: ft.Control) -> None:
+        """Marks controls as changed; they are sent with the next frame flush."""
+        with self._lock:
+            for control in controls:
+                self._dirty_controls[id(control)] = control
+            start_flush = not self._is_flush_pending
+            self._is_flush_pending = True
+
+        if start_flush:
+            self.page.run_task(self._flush_after_frame)
+
+
+    def debounce(self, key: str, callback, delay_seconds: float = DEFAULT_DEBOUNCE_SECONDS) -> None:
+        """Runs callback once, delay_seconds after the last call with the same key."""
+        with self._lock:
+            version = self._debounce_versions.get(key, 0) + 1
+            self._debounce_versions[key] = version
+            self._pending_debounced[key] = callback
+
+        self.page.run_task(self._run_debounced, key, version, delay_seconds)
+
+
+    def is_debounce_pending(self, key: str) -> bool:
+        """True while a debounced callback of the key waits for its delay."""
+        with self._lock:
+            return key in self._pending_debounced
+
+
+    def flush_debounced(self, *keys: str) -> None:
+        """Runs the pending debounced callbacks of the keys (all if none are given) immediately."""
+        with self._lock:
+            flush_keys = keys or list(self._pending_debounced)
+            pending_callbacks = [self._pending_debounced.pop(key) for key in flush_keys if key in self._pending_debounced]
+
+        for callback in pending_callbacks:
+            callback()
+
+
+    def flush(self) -> None:
+        """Sends all dirty controls immediately. Debounced callbacks keep their timers."""
+        with self._lock:
+            dirty_controls = list(self._dirty_controls.values())
+            self._dirty_controls.clear()
+            self._is_flush_pending = False
+
+        if dirty_controls:
+            self.page.update(*dirty_controls)
+
+
+    async def _flush_after_frame(self) -> None:
+        """Waits for the end of the current frame, then sends the batch."""
+        await asyncio.sleep(self.frame_seconds)
+        self.flush()
+
+
+    async def _run_debounced(self, key: str, version: int, delay_seconds: float) -> None:
+        """Runs the callback of a key unless a newer call arrived during the delay."""
+        await asyncio.sleep(delay_seconds)
+
+        with self._lock:
+            if self._debounce_versions.get(key) != version or key not in self._pending_debounced:
+                return
+            callback = self._pending_debounced.pop(key)
+
+        callback()
@@ -1,7 +1,16 @@
+import asyncio
 import flet as ft
 import os
-from helper import IMachineService, MachineBusinessLogic
-from helper.logic import XML_TAG_IST, XML_TAG_SOLL
+import secrets
+import shutil
+from helper import IAsyncMachineService, AsyncMachineBusinessLogic, SHARED_PARSE_CACHE, SHARED_INTEGRITY_CHECKER
+from helper import DiagnosticsBus, JsonLinesLogSink, EntrySummarySink, ResourceLimits
+from helper.diagnostics import DEFAULT_EVENT_LOG_PATH
+from helper.logic import XML_TAG_IST, XML_TAG_SOLL, UPLOAD_DIRECTORY_NAME, DEFAULT_EXTRACTION_TAGS, TAG_LIST_SEPARATOR
+from helper.logic import sanitize_upload_name, FOLDER_BARS
+from helper.integrityCheck import FAILURE_ENTRY_LIMIT
+from helper.columnarExport import supported_formats, FORMAT_CSV
+from .updateScheduler import UpdateScheduler
 
 # Layout Constants
 DEFAULT_PADDING = 20
@@ -11,6 +20,34 @@ INSTRUCTION_TEXT_SIZE = 20
 ICON_SIZE_LARGE = 50
 ICON_SIZE_MEDIUM = 20
 EXPORT_FILE_SUFFIX = "_konfiguriert"
+VALUES_FILE_SUFFIX = "_werte"
+ZIP_FILE_EXTENSION = ".zip"
+
+# Web Mode Constants
+ASSETS_DIRECTORY_NAME = "assets"
+DOWNLOAD_DIRECTORY_NAME = "exports"
+# Seconds a served export stays in the assets directory before it is deleted
+DOWNLOAD_RETENTION_SECONDS = 60.0
+UPLOAD_URL_EXPIRY_SECONDS = 600
+UPLOAD_COMPLETE_PROGRESS = 1.0
+PREVIOUS_EXPORT_PREFIX = "previous_"
+
+# Editor Update Configuration
+FEATURE_ORDER = ["createShelf", "createBigShelf", "RobotMode", "ShiftCutDevice"]
+DEBOUNCE_KEY_MOUNT_COUNT = "mount_count"
+MOUNT_COUNT_DEBOUNCE_SECONDS = 0.3
+MAX_LISTED_INTEGRITY_FAILURES = 20
+MAX_LISTED_MISSING_FILES = 20
+MILLISECONDS_PER_SECOND = 1000
+
+def session_upload_url(page: ft.Page, upload_directory: str, file_name: str) -> str:
+    """
+    Builds the browser upload URL for a file in the session upload directory.
+    Raises ValueError for names that are not a plain file name (e.g. "../other/x.zip").
+    """
+    session_relative_path = os.path.relpath(os.path.join(upload_directory, sanitize_upload_name(file_name)), UPLOAD_DIRECTORY_NAME)
+    return page.get_upload_url(session_relative_path, UPLOAD_URL_EXPIRY_SECONDS)
+
 
 class UploadView(ft.View):
     """
@@ -18,7 +55,7 @@ class UploadView(ft.View):
     Handles UI layout and user interaction for file selection.
     """
 
-    def __init__(self, service: IMachineService, navigation_callback):
+    def __init__(self, service: IAsyncMachineService, navigation_callback, allow_directory_sources: bool = True):
         super().__init__(route="/", padding=LARGE_PADDING)
         self.service = service
         self.nav = navigation_callback
@@ -33,7 +70,16 @@ class UploadView(ft.View):
             on_click=lambda _: self.nav("/editor")
         )
 
-        self.file_picker = ft.FilePicker(on_result=self.on_file_result)
+        self.file_picker = ft.FilePicker(on_result=self.on_file_result, on_upload=self.on_file_uploaded)
+        self.pending_web_upload = None
+
+        # Folder trees can only be read in place, which needs a local file system
+        self.directory_button = ft.OutlinedButton(
+            text="Ordner auswählen",
+            icon=ft.Icons.FOLDER,
+            visible=allow_directory_sources,
+            on_click=lambda _: self.file_picker.get_directory_path()
+        )
 
         self.controls = [
             ft.AppBar(
@@ -55,6 +101,7 @@ class UploadView(ft.View):
                                 allowed_extensions=["zip"]
                             )
                         ),
+                        self.directory_button,
                         self.status_label,
                         ft.Divider(),
                         self.proceed_button
@@ -65,15 +112,68 @@ class UploadView(ft.View):
         ]
 
 
-    def on_file_result(self, event: ft.ControlEvent):
-        """Processes the file selection event and updates UI status."""
+    async def on_file_result(self, event: ft.ControlEvent):
+        """Processes the file or folder selection event and updates UI status."""
+        if not event.files and event.path:
+            source_name = await self.service.logic_open_source_async(event.path)
+            self.status_label.value = f"Ausgewählter Ordner: {source_name}"
+            self.proceed_button.disabled = False
+            self.update()
+            return
+
         if event.files:
             selected_file = event.files[0]
-            uploaded_file_name = self.service.logic_handle_upload(selected_file)
 
-            self.status_label.value = f"Ausgewählte Datei: {uploaded_file_name}"
-            self.proceed_button.disabled = False
+            # In web mode the browser has no local path; upload into the session directory first
+            if not selected_file.path:
+                self.start_web_upload(selected_file)
+                return
+
+            await self.register_upload(selected_file)
+
+
+    def start_web_upload(self, selected_file):
+        """Uploads the selected file from the browser into the session upload directory."""
+        try:
+            upload_url = session_upload_url(self.page, self.service.upload_directory, selected_file.name)
+        except ValueError:
+            self.status_label.value = f"Ungültiger Dateiname: {selected_file.name}"
+            self.update()
+            return
+
+        self.pending_web_upload = selected_file
+        self.status_label.value = f"Lade hoch: {selected_file.name}"
+        self.update()
+
+        self.file_picker.upload([
+            ft.FilePickerUploadFile(selected_file.name, upload_url=upload_url)
+        ])
+
+
+    async def on_file_uploaded(self, event: ft.FilePickerUploadEvent):
+        """Registers a finished browser upload with the business logic."""
+        if event.error:
+            self.status_label.value = f"Fehler beim Hochladen: {event.error}"
+            self.pending_web_upload = None
             self.update()
+        elif event.progress == UPLOAD_COMPLETE_PROGRESS and self.pending_web_upload:
+            selected_file = self.pending_web_upload
+            self.pending_web_upload = None
+            await self.register_upload(selected_file)
+
+
+    async def register_upload(self, selected_file):
+        """Hands the selected file to the business logic and unlocks the next step."""
+        try:
+            uploaded_file_name = await self.service.logic_handle_upload_async(selected_file)
+        except ValueError:
+            self.status_label.value = f"Ungültiger Dateiname: {selected_file.name}"
+            self.update()
+            return
+
+        self.status_label.value = f"Ausgewählte Datei: {uploaded_file_name}"
+        self.proceed_button.disabled = False
+        self.update()
 
 
 class EditorView(ft.View):
@@ -81,10 +181,11 @@ class EditorView(ft.View):
     View for the second step: Configuring machine features and file sequence.
     Drives UI updates based on the shared business logic service.
     """
-    def __init__(self, service: IMachineService, navigation_callback):
+    def __init__(self, service: IAsyncMachineService, navigation_callback, entry_summary: EntrySummarySink = None):
         super().__init__(route="/editor", scroll=ft.ScrollMode.AUTO)
         self.service = service
         self.nav = navigation_callback
+        self.entry_summary = entry_summary
 
         # Display Elements
         self.machine_name_label = ft.Text(
@@ -106,7 +207,17 @@ class EditorView(ft.View):
         )
 
         self.features_list = ft.Column(spacing=5)
+        self.feature_rows = {}
         self.files_list = ft.Column(spacing=8)
+        self.file_rows = {}
+        self.file_rows_signature = None
+        self._update_scheduler = None
+        self.deviation_summary = ft.Text(size=12, color=ft.Colors.GREY)
+        self.extra_tags_field = ft.TextField(
+            label="Zusätzliche XML-Werte (z.B. ToolId, Tool/Length, Tool@id)",
+            dense=True,
+            on_submit=self.on_extra_tags_submit
+        )
 
         # Selection Mode
         self.mode_switch = ft.Switch(
@@ -114,6 +225,53 @@ class EditorView(ft.View):
             on_change=self.on_mode_toggle
         )
         self.mode_description = ft.Text(weight=ft.FontWeight.BOLD, size=16)
+        self.loading_indicator = ft.ProgressBar(visible=False)
+        self.active_load_count = 0
+        self.status_label = ft.Text(size=12, color=ft.Colors.RED, visible=False)
+
+        # Archive Integrity
+        self.integrity_summary = ft.Text("Archiv wird geprüft...", size=12, color=ft.Colors.GREY)
+        self.integrity_failures = ft.Column(spacing=2, visible=False)
+        self.integrity_panel = ft.Container(
+            padding=10,
+            border_radius=8,
+            bgcolor=ft.Colors.GREY_50,
+            content=ft.Column([self.integrity_summary, self.integrity_failures], spacing=5)
+        )
+
+        # Archive Diagnostics: slowest and failed entries of all ZIP reads
+        self.diagnostics_panel = ft.ExpansionTile(
+            title=ft.Text("Diagnose", size=14),
+            subtitle=ft.Text("Noch keine Einträge gelesen", size=12, color=ft.Colors.GREY),
+            visible=entry_summary is not None
+        )
+        self.diagnostics_signature = None
+
+        # Order Import: FileOrder of a previously exported ZIP
+        self.file_picker = ft.FilePicker(on_result=self.on_previous_export_picked, on_upload=self.on_previous_export_uploaded)
+        self.pending_previous_export = None
+        self.order_import_summary = ft.Text(size=12)
+        self.order_import_missing = ft.Column(spacing=2)
+        self.order_import_panel = ft.Container(
+            padding=10,
+            border_radius=8,
+            bgcolor=ft.Colors.GREY_50,
+            visible=False,
+            content=ft.Column([self.order_import_summary, self.order_import_missing], spacing=5)
+        )
+        self.import_order_button = ft.OutlinedButton(
+            text="Reihenfolge aus Export übernehmen",
+            icon=ft.Icons.HISTORY,
+            on_click=lambda _: self.file_picker.pick_files(
+                allow_multiple=False,
+                allowed_extensions=["zip"]
+            )
+        )
+        self.sort_button = ft.OutlinedButton(
+            text="Nach Abweichung sortieren",
+            icon=ft.Icons.SORT,
+            on_click=self.on_sort_by_deviation
+        )
 
         self.controls = [
             ft.AppBar(title=ft.Text("Sequenz-Editor"), bgcolor=ft.Colors.BLUE_GREY_100),
@@ -122,6 +280,10 @@ class EditorView(ft.View):
                 content=ft.Column([
                     ft.Text("Erkannte Maschinen-Konfiguration:", color=ft.Colors.GREY),
                     self.machine_name_label,
+                    self.loading_indicator,
+                    self.status_label,
+                    self.integrity_panel,
+                    self.diagnostics_panel,
                     ft.Divider(),
                     ft.Container(
                         bgcolor=ft.Colors.BLUE_GREY_50,
@@ -138,42 +300,155 @@ class EditorView(ft.View):
                     ft.Text("Features konfigurieren:", weight=ft.FontWeight.BOLD),
                     self.features_list,
                     ft.Divider(),
-                    ft.Text("Dateireihenfolge (Drag & Drop):", weight=ft.FontWeight.BOLD),
+                    ft.Row([
+                        ft.Text("Dateireihenfolge (Drag & Drop):", weight=ft.FontWeight.BOLD),
+                        ft.Row([self.import_order_button, self.sort_button])
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    self.order_import_panel,
+                    self.deviation_summary,
+                    self.extra_tags_field,
                     self.files_list,
                     ft.Container(height=30),
                     ft.ElevatedButton(
                         text="Sequenz bestätigen & Beenden",
                         icon=ft.Icons.CHECK_CIRCLE,
                         style=ft.ButtonStyle(bgcolor=ft.Colors.GREEN_600, color=ft.Colors.WHITE),
-                        on_click=lambda _: self.nav("/result")
+                        on_click=self.on_confirm_click
                     )
                 ])
             )
         ]
 
+        self.build_features_ui()
+
 
     def on_attach(self):
-        """Initializes configuration data and refreshes view components."""
+        """Schedules the initial data load and the integrity check without blocking the event loop."""
+        self.page.run_task(self.load_initial_data)
+        self.page.run_task(self.load_integrity_report)
+
+
+    @property
+    def update_scheduler(self) -> UpdateScheduler:
+        """Batches all updates of this view; created on first use because the page is only known after mounting."""
+        if self._update_scheduler is None:
+            self._update_scheduler = UpdateScheduler(self.page)
+        return self._update_scheduler
+
+
+    async def load_initial_data(self):
+        """Initializes configuration data in the background and refreshes view components."""
         if self.service.machine_model_name == "UNKNOWN":
-            self.service.logic_parse_config()
-            self.service.logic_load_files_for_mode()
-            self.service.logic_load_xml_data_for_files()
+            await self.run_with_loading("Laden des Archivs", self.service.logic_initialize_async)
         self.refresh_ui()
 
 
+    async def load_integrity_report(self):
+        """CRC-checks the archive in parallel with the data load, once per upload."""
+        if not self.service.integrity_report:
+            await self.service.logic_check_integrity_async()
+        if self.service.integrity_report:
+            # Empty if another archive was registered during the check; its own check fills the panel
+            self.refresh_integrity_ui()
+
+
+    def refresh_integrity_ui(self):
+        """Shows the integrity report: a short summary, or the damaged members."""
+        report = self.service.integrity_report
+        member_failures = [failure for failure in report.get("failures", []) if failure["kind"] != FAILURE_ENTRY_LIMIT]
+
+        if report.get("is_valid"):
+            self.integrity_summary.value = (
+                f"Archiv geprüft: {report['member_count']} Einträge fehlerfrei "
+                f"({report['skipped_count']} bereits bekannt, {report['seconds']:.1f} s)"
+            )
+            self.integrity_summary.color = ft.Colors.GREEN_700
+            self.integrity_panel.bgcolor = ft.Colors.GREY_50
+        elif not member_failures and not report.get("is_complete", True):
+            # Only the entry limit was hit: the checked part is intact, the rest is unknown
+            self.integrity_summary.value = (
+                f"Prüfung nach {report['member_count']} Einträgen abgebrochen: Eintragslimit erreicht, "
+                f"geprüfte Einträge fehlerfrei"
+            )
+            self.integrity_summary.color = ft.Colors.ORANGE_700
+            self.integrity_panel.bgcolor = ft.Colors.ORANGE_50
+        elif not report.get("member_count"):
+            # No archive loaded, missing or unreadable: the failure entry names the reason
+            self.integrity_summary.value = "Archiv konnte nicht geprüft werden"
+            self.integrity_summary.color = ft.Colors.RED
+            self.integrity_panel.bgcolor = ft.Colors.RED_50
+        else:
+            incomplete_note = "" if report.get("is_complete", True) else " (Prüfung nach Eintragslimit abgebrochen)"
+            self.integrity_summary.value = (
+                f"Archiv beschädigt: {len(member_failures)} von {report['member_count']} Einträgen fehlerhaft{incomplete_note}"
+            )
+            self.integrity_summary.color = ft.Colors.RED
+            self.integrity_panel.bgcolor = ft.Colors.RED_50
+
+        listed_failures = report.get("failures", [])[:MAX_LISTED_INTEGRITY_FAILURES]
+        self.integrity_failures.controls = [
+            ft.Text(
+                f"{failure['member'] or 'Archiv'}: {failure['kind']} ({failure['message']})",
+                size=12,
+                color=ft.Colors.ORANGE_700 if failure["kind"] == FAILURE_ENTRY_LIMIT else ft.Colors.RED_700
+            )
+            for failure in listed_failures
+        ]
+        self.integrity_failures.visible = bool(listed_failures)
+        self.update_scheduler.schedule(self.integrity_panel)
+
+
+    def set_loading(self, is_loading: bool):
+        """
+        Shows or hides the progress indicator and locks inputs during background loads.
+        Loads may overlap, so the inputs stay locked until the last one has finished.
+        """
+        self.active_load_count += 1 if is_loading else -1
+        is_busy = self.active_load_count > 0
+        locked_controls = [self.features_list, self.files_list, self.import_order_button, self.sort_button, self.extra_tags_field]
+
+        self.loading_indicator.visible = is_busy
+        for control in locked_controls:
+            control.disabled = is_busy
+        self.mode_switch.disabled = is_busy or not self.service.logic_is_mode_switch_allowed()
+        self.update_scheduler.schedule(self.loading_indicator, self.mode_switch, *locked_controls)
+
+
+    async def run_with_loading(self, action_name: str, load_function, *arguments) -> bool:
+        """
+        Awaits a background call with the progress indicator shown.
+        The indicator is always hidden again; a failure is shown in the status text instead of being lost.
+        """
+        self.set_loading(True)
+        try:
+            await load_function(*arguments)
+            self.status_label.visible = False
+            return True
+        except Exception as e:
+            self.status_label.value = f"{action_name} fehlgeschlagen: {e}"
+            self.status_label.visible = True
+            return False
+        finally:
+            self.set_loading(False)
+            self.update_scheduler.schedule(self.status_label)
+
+
     def refresh_ui(self):
         """Synchronizes all UI components with the current service state."""
         self.machine_name_label.value = self.service.machine_display_string
-        self.mount_count_field.value = str(self.service.mount_count)
+        if self.update_scheduler.is_debounce_pending(DEBOUNCE_KEY_MOUNT_COUNT):
+            # Applies the value being typed instead of overwriting it with the previous one
+            self.update_scheduler.flush_debounced(DEBOUNCE_KEY_MOUNT_COUNT)
+        else:
+            self.mount_count_field.value = str(self.service.mount_count)
         self.mode_switch.value = self.service.is_bars_mode
-        self.mode_description.value = "Test Bars" if self.service.is_bars_mode else "Test Profiles"
 
         _, has_error, message = self.service.logic_validate_mount_count(self.mount_count_field.value)
         self.mount_count_hint.value = message
         self.mount_count_hint.color = ft.Colors.RED if has_error else ft.Colors.GREY
 
         can_switch_mode = self.service.logic_is_mode_switch_allowed()
-        self.mode_switch.disabled = not can_switch_mode
+        self.mode_switch.disabled = self.active_load_count > 0 or not can_switch_mode
 
         if not can_switch_mode:
             self.mode_description.value = "Test Bars (Erzwungen durch SiftCutDevice)"
@@ -182,126 +457,341 @@ class EditorView(ft.View):
             self.mode_description.value = "Test Bars" if self.service.is_bars_mode else "Test Profiles"
             self.mode_description.color = ft.Colors.BLACK
         
-        self.rebuild_features_ui()
-        self.rebuild_files_ui()
-        self.update()
+        statistics = self.service.logic_deviation_statistics()
+        if statistics["valid_count"]:
+            self.deviation_summary.value = (
+                f"Abweichung IST/SOLL: max {statistics['max']:g}, "
+                f"Mittel {statistics['mean']:g} ({statistics['valid_count']}/{statistics['row_count']} Dateien)"
+            )
+        else:
+            self.deviation_summary.value = ""
+
+        self.refresh_features_ui()
+        if self.refresh_diagnostics_ui():
+            self.update_scheduler.schedule(self.diagnostics_panel)
+        # Only these controls are diffed; unchanged properties are not sent again
+        self.update_scheduler.schedule(
+            self.machine_name_label,
+            self.mount_count_field,
+            self.mount_count_hint,
+            self.mode_switch,
+            self.mode_description,
+            self.deviation_summary,
+            self.features_list
+        )
+        # Diffing the file list costs time per row, so it is skipped when nothing moved
+        if self.refresh_files_ui():
+            self.update_scheduler.schedule(self.files_list)
+
+
+    def refresh_diagnostics_ui(self) -> bool:
+        """
+        Lists the slowest and the failed archive entries of this session.
+        Returns: True if new entries were read since the last refresh.
+        """
+        if self.entry_summary is None:
+            return False
+
+        summary = self.entry_summary.summary()
+        summary_signature = (summary["entry_count"], summary["failure_count"])
+        if summary_signature == self.diagnostics_signature:
+            return False
+        self.diagnostics_signature = summary_signature
+
+        self.diagnostics_panel.subtitle.value = (
+            f"{summary['entry_count']} Einträge in {summary['total_seconds']:.2f} s gelesen, "
+            f"{summary['failure_count']} fehlerhaft"
+        )
+        # Entries beyond max_entries have no extracted values; this must not hide in the failure list
+        if summary["limit_events"]:
+            self.diagnostics_panel.subtitle.value += ". Archiv nur teilweise gelesen: Eintragslimit erreicht"
+        self.diagnostics_panel.subtitle.color = ft.Colors.RED if summary["failure_count"] else ft.Colors.GREY
+
+        self.diagnostics_panel.controls = [
+            *[
+                ft.Text(
+                    f"Eintragslimit: {event['archive']} ({event['message']})",
+                    size=12, weight=ft.FontWeight.BOLD, color=ft.Colors.RED_700
+                )
+                for event in summary["limit_events"]
+            ],
+            ft.Text("Langsamste Einträge:", size=12, weight=ft.FontWeight.BOLD),
+            *[
+                ft.Text(
+                    f"{event['seconds'] * MILLISECONDS_PER_SECOND:.1f} ms  {event['entry']} "
+                    f"({event['compressed_size']} / {event['uncompressed_size']} Bytes)",
+                    size=12
+                )
+                for event in summary["slowest"]
+            ],
+            ft.Text("Fehler:", size=12, weight=ft.FontWeight.BOLD),
+            *[
+                ft.Text(f"{event['entry'] or event['archive']}: {event['outcome']} ({event['message']})", size=12, color=ft.Colors.RED_700)
+                for event in summary["failures"]
+            ]
+        ]
+        return True
 
 
-    def rebuild_features_ui(self):
-        """Reconstructs the feature toggle list based on logic state."""
-        self.features_list.controls.clear()
-        feature_order = ["createShelf", "createBigShelf", "RobotMode", "ShiftCutDevice"]
-        
-        labels = {
-            "createShelf": "createShelf",
-            "createBigShelf": "createBigShelf",
-            "RobotMode": "RobotMode",
-            "ShiftCutDevice": "ShiftCutDevice"
-        }
+    def build_features_ui(self):
+        """Creates one toggle row per feature; the rows are reused and only updated afterwards."""
+        for key in FEATURE_ORDER:
+            feature_button = ft.IconButton(data=key, on_click=self.on_feature_click)
+            feature_label = ft.Text(weight=ft.FontWeight.BOLD)
+            self.feature_rows[key] = (feature_button, feature_label)
+            self.features_list.controls.append(ft.Row([feature_button, feature_label]))
 
-        for key in feature_order:
-            is_active = self.service.feature_state.get(key, False)
-            
-            any_shelf_active = (self.service.feature_state.get("createShelf") or 
-                               self.service.feature_state.get("createBigShelf"))
-            
-            is_blocked = False
-            block_reason = ""
-
-            if key == "RobotMode" and not any_shelf_active:
-                is_blocked = True
-                block_reason = " (Erfordert ein Regal)"
-            elif key == "ShiftCutDevice" and any_shelf_active:
-                is_blocked = True
-                block_reason = " (Nicht mit Regal möglich)"
-
-            display_text = labels.get(key, key) + block_reason
-
-            self.features_list.controls.append(
-                ft.Row([
-                    ft.IconButton(
-                        icon=ft.Icons.CHECK_CIRCLE if is_active else ft.Icons.CANCEL,
-                        icon_color=ft.Colors.GREEN if is_active else ft.Colors.RED_400,
-                        disabled=is_blocked,
-                        on_click=lambda _, feat=key: self.on_feature_click(feat)
-                    ),
-                    ft.Text(display_text, weight=ft.FontWeight.BOLD)
-                ])
-            )
 
+    def refresh_features_ui(self):
+        """Updates the feature toggles in place based on logic state."""
+        # Blocked toggles and their reasons come from the compiled rule table
+        blocked_features = self.service.logic_blocked_features()
+
+        for key, (feature_button, feature_label) in self.feature_rows.items():
+            is_active = self.service.feature_state.get(key, False)
+            is_blocked = key in blocked_features
+            block_reason = blocked_features.get(key, "")
+
+            feature_button.icon = ft.Icons.CHECK_CIRCLE if is_active else ft.Icons.CANCEL
+            feature_button.icon_color = ft.Colors.GREEN if is_active else ft.Colors.RED_400
+            feature_button.disabled = is_blocked
+            feature_label.value = key + block_reason
+
+
+    def refresh_files_ui(self) -> bool:
+        """
+        Brings the draggable file list in line with the current sequence.
+        Rows are cached per file and only re-created when the extracted values change;
+        a reorder just moves existing rows and renumbers them, so the update stays small.
+        Returns: True if the list changed and needs to be sent to the client.
+        """
+        rows_signature = (
+            self.service.active_folder,
+            self.service.xml_data_version,
+            tuple(self.service.extraction_tags)
+        )
+        if rows_signature != self.file_rows_signature:
+            self.file_rows = {}
+            self.file_rows_signature = rows_signature
 
-    def rebuild_files_ui(self):
-        """Reconstructs the draggable file list from current sequence."""
-        self.files_list.controls.clear()
+        ordered_rows = []
+        name_occurrences = {}
+        has_changes = False
 
         for index, name in enumerate(self.service.current_file_order):
-            display_name = os.path.splitext(name)[0]
-
-            full_path = f"{self.service.active_folder}{name}"
-            xml_info = self.service.extracted_xml_data.get(full_path, {})
-            ist_val = xml_info.get(XML_TAG_IST, "-")
-            soll_val = xml_info.get(XML_TAG_SOLL, "-")
-
-            self.files_list.controls.append(
-                ft.Draggable(
-                    group="files",
-                    data=str(index),
-                    content_feedback=ft.Container(
-                        content=ft.Text(
-                            f"{display_name}",
-                            size=14
-                            ),
-                        padding=10,
-                        bgcolor=ft.Colors.BLUE_50,
-                        border_radius=5,
-                        border=ft.border.all(1, ft.Colors.BLUE),
-                        opacity=0.8,
-                    ),
-                    content=ft.DragTarget(
-                        group="files",
-                        data=str(index),
-                        on_accept=self.on_file_dropped,
-                        content=ft.Container(
-                            content=ft.Row([
-                                ft.Icon(ft.Icons.DRAG_HANDLE, color=ft.Colors.GREY_400),
-                                ft.Text(f"{index + 1}. {display_name}", expand=True),
-                                ft.Text(f"IST: {ist_val}", size=12, color=ft.Colors.GREY_400),
-                                ft.Text(f"SOLL: {soll_val}", size=12, color=ft.Colors.BLACK),
-                            ]),
-                            padding=10, 
-                            border=ft.border.all(1, ft.Colors.GREY_300), 
-                            border_radius=5,
-                            bgcolor=ft.Colors.WHITE
-                        )
-                    )
-                )
+            # Nested folders may contain equal file names, so the occurrence is part of the key
+            occurrence = name_occurrences.get(name, 0)
+            name_occurrences[name] = occurrence + 1
+
+            row_key = (name, occurrence)
+            file_row = self.file_rows.get(row_key)
+            if file_row is None:
+                file_row = self.build_file_row(name)
+                self.file_rows[row_key] = file_row
+
+            draggable, drag_target, position_label = file_row
+            if draggable.data != str(index):
+                draggable.data = str(index)
+                drag_target.data = str(index)
+                position_label.value = f"{index + 1}. {os.path.splitext(name)[0]}"
+                has_changes = True
+            ordered_rows.append(draggable)
+
+        if len(ordered_rows) != len(self.files_list.controls):
+            has_changes = True
+
+        self.files_list.controls = ordered_rows
+        return has_changes
+
+
+    def build_file_row(self, name: str) -> tuple:
+        """Creates the draggable row of one file. Returns: (draggable, drag_target, position_label)."""
+        display_name = os.path.splitext(name)[0]
+
+        full_path = f"{self.service.active_folder}{name}"
+        xml_info = self.service.extracted_xml_data.get(full_path, {})
+        ist_val = xml_info.get(XML_TAG_IST, "-")
+        soll_val = xml_info.get(XML_TAG_SOLL, "-")
+        extra_values = [
+            f"{tag}: {xml_info.get(tag, '-')}"
+            for tag in self.service.extraction_tags
+            if tag not in DEFAULT_EXTRACTION_TAGS
+        ]
+
+        # Index-dependent values are filled in by refresh_files_ui
+        position_label = ft.Text(expand=True)
+        drag_target = ft.DragTarget(
+            group="files",
+            on_accept=self.on_file_dropped,
+            content=ft.Container(
+                content=ft.Row([
+                    ft.Icon(ft.Icons.DRAG_HANDLE, color=ft.Colors.GREY_400),
+                    position_label,
+                    ft.Text(f"IST: {ist_val}", size=12, color=ft.Colors.GREY_400),
+                    ft.Text(f"SOLL: {soll_val}", size=12, color=ft.Colors.BLACK),
+                    *[ft.Text(value, size=12, color=ft.Colors.GREY_600) for value in extra_values],
+                ]),
+                padding=10, 
+                border=ft.border.all(1, ft.Colors.GREY_300), 
+                border_radius=5,
+                bgcolor=ft.Colors.WHITE
             )
+        )
+        draggable = ft.Draggable(
+            group="files",
+            content_feedback=ft.Container(
+                content=ft.Text(
+                    f"{display_name}",
+                    size=14
+                    ),
+                padding=10,
+                bgcolor=ft.Colors.BLUE_50,
+                border_radius=5,
+                border=ft.border.all(1, ft.Colors.BLUE),
+                opacity=0.8,
+            ),
+            content=drag_target
+        )
+        return draggable, drag_target, position_label
 
 
     def on_mount_count_change(self, event: ft.ControlEvent):
-        """Validates input and updates range hint via business logic."""
-        _, has_error, message = self.service.logic_validate_mount_count(event.control.value)
+        """Validates the input once typing pauses instead of on every keystroke."""
+        user_input = event.control.value
+        self.update_scheduler.debounce(
+            DEBOUNCE_KEY_MOUNT_COUNT,
+            lambda: self.apply_mount_count(user_input),
+            MOUNT_COUNT_DEBOUNCE_SECONDS
+        )
+
+
+    def apply_mount_count(self, user_input: str):
+        """Validates a MountCount input and updates the range hint via business logic."""
+        _, has_error, message = self.service.logic_validate_mount_count(user_input)
         self.mount_count_hint.value = message
         self.mount_count_hint.color = ft.Colors.RED if has_error else ft.Colors.GREY
-        self.update()
+        self.update_scheduler.schedule(self.mount_count_hint)
+
 
+    def on_confirm_click(self, _):
+        """Applies pending input before leaving, so a just typed MountCount is not lost."""
+        self.update_scheduler.flush_debounced()
+        self.update_scheduler.flush()
+        self.nav("/result")
 
-    def on_feature_click(self, feature_name: str):
+
+    async def on_feature_click(self, event: ft.ControlEvent):
         """Toggles a machine feature and refreshes dependencies."""
-        self.service.logic_toggle_feature(feature_name)
+        await self.run_with_loading("Umschalten des Features", self.service.logic_toggle_feature_async, event.control.data)
         self.refresh_ui()
 
 
-    def on_mode_toggle(self, event: ft.ControlEvent):
+    async def on_mode_toggle(self, event: ft.ControlEvent):
         """Switches between Bar and Profile modes and reloads file lists."""
         self.service.is_bars_mode = event.control.value
-        self.service.logic_load_files_for_mode()
-        self.service.logic_load_xml_data_for_files()
+        await self.run_with_loading("Laden der Dateien", self.service.logic_load_files_for_mode_async)
         self.refresh_ui()
 
 
+    async def on_extra_tags_submit(self, event: ft.ControlEvent):
+        """Re-extracts the XML values with the additional user-defined tags."""
+        tag_specs = event.control.value.split(TAG_LIST_SEPARATOR)
+        await self.run_with_loading("Auslesen der XML-Werte", self.service.logic_set_extraction_tags_async, tag_specs)
+        self.refresh_ui()
+
+
+    async def on_sort_by_deviation(self, _):
+        """Orders the sequence so that files with the largest IST/SOLL deviation run first."""
+        await self.run_with_loading("Sortieren nach Abweichung", self.service.logic_sort_by_deviation_async)
+        self.refresh_ui()
+
+
+    async def on_previous_export_picked(self, event: ft.FilePickerResultEvent):
+        """Imports the order of the picked export; in web mode it is uploaded into the session first."""
+        if not event.files:
+            return
+        selected_file = event.files[0]
+
+        if selected_file.path:
+            await self.import_previous_order(selected_file.path)
+            return
+
+        # The prefix keeps the export from replacing the uploaded archive of the same name
+        try:
+            upload_name = PREVIOUS_EXPORT_PREFIX + sanitize_upload_name(selected_file.name)
+            upload_url = session_upload_url(self.page, self.service.upload_directory, upload_name)
+        except ValueError:
+            self.order_import_summary.value = f"Ungültiger Dateiname: {selected_file.name}"
+            self.order_import_summary.color = ft.Colors.RED
+            self.order_import_panel.visible = True
+            self.update_scheduler.schedule(self.order_import_panel)
+            return
+
+        self.pending_previous_export = upload_name
+        self.file_picker.upload([
+            ft.FilePickerUploadFile(selected_file.name, upload_url=upload_url)
+        ])
+
+
+    async def on_previous_export_uploaded(self, event: ft.FilePickerUploadEvent):
+        """Imports the order once the browser upload of the previous export has finished."""
+        if event.error:
+            self.pending_previous_export = None
+            self.order_import_summary.value = f"Fehler beim Hochladen: {event.error}"
+            self.order_import_summary.color = ft.Colors.RED
+            self.order_import_panel.visible = True
+            self.update_scheduler.schedule(self.order_import_panel)
+        elif event.progress == UPLOAD_COMPLETE_PROGRESS and self.pending_previous_export:
+            upload_name = self.pending_previous_export
+            self.pending_previous_export = None
+            await self.import_previous_order(os.path.join(self.service.upload_directory, upload_name))
+
+
+    async def import_previous_order(self, previous_export_path: str):
+        """Applies the FileOrder of a previous export and shows which files were appended or are missing."""
+        if await self.run_with_loading(
+            "Übernehmen der Reihenfolge", self.service.logic_import_previous_order_async, previous_export_path
+        ):
+            self.refresh_order_import_ui()
+        self.refresh_ui()
+
+
+    def refresh_order_import_ui(self):
+        """Shows the result of the last order import."""
+        report = self.service.order_import_report
+
+        if report["is_applied"]:
+            self.order_import_summary.value = (
+                f"Reihenfolge aus {report['source']} übernommen ({report['folder']}): {report['kept_count']} Dateien an alter Position, "
+                f"{len(report['appended'])} neue angehängt, {len(report['missing'])} nicht mehr vorhanden"
+            )
+            mode_name = "Test Bars" if report["folder"] == FOLDER_BARS else "Test Profiles"
+            if report["is_mode_switched"]:
+                self.order_import_summary.value += f". Modus auf {mode_name} umgestellt"
+            elif not report["is_active_folder"]:
+                self.order_import_summary.value += f". Nur die Reihenfolge für {mode_name} wurde aktualisiert, der aktive Modus ist unverändert"
+            self.order_import_summary.color = ft.Colors.GREEN_700
+        else:
+            self.order_import_summary.value = f"Reihenfolge nicht übernommen: {report['message']}"
+            self.order_import_summary.color = ft.Colors.RED
+
+        listed_missing = report["missing"][:MAX_LISTED_MISSING_FILES]
+        self.order_import_missing.controls = [
+            ft.Text(f"Fehlt: {file_name}", size=12, color=ft.Colors.ORANGE_700)
+            for file_name in listed_missing
+        ]
+        self.order_import_missing.visible = bool(listed_missing)
+        self.order_import_panel.visible = True
+        self.update_scheduler.schedule(self.order_import_panel)
+
+
     def on_file_dropped(self, event: ft.DragTargetEvent):
         """Updates the internal file sequence based on drag-and-drop result."""
+        if self.active_load_count > 0:
+            # A background operation may be reordering the sequence; the rebuild puts the dragged row back
+            self.refresh_ui()
+            return
+
         source_control = self.page.get_control(event.src_id)
         source_index = int(source_control.data)
         target_index = int(event.control.data)
@@ -315,15 +805,24 @@ class ResultView(ft.View):
     Final view for summary and Export.
     """
 
-    def __init__(self, service: IMachineService, navigation_callback):
+    def __init__(
+        self,
+        service: IAsyncMachineService,
+        navigation_callback,
+        download_directory: str = None,
+        assets_directory: str = ASSETS_DIRECTORY_NAME
+    ):
         super().__init__(route="/result", scroll=ft.ScrollMode.AUTO)
         self.service = service
         self.nav = navigation_callback
+        self.download_directory = download_directory
+        self.assets_directory = assets_directory
 
         self.features_summary = ft.Column(spacing=2)
         self.files_summary = ft.Column(spacing=2)
 
         self.export_progress = ft.ProgressBar(width=400, visible=False)
+        self.export_status = ft.Text(size=12, visible=False)
         self.save_button = ft.ElevatedButton(
             text="Konfigurierte ZIP-Datei speichern", 
             icon=ft.Icons.DOWNLOAD,
@@ -332,6 +831,13 @@ class ResultView(ft.View):
         self.save_dialog = ft.FilePicker()
         self.save_dialog.on_result = self.on_export_finished
 
+        self.values_button = ft.OutlinedButton(
+            text="Extrahierte Werte exportieren",
+            icon=ft.Icons.TABLE_CHART,
+            on_click=self.on_values_export_click
+        )
+        self.values_dialog = ft.FilePicker(on_result=self.on_values_export_finished)
+
         self.controls = [
             ft.AppBar(title=ft.Text("Vorgang abgeschlossen"), bgcolor=ft.Colors.GREEN_100),
             ft.Container(
@@ -352,7 +858,9 @@ class ResultView(ft.View):
                         ft.Divider(),
                         ft.Text("Du kannst die fertige Datei nun herunterladen."),
                         self.export_progress,
+                        self.export_status,
                         self.save_button,
+                        self.values_button,
                         ft.OutlinedButton("Neu starten", on_click=lambda _: self.nav("/"))
                     ]
                 )
@@ -381,6 +889,8 @@ class ResultView(ft.View):
         """Prepares the save dialog overlay."""
         if self.save_dialog not in self.page.overlay:
             self.page.overlay.append(self.save_dialog)
+        if self.values_dialog not in self.page.overlay:
+            self.page.overlay.append(self.values_dialog)
 
         self.refresh_summary()
         self.page.update()
@@ -390,7 +900,13 @@ class ResultView(ft.View):
         """Triggers the system save dialog for the result ZIP."""
         full_input_name = os.path.basename(self.service.uploaded_file_path)
         name_part, extension = os.path.splitext(full_input_name)
-        default_output_name = f"{name_part}{EXPORT_FILE_SUFFIX}{extension}"
+        # Directory sources have no extension; the export is always a ZIP
+        default_output_name = f"{name_part}{EXPORT_FILE_SUFFIX}{extension or ZIP_FILE_EXTENSION}"
+
+        # Browsers cannot open a native save dialog; serve the export as a download instead
+        if self.download_directory:
+            self.page.run_task(self.export_for_download, default_output_name, self.service.logic_export_async, self.save_button)
+            return
 
         self.save_dialog.save_file(
             file_name=default_output_name, 
@@ -398,21 +914,81 @@ class ResultView(ft.View):
         )
 
 
-    def on_export_finished(self, event: ft.FilePickerUploadEvent):
+    async def on_export_finished(self, event: ft.FilePickerUploadEvent):
         """Handles the completion of the file export process."""
         if event.path:
-            self.export_progress.visible = True
-            self.update()
-            
-            final_data = self.service.logic_prepare_final_data()
-            self.service.zip_service.createZipWithAddedConfig(
-                originalZipPath=self.service.uploaded_file_path,
-                targetZipPath=event.path,
-                configurationData=final_data
+            await self.run_export(self.service.logic_export_async, event.path, self.save_button)
+
+
+    def on_values_export_click(self, _):
+        """Triggers the save dialog for the columnar export of the extracted values."""
+        name_part = os.path.splitext(os.path.basename(self.service.uploaded_file_path))[0]
+        default_output_name = f"{name_part}{VALUES_FILE_SUFFIX}{FORMAT_CSV}"
+
+        if self.download_directory:
+            self.page.run_task(
+                self.export_for_download, default_output_name, self.service.logic_export_extracted_values_async, self.values_button
             )
-            
+            return
+
+        self.values_dialog.save_file(
+            file_name=default_output_name,
+            allowed_extensions=[extension.lstrip(".") for extension in supported_formats()]
+        )
+
+
+    async def on_values_export_finished(self, event: ft.FilePickerResultEvent):
+        """Writes the columnar export to the chosen path."""
+        if event.path:
+            await self.run_export(self.service.logic_export_extracted_values_async, event.path, self.values_button)
+
+
+    async def run_export(self, export_function, target_path: str, export_button: ft.Control) -> bool:
+        """
+        Awaits an export with the progress bar shown and the button locked.
+        Both are always reset; the outcome is shown in the export status text.
+        """
+        self.export_progress.visible = True
+        export_button.disabled = True
+        self.export_status.visible = False
+        self.update()
+
+        try:
+            was_exported = await export_function(target_path)
+        except Exception as e:
+            was_exported = False
+            self.export_status.value = f"Export fehlgeschlagen: {e}"
+        else:
+            self.export_status.value = (
+                f"Exportiert: {os.path.basename(target_path)}" if was_exported else "Export fehlgeschlagen"
+            )
+        finally:
+            export_button.disabled = False
             self.export_progress.visible = False
-            self.update()
+
+        self.export_status.color = ft.Colors.GREEN_700 if was_exported else ft.Colors.RED
+        self.export_status.visible = True
+        self.update()
+        return was_exported
+
+
+    async def export_for_download(self, output_name: str, export_function, export_button: ft.Control):
+        """
+        Writes an export into the session download directory and opens it in the browser.
+        Every export gets its own unguessable subdirectory, which is deleted again after
+        DOWNLOAD_RETENTION_SECONDS, so served files do not stay readable for the whole session.
+        """
+        download_token = secrets.token_urlsafe(16)
+        target_directory = os.path.join(self.assets_directory, self.download_directory, download_token)
+        os.makedirs(target_directory, exist_ok=True)
+        was_exported = await self.run_export(export_function, os.path.join(target_directory, output_name), export_button)
+
+        if not was_exported:
+            shutil.rmtree(target_directory, ignore_errors=True)
+            return
+        self.page.launch_url(f"/{self.download_directory}/{download_token}/{output_name}")
+        await asyncio.sleep(DOWNLOAD_RETENTION_SECONDS)
+        shutil.rmtree(target_directory, ignore_errors=True)
 
 
 class MachineApp:
@@ -420,9 +996,42 @@ class MachineApp:
     Main Application Controller and Router.
     Orchestrates view transitions and maintains the shared logic service.
     """
-    def __init__(self, page: ft.Page):
+    def __init__(
+        self,
+        page: ft.Page,
+        is_web_mode: bool = False,
+        event_log_path: str = DEFAULT_EVENT_LOG_PATH,
+        parse_cache=None,
+        assets_directory: str = ASSETS_DIRECTORY_NAME
+    ):
         self.page = page
-        self.service = MachineBusinessLogic()
+        self.download_directory = None
+        # Must be the directory passed to ft.app(assets_dir=...), which Flet serves downloads from
+        self.assets_directory = assets_directory
+
+        # Entry events go to the editor's diagnostics panel and, if a path is set, to a rotating JSON-lines log
+        self.entry_summary = EntrySummarySink()
+        event_sinks = [self.entry_summary]
+        if event_log_path:
+            event_sinks.append(JsonLinesLogSink(event_log_path))
+        event_bus = DiagnosticsBus(event_sinks)
+        # Archives are read resource-governed, so oversized or huge uploads cannot exhaust memory
+        resource_limits = ResourceLimits()
+
+        if is_web_mode:
+            # Every browser session gets its own upload and download directory
+            self.download_directory = f"{DOWNLOAD_DIRECTORY_NAME}/{page.session_id}"
+            self.service = AsyncMachineBusinessLogic(
+                upload_directory=os.path.join(UPLOAD_DIRECTORY_NAME, page.session_id),
+                parse_cache=parse_cache or SHARED_PARSE_CACHE,
+                integrity_checker=SHARED_INTEGRITY_CHECKER,
+                event_bus=event_bus,
+                resource_limits=resource_limits
+            )
+            self.page.on_close = self.on_session_closed
+        else:
+            # With a persistent parse cache, archives indexed by the background indexer open without parsing
+            self.service = AsyncMachineBusinessLogic(parse_cache=parse_cache, event_bus=event_bus, resource_limits=resource_limits)
 
         self.page.title = "Test Configuration Wizard"
         self.page.theme_mode = ft.ThemeMode.LIGHT
@@ -432,9 +1041,9 @@ class MachineApp:
 
         # Central Route Mapping
         self.view_factories = {
-            "/": lambda: UploadView(self.service, self.page.go),
-            "/editor": lambda: EditorView(self.service, self.page.go),
-            "/result": lambda: ResultView(self.service, self.page.go),
+            "/": lambda: UploadView(self.service, self.page.go, allow_directory_sources=not is_web_mode),
+            "/editor": lambda: EditorView(self.service, self.page.go, self.entry_summary),
+            "/result": lambda: ResultView(self.service, self.page.go, self.download_directory, self.assets_directory),
         }
 
         if self.page.route == "/":
@@ -447,6 +1056,9 @@ class MachineApp:
         """Handles navigation safely by building the view before clearing the stack."""
         try:
             builder = self.view_factories.get(self.page.route, self.view_factories["/"])
+            if builder is self.view_factories["/"]:
+                # A new upload starts a new diagnostics summary
+                self.entry_summary.clear()
             new_view = builder()
 
             self.page.views.clear()
@@ -490,4 +1102,11 @@ class MachineApp:
         if len(self.page.views) > 1:
             self.page.views.pop()
             top_view = self.page.views[-1]
-            self.page.go(top_view.route)
\ No newline at end of file
+            self.page.go(top_view.route)
+
+
+    def on_session_closed(self, _):
+        """Removes all files of a closed web session."""
+        self.service.logic_cleanup_session()
+        if self.download_directory:
+            shutil.rmtree(os.path.join(self.assets_directory, self.download_directory), ignore_errors=True)
\ No newline at end of file